@@ -0,0 +1,124 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from src.constants import *
+from src.bitboard import BitBoard
+from benchmarks.perft import make_board, opponent
+
+IMPLEMENTATIONS = ('board', 'bitboard')
+
+
+def sample_positions(count, seed=0):
+    """Positions from random games, as (red, black, kings, turn) dicts like perft.POSITIONS."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = BitBoard()
+        color = RED_PLAYER
+        for _ in range(rng.randrange(60)):
+            moves = board.get_legal_moves(color)
+            if not moves:
+                break
+            board.apply(color, rng.choice(moves))
+            color = opponent(color)
+        if board.get_legal_moves(color):
+            positions.append({'red': board.red, 'black': board.black, 'kings': board.kings,
+                              'turn': color})
+    return positions
+
+
+def _time(function, repeat):
+    """Best of repeat runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(implementation, positions, repeat=3):
+    """Return {metric: operations per second} for one board implementation."""
+    boards = [(make_board(implementation, position), position['turn']) for position in positions]
+    moves = [board.get_moves(color) for board, color in boards]
+    results = {}
+
+    def movegen():
+        for board, color in boards:
+            board.get_moves(color)
+
+    def hop_moves():
+        for board, color in boards:
+            board.get_all_valid_moves(color)
+
+    def make_unmake():
+        for (board, _), board_moves in zip(boards, moves):
+            for move in board_moves:
+                board.make_move(move)
+                board.unmake_move()
+
+    def encode():
+        for board, color in boards:
+            board.get_state()
+            board.get_valid_moves_mask(color)
+
+    total_moves = sum(len(board_moves) for board_moves in moves)
+    results['movegen_positions_per_sec'] = len(boards) / _time(movegen, repeat)
+    results['hop_moves_positions_per_sec'] = len(boards) / _time(hop_moves, repeat)
+    results['make_unmake_per_sec'] = total_moves / _time(make_unmake, repeat)
+    results['encode_positions_per_sec'] = len(boards) / _time(encode, repeat)
+
+    if implementation == 'bitboard':
+        from src.encoding import encode_batch
+        board_list = [board for board, _ in boards]
+        colors = [color for _, color in boards]
+        results['encode_batch_positions_per_sec'] = len(boards) / _time(
+            lambda: encode_batch(board_list, colors), repeat)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time move generation, move application and encoding')
+    parser.add_argument('--impl', choices=IMPLEMENTATIONS, nargs='+', default=list(IMPLEMENTATIONS))
+    parser.add_argument('--positions', type=int, default=500, help='Number of sample positions')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON to this file')
+    parser.add_argument('--compare', type=str, default=None, help='Earlier --output file to compare against')
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions)
+    report = {'commit': _git_commit(), 'python': platform.python_version(),
+              'positions': args.positions, 'results': {}}
+    for implementation in args.impl:
+        report['results'][implementation] = benchmark(implementation, positions, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    for implementation, results in report['results'].items():
+        for metric, value in results.items():
+            line = f"{implementation:9s} {metric:32s} {value:12.0f}"
+            old = baseline['results'].get(implementation, {}).get(metric) if baseline else None
+            if old:
+                line += f"  {value / old:5.2f}x vs {baseline.get('commit') or args.compare}"
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from src.bitboard import BitBoard
+from src.ai.agent import CheckersAI
+from benchmarks.movegen import sample_positions
+
+# Load a model and run one prediction in a fresh interpreter, reporting time and peak RSS
+SNIPPET = """
+import json, resource, sys, time
+import numpy as np
+t0 = time.perf_counter()
+from src.ai.agent import CheckersAI
+ai = CheckersAI()
+ai.load_model({path!r}, quantize={quantize!r})
+ai.model.predict(np.zeros((1, 32), dtype=np.float32), verbose=0)
+t1 = time.perf_counter()
+print(json.dumps({{'load_seconds': t1 - t0,
+                  'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  'tensorflow_loaded': 'tensorflow' in sys.modules}}))
+"""
+
+
+def backends(keras_path, npz_path):
+    """Return [(name, model path, quantize)] for the backends that can run here."""
+    rows = []
+    if keras_path:
+        rows.append(('tensorflow', keras_path, False))
+    rows.append(('numpy-float32', npz_path, False))
+    rows.append(('numpy-int8', npz_path, True))
+    return rows
+
+
+def load(path, quantize):
+    ai = CheckersAI()
+    ai.load_model(path, quantize)
+    return ai
+
+
+def sample_states(count):
+    states, moves = [], []
+    for position in sample_positions(count):
+        board = BitBoard()
+        board.red, board.black, board.kings = position['red'], position['black'], position['kings']
+        states.append(board.get_state())
+        moves.append(_destinations(board, position['turn']))
+    return np.array(states, dtype=np.float32), moves
+
+
+def _destinations(board, color):
+    """get_move's valid_moves argument: every legal destination square."""
+    return {move: [] for piece_moves in board.get_all_valid_moves(color).values() for move in piece_moves}
+
+
+def parity(reference, candidate, states, moves):
+    """Largest output difference and the share of positions where get_move agrees."""
+    expected = reference.model.predict(states, verbose=0)
+    actual = candidate.model.predict(states, verbose=0)
+    agree = sum(reference.get_move(state, valid) == candidate.get_move(state, valid)
+                for state, valid in zip(states, moves))
+    return {'max_abs_diff': float(np.abs(expected - actual).max()),
+            'move_agreement': agree / len(states)}
+
+
+def latency(ai, states, repeat):
+    """Median single-position predict latency (ms) and batched throughput (positions/s)."""
+    single = []
+    for state in states[:repeat]:
+        start = time.perf_counter()
+        ai.model.predict(state.reshape(1, -1), verbose=0)
+        single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    ai.model.predict(states, verbose=0)
+    batched = time.perf_counter() - start
+    return {'single_ms': 1000 * statistics.median(single),
+            'batch_positions_per_sec': len(states) / batched if batched > 0 else 0.0}
+
+
+def startup(path, quantize):
+    output = subprocess.run([sys.executable, '-c', SNIPPET.format(path=path, quantize=quantize)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare NumPy and TensorFlow inference for CheckersAI models')
+    parser.add_argument('--keras', type=str, default=None, help='Keras model file (needs TensorFlow)')
+    parser.add_argument('--npz', type=str, default=None,
+                        help='Exported model (default: export --keras to a temporary file)')
+    parser.add_argument('--positions', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200, help='Single-position calls to time')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if args.keras and importlib.util.find_spec('tensorflow') is None:
+        print("tensorflow is not installed; comparing the NumPy backends only", file=sys.stderr)
+        args.keras = None
+    if args.npz is None:
+        if args.keras is None:
+            parser.error('give --npz, or --keras with TensorFlow installed')
+        from src.ai.agent import _tensorflow
+        from src.ai.numpy_model import export_npz
+        args.npz = os.path.join(tempfile.mkdtemp(), 'model.npz')
+        export_npz(_tensorflow().keras.models.load_model(args.keras), args.npz)
+
+    states, moves = sample_states(args.positions)
+    rows = backends(args.keras, args.npz)
+    models = {name: load(path, quantize) for name, path, quantize in rows}
+    reference = models[rows[0][0]]
+    results = {}
+    for name, path, quantize in rows:
+        result = latency(models[name], states, args.repeat)
+        result.update(startup(path, quantize))
+        if name != rows[0][0]:
+            result.update(parity(reference, models[name], states, moves))
+        results[name] = result
+
+    if args.json:
+        print(json.dumps({'reference': rows[0][0], 'results': results}, indent=2))
+        return
+    for name, result in results.items():
+        line = (f"{name:14s} single {result['single_ms']:7.3f}ms  batch {result['batch_positions_per_sec']:10.0f} pos/s  "
+                f"load {result['load_seconds']:6.2f}s  peak RSS {result['peak_rss_mb']:7.1f}MB")
+        if 'max_abs_diff' in result:
+            line += (f"  vs {rows[0][0]}: max diff {result['max_abs_diff']:.2e}, "
+                     f"same move {100 * result['move_agreement']:.1f}%")
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
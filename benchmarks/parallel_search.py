@@ -0,0 +1,61 @@
+import argparse
+import json
+import os
+import time
+from src.ai.parallel import ParallelSearch
+from benchmarks.perft import POSITIONS, make_board
+
+
+def time_to_depth(searcher, position, depth):
+    """Search one position to a fixed depth from an empty table. Returns (seconds, nodes, move)."""
+    searcher.tt.clear()
+    start = time.perf_counter()
+    result = searcher.search(make_board('bitboard', position), position['turn'], None, depth)
+    return time.perf_counter() - start, result.nodes, result.move
+
+
+def run_scaling(worker_counts, positions, depth, tt_size):
+    """Return one row per worker count with total time-to-depth and speedup over the first count."""
+    rows = []
+    for workers in worker_counts:
+        searcher = ParallelSearch(workers, tt_size)
+        try:
+            seconds = nodes = 0
+            for name in positions:
+                elapsed, searched, _ = time_to_depth(searcher, POSITIONS[name], depth)
+                seconds += elapsed
+                nodes += searched
+        finally:
+            searcher.close()
+        rows.append({'workers': workers, 'seconds': seconds, 'nodes': nodes,
+                     'nps': nodes / seconds if seconds > 0 else 0.0})
+    for row in rows:
+        row['speedup'] = rows[0]['seconds'] / row['seconds'] if row['seconds'] > 0 else 0.0
+        row['nps_scaling'] = row['nps'] / rows[0]['nps'] if rows[0]['nps'] > 0 else 0.0
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure parallel search speedup against process count')
+    cores = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16, 32) if n <= cores] or [1]
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers)
+    parser.add_argument('--depth', type=int, default=10, help='Fixed search depth per position')
+    parser.add_argument('--positions', nargs='+', default=['start', 'kings-midgame', 'black-kings'],
+                        choices=list(POSITIONS))
+    parser.add_argument('--tt-size', type=int, default=1 << 20, help='Transposition table slots')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    rows = run_scaling(args.workers, args.positions, args.depth, args.tt_size)
+    for row in rows:
+        print(f"{row['workers']:3d} processes  {row['seconds']:8.2f}s  nodes {row['nodes']:10d}  "
+              f"nps {row['nps']:9.0f}  speedup {row['speedup']:5.2f}x  nps scaling {row['nps_scaling']:5.2f}x")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'depth': args.depth, 'positions': args.positions, 'cpus': cores,
+                       'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import sys
+import time
+from src.constants import *
+from src.board import Board
+from src.bitboard import BitBoard, generate_moves, apply_move
+
+# Test positions as (red, black, kings) bitboards over the 32 dark squares
+# (square = row * 4 + col // 2) plus the side to move, with leaf counts by depth.
+# The start position counts are the published English draughts perft numbers;
+# the others were recorded when Board and BitBoard first agreed on them.
+POSITIONS = {
+    'start': {
+        'red': 0x00000FFF, 'black': 0xFFF00000, 'kings': 0, 'turn': RED_PLAYER,
+        'counts': [7, 49, 302, 1469, 7361, 36768, 179740, 845931],
+    },
+    'kings-midgame': {
+        'red': 0x4400220D, 'black': 0x18110000, 'kings': 0x40000000, 'turn': RED_PLAYER,
+        'counts': [9, 26, 243, 857, 7436, 28444, 225975],
+    },
+    'double-jump': {
+        'red': 0x00008018, 'black': 0x02061804, 'kings': 0x00000004, 'turn': RED_PLAYER,
+        'counts': [1, 6, 15, 65, 231, 1056, 3819],
+    },
+    'king-endgame': {
+        'red': 0x02111805, 'black': 0x00000008, 'kings': 0x02100008, 'turn': RED_PLAYER,
+        'counts': [11, 11, 99, 237, 2333, 4558, 34127],
+    },
+    'black-kings': {
+        'red': 0x02102090, 'black': 0x04408002, 'kings': 0x00108002, 'turn': BLACK_PLAYER,
+        'counts': [9, 64, 429, 2793, 17592, 116027, 723321],
+    },
+}
+
+
+def opponent(color):
+    return BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+
+
+def make_board(implementation, position):
+    """Build a board of the given implementation ('board' or 'bitboard') for a position."""
+    bitboard = BitBoard()
+    bitboard.red, bitboard.black, bitboard.kings = position['red'], position['black'], position['kings']
+    return bitboard.to_board() if implementation == 'board' else bitboard
+
+
+def perft(board, color, depth):
+    """Count leaf nodes depth plies below board using get_moves/make_move/unmake_move."""
+    moves = board.get_moves(color)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, opponent(color), depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def perft_raw(red, black, kings, color, depth):
+    """perft on raw bitboards, without building Move objects."""
+    moves = generate_moves(red, black, kings, color)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        nodes += perft_raw(*apply_move(red, black, kings, color, move), opponent(color), depth - 1)
+    return nodes
+
+
+IMPLEMENTATIONS = ('board', 'bitboard', 'bitboard-raw')
+
+
+def run_perft(implementation, position, depth):
+    """Return (nodes, seconds) for one implementation, position and depth."""
+    start = time.perf_counter()
+    if implementation == 'bitboard-raw':
+        nodes = perft_raw(position['red'], position['black'], position['kings'],
+                          position['turn'], depth)
+    else:
+        nodes = perft(make_board(implementation, position), position['turn'], depth)
+    return nodes, time.perf_counter() - start
+
+
+def _move_key(move):
+    return move.start, move.end, frozenset(move.captured), move.promotes
+
+
+def diff_moves(impl_a, impl_b, position, depth):
+    """Walk the game tree with two implementations in lockstep.
+
+    Returns None if their move lists agree everywhere to depth, otherwise a dict
+    describing the first position where they differ.
+    """
+    board_a = make_board(impl_a, position)
+    board_b = make_board(impl_b, position)
+
+    def walk(color, depth, line):
+        moves_a = {_move_key(move): move for move in board_a.get_moves(color)}
+        moves_b = {_move_key(move): move for move in board_b.get_moves(color)}
+        if moves_a.keys() != moves_b.keys():
+            snapshot = BitBoard.from_board(board_a) if isinstance(board_a, Board) else board_a
+            return {'line': line, 'turn': color,
+                    'red': hex(snapshot.red), 'black': hex(snapshot.black), 'kings': hex(snapshot.kings),
+                    f'only_{impl_a}': sorted(map(repr, (moves_a[k] for k in moves_a.keys() - moves_b.keys()))),
+                    f'only_{impl_b}': sorted(map(repr, (moves_b[k] for k in moves_b.keys() - moves_a.keys())))}
+        if depth <= 1:
+            return None
+        for key, move in moves_a.items():
+            board_a.make_move(move)
+            board_b.make_move(moves_b[key])
+            difference = walk(opponent(color), depth - 1, line + [repr(move)])
+            board_a.unmake_move()
+            board_b.unmake_move()
+            if difference:
+                return difference
+        return None
+
+    return walk(position['turn'], depth, [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count perft leaf nodes and check them against reference counts')
+    parser.add_argument('--depth', type=int, default=6, help='Maximum depth')
+    parser.add_argument('--impl', choices=IMPLEMENTATIONS, nargs='+', default=['bitboard-raw'],
+                        help='Board implementations to run')
+    parser.add_argument('--positions', nargs='+', default=list(POSITIONS), choices=list(POSITIONS))
+    parser.add_argument('--diff', nargs=2, metavar=('IMPL_A', 'IMPL_B'), choices=IMPLEMENTATIONS[:2],
+                        help='Compare the move lists of two implementations instead of counting')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    if args.diff:
+        failed = False
+        for name in args.positions:
+            difference = diff_moves(args.diff[0], args.diff[1], POSITIONS[name], args.depth)
+            print(f"{name:14s} {'differs' if difference else 'identical'}")
+            if difference:
+                print(json.dumps(difference, indent=2))
+                failed = True
+        sys.exit(1 if failed else 0)
+
+    results = []
+    failed = False
+    for name in args.positions:
+        position = POSITIONS[name]
+        for implementation in args.impl:
+            for depth in range(1, args.depth + 1):
+                nodes, seconds = run_perft(implementation, position, depth)
+                expected = position['counts'][depth - 1] if depth <= len(position['counts']) else None
+                ok = expected is None or nodes == expected
+                failed = failed or not ok
+                results.append({'position': name, 'impl': implementation, 'depth': depth,
+                                'nodes': nodes, 'expected': expected, 'ok': ok, 'seconds': seconds,
+                                'nps': nodes / seconds if seconds > 0 else 0.0})
+                print(f"{name:14s} {implementation:12s} depth {depth}  nodes {nodes:9d}  "
+                      f"{'ok' if ok else f'MISMATCH (expected {expected})':>8s}  "
+                      f"{nodes / seconds if seconds > 0 else 0:10.0f} nps")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import json
+import pickle
+import time
+from src import position
+from benchmarks.movegen import sample_positions
+from benchmarks.perft import make_board
+
+
+def _time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(positions, repeat=3):
+    """Return {metric: positions per second or bytes per position}."""
+    n = len(positions)
+    boards = [make_board('bitboard', spec) for spec in positions]
+    turns = [spec['turn'] for spec in positions]
+    lists = [board.to_board() for board in boards]
+    records = position.encode_boards(boards, turns)
+    red, black, kings, turn_array, _ = position.decode_positions(records)
+    fens = [position.to_fen(board, turn) for board, turn in zip(boards, turns)]
+    pickled = [pickle.dumps(board) for board in lists]
+    return {
+        'binary_bytes_per_position': position.POSITION.itemsize,
+        'pickle_bytes_per_position': sum(map(len, pickled)) / n,
+        'fen_bytes_per_position': sum(map(len, fens)) / n,
+        'encode_arrays_per_sec': n / _time(lambda: position.encode_positions(red, black, kings, turn_array), repeat),
+        'decode_arrays_per_sec': n / _time(lambda: position.decode_positions(records), repeat),
+        'encode_bitboards_per_sec': n / _time(lambda: position.encode_boards(boards, turns), repeat),
+        'encode_boards_per_sec': n / _time(lambda: position.encode_boards(lists, turns), repeat),
+        'decode_bitboards_per_sec': n / _time(lambda: position.decode_boards(records), repeat),
+        'to_fen_per_sec': n / _time(lambda: [position.to_fen(b, t) for b, t in zip(boards, turns)], repeat),
+        'from_fen_per_sec': n / _time(lambda: [position.from_fen(fen) for fen in fens], repeat),
+        'pickle_dumps_per_sec': n / _time(lambda: [pickle.dumps(board) for board in lists], repeat),
+        'pickle_loads_per_sec': n / _time(lambda: [pickle.loads(data) for data in pickled], repeat),
+    }
+
+
+def main():
+    # The round-trip checks live in tests/test_position.py
+    parser = argparse.ArgumentParser(description='Time position serialization')
+    parser.add_argument('--positions', type=int, default=2000, help='Number of sample positions')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of this many runs')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    positions = sample_positions(args.positions)
+    results = throughput(positions, args.repeat)
+    for metric, value in results.items():
+        print(f"{metric:28s} {value:12.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
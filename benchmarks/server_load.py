@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from src.bitboard import BitBoard, move_path, rc_to_square, square_to_rc
+from src.constants import *
+
+
+class Client:
+    """One connection to the game server, sending requests and timing the replies."""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, **request):
+        start = time.perf_counter()
+        self.writer.write(json.dumps(request).encode() + b'\n')
+        await self.writer.drain()
+        reply = json.loads(await self.reader.readline())
+        if not request.get('wait'):
+            self.latencies.append(time.perf_counter() - start)
+        return reply
+
+
+def board_from_state(state):
+    """Rebuild a BitBoard from the rows of a state reply."""
+    board = BitBoard()
+    board.red = board.black = board.kings = 0
+    for row, line in enumerate(state['board']):
+        for col, char in enumerate(line):
+            if char == '.':
+                continue
+            bit = 1 << rc_to_square(row, col)
+            if char in 'rR':
+                board.red |= bit
+            else:
+                board.black |= bit
+            if char.isupper():
+                board.kings |= bit
+    return board
+
+
+async def play(client, rng, max_moves):
+    """Play random legal moves against the server's AI. Returns the number of moves sent."""
+    state = await client.request(cmd='new', color=rng.choice(['red', 'black']))
+    session = state['session']
+    color = RED_PLAYER if state['you'] == 'red' else BLACK_PLAYER
+    sent = 0
+    while sent < max_moves:
+        state = await client.request(cmd='state', session=session, wait=True)
+        if state['result'] is not None or not state['ok']:
+            break
+        board = board_from_state(state)
+        moves = board.get_legal_moves(color)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        path = [square_to_rc(sq) for sq in move_path(board.red, board.black, board.kings, color, move)]
+        for start, end in zip(path, path[1:]):
+            reply = await client.request(cmd='move', session=session, **{'from': start, 'to': end})
+            if not reply['ok']:
+                raise RuntimeError(f"server rejected {start}->{end}: {reply['error']}")
+        sent += 1
+    await client.request(cmd='resign', session=session)
+    return sent
+
+
+async def run_load(host, port, unix, clients, games, max_moves, seed):
+    latencies = []
+    totals = {'games': 0, 'moves': 0}
+
+    async def worker(index):
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        client = Client(reader, writer, latencies)
+        rng = random.Random(seed + index)
+        for _ in range(games):
+            # Await first: += would read the total before the await and lose other clients' moves
+            moves = await play(client, rng, max_moves)
+            totals['moves'] += moves
+            totals['games'] += 1
+        stats = await client.request(cmd='stats')
+        writer.close()
+        return stats
+
+    start = time.perf_counter()
+    server_stats = (await asyncio.gather(*(worker(i) for i in range(clients))))[-1]
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(p):
+        return 1000 * latencies[int(p * (len(latencies) - 1))] if latencies else 0.0
+
+    return {'clients': clients, 'games': totals['games'], 'moves': totals['moves'],
+            'seconds': elapsed, 'client_moves_per_sec': totals['moves'] / elapsed,
+            'requests': len(latencies), 'p50_ms': percentile(0.5), 'p99_ms': percentile(0.99),
+            'server': server_stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive the game server with many concurrent clients')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', type=str, default=None, help='Connect to this Unix socket instead of TCP')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent connections')
+    parser.add_argument('--games', type=int, default=2, help='Games per client')
+    parser.add_argument('--max-moves', type=int, default=40, help='Client moves per game before resigning')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    report = asyncio.run(run_load(args.host, args.port, args.unix, args.clients, args.games,
+                                  args.max_moves, args.seed))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Each sample runs in a fresh interpreter so module caches do not hide import cost
+SNIPPET = """
+import sys, time, json
+t0 = time.perf_counter()
+from src.constants import RED_PLAYER
+from src.{module} import {cls}
+t1 = time.perf_counter()
+board = {cls}()
+t2 = time.perf_counter()
+moves = [board.get_valid_moves(piece) for piece in board.get_all_pieces(RED_PLAYER)]
+t3 = time.perf_counter()
+# Game-end detection must stay inside the lean core too
+from src.game import Game
+Game(None, board=board).outcome()
+t4 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'construct': t2 - t1, 'movegen': t3 - t2, 'outcome': t4 - t3,
+                  'pygame_loaded': 'pygame' in sys.modules,
+                  'numpy_loaded': 'numpy' in sys.modules,
+                  'tensorflow_loaded': 'tensorflow' in sys.modules}}))
+"""
+
+CORES = {'board': ('board', 'Board'), 'bitboard': ('bitboard', 'BitBoard')}
+
+
+def measure(module, cls, runs):
+    """Return per-phase median seconds over runs fresh interpreters."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', SNIPPET.format(module=module, cls=cls)],
+                                check=True, capture_output=True, text=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    result = {phase: statistics.median(sample[phase] for sample in samples)
+              for phase in ('import', 'construct', 'movegen', 'outcome')}
+    for flag in ('pygame_loaded', 'numpy_loaded', 'tensorflow_loaded'):
+        result[flag] = any(sample[flag] for sample in samples)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cost of importing the rules core and detecting game ends')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per core')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {name: measure(module, cls, args.runs) for name, (module, cls) in CORES.items()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:9s} import {result['import'] * 1000:7.2f}ms  "
+              f"construct {result['construct'] * 1000:6.3f}ms  "
+              f"movegen {result['movegen'] * 1000:6.3f}ms  "
+              f"outcome {result['outcome'] * 1000:6.3f}ms  "
+              f"pygame={result['pygame_loaded']} numpy={result['numpy_loaded']} "
+              f"tensorflow={result['tensorflow_loaded']}")
+
+
+if __name__ == '__main__':
+    main()
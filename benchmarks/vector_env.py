@@ -0,0 +1,117 @@
+import argparse
+import json
+import random
+import sys
+import time
+import numpy as np
+from src.constants import *
+from src.board import Board
+from src.bitboard import BitBoard, rc_to_square, square_to_rc
+from src.game import Game
+from src.ai.vector_env import VectorEnv
+
+
+def _legal_hops(game):
+    """{destination square: (row, col) of a piece that can hop there} for the side to move."""
+    if game.jumping_piece is not None:
+        start = (game.jumping_piece.row, game.jumping_piece.col)
+        return {rc_to_square(*end): start for end in game.valid_moves}
+    hops = {}
+    for piece, moves in game.board.get_all_valid_moves(game.turn).items():
+        for end in moves:
+            hops.setdefault(rc_to_square(*end), (piece.row, piece.col))
+    return hops
+
+
+def check_lockstep(num_envs=32, steps=500, seed=0):
+    """Play the same random hops in a VectorEnv and in Board-backed Games.
+
+    Returns a list of failure descriptions; empty when legal actions, boards,
+    observations and game results agree at every step.
+    """
+    env = VectorEnv(num_envs, max_plies=1 << 30)  # Game has no ply limit
+    games = [Game(None, board=Board()) for _ in range(num_envs)]
+    rng = np.random.default_rng(seed)
+    failures = []
+    for step in range(steps):
+        for i, game in enumerate(games):
+            if set(_legal_hops(game)) != set(np.flatnonzero(env.masks[i]).tolist()):
+                failures.append(f"step {step} game {i}: legal actions differ")
+        if failures:
+            return failures
+        actions = env.random_actions(rng)
+        _, rewards, dones = env.step(actions)
+        for i, game in enumerate(games):
+            start = square_to_rc(int(env.sources[i]))
+            game.make_move_from_action((start, square_to_rc(int(actions[i]))))
+            outcome = game.outcome()
+            if bool(dones[i]) != (outcome is not None):
+                failures.append(f"step {step} game {i}: game over is {outcome}, env done is {bool(dones[i])}")
+            elif outcome is not None:
+                if (outcome.winner or 0) != env.winners[i]:
+                    failures.append(f"step {step} game {i}: winner differs")
+                games[i] = Game(None, board=Board())
+            else:
+                board = BitBoard.from_board(game.board)
+                if ((board.red, board.black, board.kings, game.turn)
+                        != (int(env.red[i]), int(env.black[i]), int(env.kings[i]), int(env.turn[i]))
+                        or not np.array_equal(np.ravel(game.board.get_state()), env.states[i])):
+                    failures.append(f"step {step} game {i}: position differs")
+    return failures
+
+
+def vector_steps_per_sec(num_envs, steps, seed=0):
+    env = VectorEnv(num_envs)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(env.random_actions(rng))
+    return num_envs * steps / (time.perf_counter() - start)
+
+
+def board_steps_per_sec(num_games, steps, seed=0):
+    """The same random play, one Game at a time: legal actions, observation and one hop per game."""
+    games = [Game(None, board=Board()) for _ in range(num_games)]
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        for i, game in enumerate(games):
+            hops = _legal_hops(game)
+            action = rng.choice(list(hops))
+            game.make_move_from_action((hops[action], square_to_rc(action)))
+            if game.outcome() is not None:
+                games[i] = game = Game(None, board=Board())
+            game.board.get_state()
+    return num_games * steps / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare VectorEnv steps/sec with a per-game Board loop')
+    parser.add_argument('--envs', type=int, nargs='+', default=[1, 64, 1024, 4096],
+                        help='Batch sizes to time')
+    parser.add_argument('--steps', type=int, default=200, help='Steps per batch size')
+    parser.add_argument('--board-games', type=int, default=64, help='Games in the Board loop')
+    parser.add_argument('--check-steps', type=int, default=300, help='Lockstep comparison against Game (0 to skip)')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    failures = check_lockstep(steps=args.check_steps) if args.check_steps else []
+    for failure in failures[:20]:
+        print(f"FAILED: {failure}")
+    print(f"lockstep against Game: {'ok' if not failures else f'{len(failures)} failures'}")
+
+    board_rate = board_steps_per_sec(args.board_games, args.steps)
+    results = {'board_loop': board_rate}
+    print(f"{'Board loop':16s} {board_rate:12.0f} steps/s")
+    for n in args.envs:
+        rate = vector_steps_per_sec(n, args.steps)
+        results[f'vector_{n}'] = rate
+        print(f"{f'VectorEnv N={n}':16s} {rate:12.0f} steps/s  ({rate / board_rate:6.1f}x)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'failures': failures, 'results': results}, f, indent=2)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
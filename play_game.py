@@ -1,16 +1,31 @@
 import pygame
 import sys
 import argparse
-from src.game import Game
+from src.game import Game, describe_outcome
+from src import trace
 from src.constants import *
-from src.ai.agent import CheckersAI
+from src.ai.arena import ModelPlayer
+from src.ai.book import BookEngine, OpeningBook
+from src.ai.mcts import load_mcts
+from src.ai.search import AlphaBetaSearch
+from src.ai.tablebase import Tablebase
+from src.ai.worker import AsyncAI, PlayerEngine
 
 def main():
     parser = argparse.ArgumentParser(description='Play checkers against AI')
-    parser.add_argument('--model', type=str, required=True, help='Path to the AI model file')
+    parser.add_argument('--model', type=str, default=None,
+                      help='Path to the AI model file (default: use the alpha-beta search)')
+    parser.add_argument('--mcts', action='store_true',
+                      help='Use Monte Carlo tree search, guided by --model when given')
+    parser.add_argument('--think_time', type=float, default=1.0, help='Seconds the AI may think per move')
+    parser.add_argument('--no_ponder', action='store_true', help="Don't search during your turn")
+    parser.add_argument('--tablebase', type=str, default=None, help='Endgame tablebase file')
+    parser.add_argument('--book', type=str, default=None, help='Opening book file, used before the AI')
     parser.add_argument('--player_color', type=str, default='black', choices=['red', 'black'],
                       help='Choose your color (red or black)')
+    trace.add_arguments(parser)
     args = parser.parse_args()
+    reporter = trace.from_arguments(args)
 
     # Initialize Pygame
     pygame.init()
@@ -22,13 +37,24 @@ def main():
     # Initialize game
     game = Game(WIN)
     
-    # Initialize AI
-    ai = CheckersAI()
-    ai.load_model(args.model)
-    
     # Set player and AI colors
     player_color = RED_PLAYER if args.player_color.lower() == 'red' else BLACK_PLAYER
     ai_color = BLACK_PLAYER if player_color == RED_PLAYER else RED_PLAYER
+
+    # Initialize AI; it thinks on a background thread so the window stays responsive
+    tablebase = Tablebase(args.tablebase) if args.tablebase else None
+    if args.mcts:
+        engine = load_mcts(args.model)
+        ponder = not args.no_ponder  # The tree built while pondering is kept for the reply
+    elif args.model:
+        engine = PlayerEngine(ModelPlayer(args.model, tablebase))
+        ponder = False  # The policy model has nothing to gain from pondering
+    else:
+        engine = AlphaBetaSearch(tablebase=tablebase)
+        ponder = not args.no_ponder
+    if args.book:
+        engine = BookEngine(OpeningBook(args.book), engine)
+    ai = AsyncAI(engine, ai_color, time_limit=args.think_time, ponder=ponder)
     
     # Main game loop
     running = True
@@ -37,30 +63,21 @@ def main():
     while running:
         clock.tick(FPS)
         
-        # If it's AI's turn
-        if game.turn == ai_color:
-            # Get board state and valid moves
-            board_state = game.board.get_state()
-            valid_moves = game.board.get_valid_moves_mask()
-            
-            # Get AI's move
-            pieces = game.board.get_all_pieces(ai_color)
-            for piece in pieces:
-                moves = game.board.get_valid_moves(piece)
-                if moves:
-                    # AI selects this piece
-                    game.select(piece.row, piece.col)
-                    # Get AI's chosen move
-                    move_positions = list(moves.keys())
-                    if move_positions:
-                        row, col = move_positions[0]  # Take first valid move
-                        game.select(row, col)
-                        break
+        # Start, cancel or apply the AI's background work for this position
+        ai.update(game)
+
+        outcome = game.outcome()
+        if outcome is not None:
+            print(describe_outcome(outcome))
+            running = False
         
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+
+            if event.type == pygame.VIDEOEXPOSE and game.renderer is not None:
+                game.renderer.invalidate()
             
             # Handle player moves
             if event.type == pygame.MOUSEBUTTONDOWN and game.turn == player_color:
@@ -71,7 +88,12 @@ def main():
         
         # Update display
         game.update()
+        if reporter is not None:
+            reporter.tick()
     
+    ai.close()
+    if reporter is not None:
+        reporter.close()
     pygame.quit()
     sys.exit()
 
@@ -1,15 +1,33 @@
 import numpy as np
-import tensorflow as tf
 from src.constants import *
 
+# TensorFlow takes seconds to import, so it is only loaded when a model is needed
+tf = None
+
+
+def _tensorflow():
+    global tf
+    if tf is None:
+        import tensorflow
+        tf = tensorflow
+    return tf
+
+
 class CheckersAI:
     def __init__(self):
         self.model = None
         
-    def load_model(self, model_path):
-        """Load a trained model from file."""
+    def load_model(self, model_path, quantize=False):
+        """Load a trained model from file.
+
+        An .npz file from src.ai.numpy_model runs in NumPy without importing TensorFlow.
+        """
+        if str(model_path).endswith('.npz'):
+            from src.ai.numpy_model import NumpyModel
+            self.model = NumpyModel(model_path, quantize)
+            return
         try:
-            self.model = tf.keras.models.load_model(model_path)
+            self.model = _tensorflow().keras.models.load_model(model_path)
         except Exception as e:
             print(f"Error loading model: {e}")
             # Create a simple fallback model if loading fails
@@ -17,6 +35,7 @@ class CheckersAI:
     
     def _create_fallback_model(self):
         """Create a simple model for fallback."""
+        tf = _tensorflow()
         model = tf.keras.Sequential([
             tf.keras.layers.Dense(64, activation='relu', input_shape=(32,)),
             tf.keras.layers.Dense(32, activation='relu'),
@@ -76,5 +95,5 @@ class CheckersAI:
         if isinstance(action, tuple):
             return action
         row = action // 4
-        col = (action % 4) * 2 + (row % 2)
+        col = (action % 4) * 2 + (1 - row % 2)
         return (row, col) 
\ No newline at end of file
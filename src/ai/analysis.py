@@ -0,0 +1,144 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from src.constants import *
+from src.bitboard import BitBoard, move_path
+from src.pdn import PDNError, read_games, format_move, format_squares
+from src.ai.search import AlphaBetaSearch, MATE
+
+BLUNDER_THRESHOLD = 150  # Evaluation lost by a move, in search score units (a man is 100)
+
+# Per-process searcher, built once by _init_worker
+_searcher = None
+_settings = None
+
+
+def _init_worker(time_limit, depth, tt_size, tablebase_path):
+    global _searcher, _settings
+    tablebase = None
+    if tablebase_path:
+        from src.ai.tablebase import Tablebase
+        tablebase = Tablebase(tablebase_path)
+    _searcher = AlphaBetaSearch(tt_size=tt_size, tablebase=tablebase)
+    _settings = (time_limit, depth)
+
+
+def _evaluate(board, turn):
+    """(score for the side to move, best move) of a position."""
+    return _search(BitBoard.from_board(board), turn)
+
+
+def _search(board, turn, forced=0):
+    moves = board.get_legal_moves(turn)
+    if not moves:
+        return -MATE, None
+    if len(moves) == 1 and forced < 16:
+        # The searcher returns forced moves unscored; score the position they lead to
+        board.apply(turn, moves[0])
+        score, _ = _search(board, BLACK_PLAYER if turn == RED_PLAYER else RED_PLAYER, forced + 1)
+        return -score, moves[0]
+    time_limit, depth = _settings
+    result = _searcher.search(board, turn, time_limit, depth)
+    return result.score, result.move
+
+
+def analyze_game(job):
+    """Annotate every move of one game. Runs in a worker process."""
+    game, threshold = job
+    record = {'game': game.index, 'tags': game.tags, 'result': game.result}
+    try:
+        positions = []
+        for board, turn, move in game.replay():
+            score, best = _evaluate(board, turn)
+            positions.append((turn, move, score, best, BitBoard.from_board(board)))
+        # replay has made the last move by the time it finishes; that position scores it
+        if game.moves:
+            turn = BLACK_PLAYER if turn == RED_PLAYER else RED_PLAYER
+            final_score, _ = _evaluate(board, turn)
+    except PDNError as e:
+        record['error'] = str(e)
+        return record
+
+    annotations = []
+    for ply, (turn, move, score, best, before) in enumerate(positions):
+        after = positions[ply + 1][2] if ply + 1 < len(positions) else final_score
+        # Both scores are for the side to move, so the mover's result after the move is -after
+        loss = score + after
+        best_text = None
+        if best is not None:
+            path = move_path(before.red, before.black, before.kings, turn, best)
+            best_text = format_squares([sq + 1 for sq in path], bool(best[2]))
+        annotations.append({'ply': ply + 1, 'side': 'red' if turn == RED_PLAYER else 'black',
+                            'move': format_move(move), 'eval': score, 'best': best_text,
+                            'loss': loss, 'blunder': loss >= threshold})
+    record['moves'] = annotations
+    record['blunders'] = sum(annotation['blunder'] for annotation in annotations)
+    return record
+
+
+def analyze(paths, output, workers=None, time_limit=None, depth=6, threshold=BLUNDER_THRESHOLD,
+            tt_size=1 << 18, tablebase=None, report_every=100):
+    """Analyze every game in the PDN files across a process pool, streaming JSONL to output.
+
+    At most a few games per worker are in flight, so neither the archive nor
+    the results are ever held in memory. Results are written in input order.
+    Returns a summary dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = 4 * workers
+    summary = {'games': 0, 'errors': 0, 'moves': 0, 'blunders': 0}
+    start = time.perf_counter()
+
+    def write(record):
+        out.write(json.dumps(record) + '\n')
+        summary['games'] += 1
+        if 'error' in record:
+            summary['errors'] += 1
+        else:
+            summary['moves'] += len(record['moves'])
+            summary['blunders'] += record['blunders']
+        if summary['games'] % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{summary['games']:7d} games  {summary['blunders']} blunders  "
+                  f"{summary['games'] / elapsed:.1f} games/s", file=sys.stderr)
+
+    with open(output, 'w') as out, multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(time_limit, depth, tt_size, tablebase)) as pool:
+        pending = deque()
+        for path in paths:
+            for game in read_games(path):
+                pending.append(pool.apply_async(analyze_game, ((game, threshold),)))
+                if len(pending) >= window:
+                    write(pending.popleft().get())
+        while pending:
+            write(pending.popleft().get())
+
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Annotate PDN games with search evaluations and flag blunders')
+    parser.add_argument('files', nargs='+', help='PDN files')
+    parser.add_argument('--output', type=str, required=True, help='JSONL file, one record per game')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--depth', type=int, default=6, help='Search depth per position')
+    parser.add_argument('--time', type=float, default=None, help='Seconds per position instead of a fixed depth')
+    parser.add_argument('--threshold', type=int, default=BLUNDER_THRESHOLD,
+                        help='Evaluation a move must lose to count as a blunder (a man is 100)')
+    parser.add_argument('--tablebase', type=str, default=None, help='Endgame tablebase file')
+    parser.add_argument('--report-every', type=int, default=100)
+    args = parser.parse_args()
+
+    summary = analyze(args.files, args.output, args.workers, args.time,
+                      None if args.time else args.depth, args.threshold,
+                      tablebase=args.tablebase, report_every=args.report_every)
+    print(json.dumps(summary))
+
+
+if __name__ == '__main__':
+    main()
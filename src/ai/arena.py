@@ -0,0 +1,254 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from src.constants import *
+from src.bitboard import BitBoard, square_to_rc
+
+MAX_PLIES = 200  # Games longer than this are scored as draws
+
+# Per-process players, loaded once by _init_worker and reused for every game
+_players = None
+
+
+class RandomPlayer:
+    """Plays a uniformly random legal move."""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose(self, board, color, moves):
+        return self.rng.choice(moves)
+
+
+class SearchPlayer:
+    """Plays the alpha-beta search move under a fixed time budget."""
+
+    def __init__(self, time_limit=0.1, tablebase=None):
+        from src.ai.search import AlphaBetaSearch
+        self.time_limit = time_limit
+        self.searcher = AlphaBetaSearch(tt_size=1 << 18, tablebase=tablebase)
+
+    def choose(self, board, color, moves):
+        return self.searcher.search(board, color, self.time_limit).move
+
+
+class ModelPlayer:
+    """Plays the move whose destination square CheckersAI ranks highest.
+
+    Once few enough pieces are left for the tablebase, it plays the table's move.
+    """
+
+    def __init__(self, model_path, tablebase=None):
+        from src.ai.agent import CheckersAI
+        self.ai = CheckersAI()
+        self.ai.load_model(model_path)
+        self.tablebase = tablebase
+
+    def choose(self, board, color, moves):
+        if self.tablebase is not None and self.tablebase.covers(board.red, board.black):
+            return self.tablebase.best_move(board, color)
+        by_destination = {}
+        for move in moves:
+            by_destination.setdefault(square_to_rc(move[1]), move)
+        target = self.ai.get_move(board.get_state(), by_destination)
+        return by_destination.get(target, moves[0])
+
+
+def make_player(spec, seed=None, tablebase=None):
+    """Build a player from a spec: random, search[:seconds], model:<path> or mcts[:<path>]."""
+    kind, _, arg = spec.partition(':')
+    if kind == 'random':
+        return RandomPlayer(seed)
+    if kind == 'search':
+        return SearchPlayer(float(arg) if arg else 0.1, tablebase)
+    if kind == 'model':
+        return ModelPlayer(arg, tablebase)
+    if kind == 'mcts':
+        from src.ai.mcts import load_mcts
+        return load_mcts(arg or None, seed=seed)
+    raise ValueError(f"Unknown player spec: {spec}")
+
+
+def make_openings(count, plies, seed=0):
+    """Return count distinct random opening lines of the given length."""
+    rng = random.Random(seed)
+    openings = []
+    seen = set()
+    attempts = 0
+    while len(openings) < count and attempts < count * 20:
+        attempts += 1
+        board = BitBoard()
+        color = RED_PLAYER
+        line = []
+        for _ in range(plies):
+            moves = board.get_legal_moves(color)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            line.append(move)
+            board.apply(color, move)
+            color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        if tuple(line) not in seen:
+            seen.add(tuple(line))
+            openings.append(line)
+    return openings
+
+
+def play_game(player_red, player_black, opening=(), max_plies=MAX_PLIES, moves_out=None):
+    """Play one game and return (winner, plies). winner is None for a draw.
+
+    A side that cannot move loses. Threefold repetition, 40 moves each without
+    a capture, and reaching max_plies are draws.
+    If moves_out is a list, every move played is appended to it.
+    """
+    from src.termination import TerminationTracker
+    board = BitBoard()
+    color = RED_PLAYER
+    tracker = TerminationTracker(board.red, board.black, board.kings, color)
+    players = {RED_PLAYER: player_red, BLACK_PLAYER: player_black}
+    for ply in range(max_plies):
+        outcome = tracker.outcome()
+        if outcome is not None:
+            return outcome.winner, ply
+        moves = tracker.legal_moves()
+        if ply < len(opening):
+            move = opening[ply]
+        else:
+            move = players[color].choose(board, color, moves)
+        if moves_out is not None:
+            moves_out.append(move)
+        board.apply(color, move)
+        tracker.push(move)
+        color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+    return None, max_plies
+
+
+def _init_worker(spec_a, spec_b, seed, tablebase_path=None):
+    global _players
+    worker_seed = seed + os.getpid()
+    # Every worker maps the same file, so the table is shared through the page cache
+    tablebase = None
+    if tablebase_path:
+        from src.ai.tablebase import Tablebase
+        tablebase = Tablebase(tablebase_path)
+    _players = (make_player(spec_a, worker_seed, tablebase),
+                make_player(spec_b, worker_seed + 1, tablebase))
+
+
+def _run_game(job):
+    index, opening, a_is_red, record_moves = job
+    player_a, player_b = _players
+    moves = [] if record_moves else None
+    start = time.perf_counter()
+    if a_is_red:
+        winner, plies = play_game(player_a, player_b, opening, moves_out=moves)
+    else:
+        winner, plies = play_game(player_b, player_a, opening, moves_out=moves)
+    a_color = RED_PLAYER if a_is_red else BLACK_PLAYER
+    if winner is None:
+        result = 'draw'
+    else:
+        result = 'win' if winner == a_color else 'loss'
+    record = {'game': index, 'a_color': 'red' if a_is_red else 'black', 'result': result,
+              'plies': plies, 'seconds': time.perf_counter() - start}
+    if record_moves:
+        # Enough to replay the game, e.g. for building an opening book
+        record['winner'] = None if winner is None else ('red' if winner == RED_PLAYER else 'black')
+        record['moves'] = moves
+    return record
+
+
+def elo_summary(wins, draws, losses):
+    """Return (elo, low, high) for player A with a 95% confidence interval."""
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, 0.0, 0.0
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(s):
+        s = min(max(s, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / s - 1)
+
+    return to_elo(score), to_elo(score - margin), to_elo(score + margin)
+
+
+def run_match(spec_a, spec_b, games, workers=None, opening_plies=4, seed=0,
+              output=None, report_every=100, tablebase=None, record_moves=False):
+    """Play games between spec_a and spec_b across a process pool.
+
+    Every opening is played twice with colours swapped. Per-game results are
+    streamed to output (JSON lines) as they finish, including every move when
+    record_moves is set. Returns the final tally.
+    """
+    workers = workers or os.cpu_count() or 1
+    openings = make_openings((games + 1) // 2, opening_plies, seed)
+    jobs = []
+    for index in range(games):
+        opening = openings[(index // 2) % len(openings)] if openings else []
+        jobs.append((index, opening, index % 2 == 0, record_moves))
+
+    tally = {'win': 0, 'draw': 0, 'loss': 0}
+    start = time.perf_counter()
+    out = open(output, 'w') if output else None
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(spec_a, spec_b, seed, tablebase)) as pool:
+            for done, record in enumerate(pool.imap_unordered(_run_game, jobs), 1):
+                tally[record['result']] += 1
+                if out:
+                    out.write(json.dumps(record) + '\n')
+                    out.flush()
+                if done % report_every == 0 or done == games:
+                    _report(tally, done, time.perf_counter() - start, workers)
+    finally:
+        if out:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    elo, low, high = elo_summary(tally['win'], tally['draw'], tally['loss'])
+    return dict(tally, games=games, elo=elo, elo_low=low, elo_high=high, seconds=elapsed,
+                games_per_sec_per_core=games / elapsed / workers if elapsed > 0 else 0.0)
+
+
+def _report(tally, done, elapsed, workers):
+    elo, low, high = elo_summary(tally['win'], tally['draw'], tally['loss'])
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"{done:6d} games  W {tally['win']}  D {tally['draw']}  L {tally['loss']}  "
+          f"Elo {elo:+.0f} [{low:+.0f}, {high:+.0f}]  "
+          f"{rate:.1f} games/s ({rate / workers:.2f} per core)")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play a headless match between two players')
+    parser.add_argument('--a', type=str, required=True,
+                        help='Player A: random, search[:seconds], model:<path> or mcts[:<path>]')
+    parser.add_argument('--b', type=str, default='random', help='Player B, same format as --a')
+    parser.add_argument('--games', type=int, default=1000, help='Number of games')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--opening-plies', type=int, default=4, help='Random plies before players take over')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=str, default=None, help='Stream per-game results to this JSONL file')
+    parser.add_argument('--report-every', type=int, default=100)
+    parser.add_argument('--tablebase', type=str, default=None,
+                        help='Endgame tablebase file used by search and model players')
+    parser.add_argument('--record-moves', action='store_true',
+                        help='Include the moves of every game in --output')
+    args = parser.parse_args()
+
+    summary = run_match(args.a, args.b, args.games, args.workers, args.opening_plies,
+                        args.seed, args.output, args.report_every, args.tablebase,
+                        args.record_moves)
+    print(json.dumps(summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import json
+import mmap
+import random
+import struct
+import numpy as np
+from src.constants import *
+from src.bitboard import BitBoard, generate_moves, pack_move, unpack_move
+from src.zobrist import Zobrist
+from src.ai.search import SearchResult
+
+# File layout: header, (buckets + 1) uint32 record offsets, then the records.
+# Records are grouped by bucket (hash & (buckets - 1)), so a lookup reads one
+# offset pair and scans the handful of records in that bucket.
+MAGIC = b'CKBK'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxII')
+RECORD = np.dtype([('hash', '<u8'), ('move', '<u8'), ('games', '<u4'), ('score', '<u4')])
+
+
+def aggregate(games, max_plies=20, zobrist=None):
+    """Collect per-position move statistics from games.
+
+    games yields (moves, winner) with moves as (src, dst, captured) lists from the
+    start position. Returns {(hash, packed move): [games, score]} where score counts
+    2 for a win and 1 for a draw by the side that played the move.
+    """
+    zobrist = zobrist or Zobrist()
+    stats = {}
+    for moves, winner in games:
+        board = BitBoard()
+        color = RED_PLAYER
+        key = zobrist.hash(board.red, board.black, board.kings, color)
+        for move in moves[:max_plies]:
+            move = tuple(move)
+            if move not in generate_moves(board.red, board.black, board.kings, color):
+                break  # Corrupt or foreign record: keep what was valid so far
+            entry = stats.setdefault((key, pack_move(move)), [0, 0])
+            entry[0] += 1
+            entry[1] += 1 if winner is None else (2 if winner == color else 0)
+            key = zobrist.update(key, board.red, board.black, board.kings, color, move)
+            board.apply(color, move)
+            color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+    return stats
+
+
+def write_book(stats, path, min_games=1):
+    """Write aggregated statistics to a hashed binary book file. Returns the record count."""
+    items = [(key, move, counts[0], counts[1]) for (key, move), counts in stats.items()
+             if counts[0] >= min_games]
+    records = np.array(items, dtype=RECORD) if items else np.zeros(0, dtype=RECORD)
+    # About two records per bucket keeps the offset table small and scans short
+    buckets = 1 << max(len(records) // 2, 1).bit_length()
+    bucket = records['hash'] & np.uint64(buckets - 1)
+    order = np.lexsort((-records['games'].astype(np.int64), records['hash'], bucket))
+    records = records[order]
+    offsets = np.searchsorted(bucket[order], np.arange(buckets + 1)).astype('<u4')
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, buckets, len(records)))
+        f.write(offsets.tobytes())
+        f.write(records.tobytes())
+    return len(records)
+
+
+class OpeningBook:
+    """Read-only opening book accessed through mmap."""
+
+    def __init__(self, path, zobrist=None):
+        self.zobrist = zobrist or Zobrist()
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.buckets, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        self.offsets = np.frombuffer(self._mmap, dtype='<u4', count=self.buckets + 1,
+                                     offset=HEADER.size)
+        self.records = np.frombuffer(self._mmap, dtype=RECORD, count=count,
+                                     offset=HEADER.size + 4 * (self.buckets + 1))
+
+    def close(self):
+        self.offsets = self.records = None
+        self._mmap.close()
+        self._file.close()
+
+    def lookup(self, board, color):
+        """Return [(move, weight, games, score)] for the position, best supported first.
+
+        weight is wins + draws / 2 + 1/2 for the side to move, so every book move
+        keeps some chance of being played.
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        key = self.zobrist.hash(board.red, board.black, board.kings, color)
+        bucket = key & (self.buckets - 1)
+        start, end = int(self.offsets[bucket]), int(self.offsets[bucket + 1])
+        legal = None
+        entries = []
+        for record in self.records[start:end]:
+            if int(record['hash']) != key:
+                continue
+            if legal is None:
+                legal = set(generate_moves(board.red, board.black, board.kings, color))
+            move = unpack_move(int(record['move']))
+            # Guards against hash collisions
+            if move in legal:
+                games, score = int(record['games']), int(record['score'])
+                entries.append((move, (score + 1) / 2, games, score))
+        return entries
+
+    def choose(self, board, color, rng=random):
+        """Pick a book move at random in proportion to its weight, or None if out of book."""
+        entries = self.lookup(board, color)
+        if not entries:
+            return None
+        return rng.choices([entry[0] for entry in entries],
+                           weights=[entry[1] for entry in entries])[0]
+
+
+class BookEngine:
+    """Engine wrapper that plays book moves and falls back to another engine out of book."""
+
+    def __init__(self, book, engine):
+        self.book = book
+        self.engine = engine
+
+    def search(self, board, color, time_limit=None, cancel=None):
+        move = self.book.choose(board, color)
+        if move is not None:
+            return SearchResult(move, 0, 0, 0, 0.0, 0.0)
+        return self.engine.search(board, color, time_limit, cancel=cancel)
+
+    def stop(self):
+        if hasattr(self.engine, 'stop'):
+            self.engine.stop()
+
+
+def read_game_records(paths):
+    """Yield (moves, winner) from JSONL game records, e.g. arena --record-moves output."""
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                record = json.loads(line)
+                if 'moves' not in record:
+                    continue
+                winner = {'red': RED_PLAYER, 'black': BLACK_PLAYER}.get(record.get('winner'))
+                yield record['moves'], winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an opening book from game records')
+    parser.add_argument('games', nargs='+', help='JSONL game records (python -m src.ai.arena --record-moves)')
+    parser.add_argument('--output', type=str, required=True, help='Book file to write')
+    parser.add_argument('--max-plies', type=int, default=20, help='Only book the first plies of each game')
+    parser.add_argument('--min-games', type=int, default=2, help='Drop moves played fewer times')
+    args = parser.parse_args()
+
+    stats = aggregate(read_game_records(args.games), args.max_plies)
+    count = write_book(stats, args.output, args.min_games)
+    print(f"Wrote {count} book moves to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+
+class InferenceQueue:
+    """Collects single-position requests from many callers into batched forward passes.
+
+    A background thread waits for the first request, then keeps collecting until
+    either max_batch_size requests are queued or max_latency seconds have passed
+    since that first request, and runs one model.predict over the whole batch.
+    Each caller gets a Future (or a callback) with its own row of the output.
+
+    The queue also has a model-like predict(states) method, so it can stand in
+    for a Keras model, e.g. ``ai.model = InferenceQueue(ai.model)`` shared by many
+    CheckersAI instances.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_latency=0.002, input_size=32,
+                 latency_window=100000):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.input_size = input_size
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._running = True
+        self._batch = np.zeros((max_batch_size, input_size), dtype=np.float32)
+
+        # Stats
+        self._latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self.started = time.perf_counter()
+
+        self._thread = threading.Thread(target=self._run, name='inference-queue', daemon=True)
+        self._thread.start()
+
+    def submit(self, state, callback=None):
+        """Queue one position and return a Future for its model output row.
+
+        If callback is given it is called with the output row from the worker thread.
+        """
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda f: callback(f.result()))
+        with self._cond:
+            if not self._running:
+                raise RuntimeError("InferenceQueue is closed")
+            self._pending.append((np.asarray(state, dtype=np.float32).reshape(-1),
+                                  future, time.perf_counter()))
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._cond.notify()
+        return future
+
+    def predict(self, states, verbose=0):
+        """Model-compatible blocking call: queue every row and wait for all results."""
+        states = np.asarray(states, dtype=np.float32).reshape(-1, self.input_size)
+        futures = [self.submit(state) for state in states]
+        return np.stack([future.result() for future in futures])
+
+    def close(self):
+        """Stop the worker after flushing anything still queued."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and self._running:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Wait for a full batch or for the oldest request's deadline
+                deadline = self._pending[0][2] + self.max_latency
+                while self._running and len(self._pending) < self.max_batch_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                count = min(len(self._pending), self.max_batch_size)
+                items = [self._pending.popleft() for _ in range(count)]
+            self._flush(items)
+
+    def _flush(self, items):
+        count = len(items)
+        batch = self._batch[:count]
+        for i, (state, _, _) in enumerate(items):
+            batch[i] = state
+        start = time.perf_counter()
+        try:
+            outputs = np.asarray(self.model.predict(batch, verbose=0))
+        except Exception as e:
+            for _, future, _ in items:
+                future.set_exception(e)
+            return
+        done = time.perf_counter()
+        self.busy_time += done - start
+        self.batches += 1
+        self.requests += count
+        for i, (_, future, submitted) in enumerate(items):
+            self._latencies.append(done - submitted)
+            future.set_result(outputs[i])
+
+    def stats(self):
+        """Return throughput and latency percentiles (milliseconds) so far."""
+        elapsed = time.perf_counter() - self.started
+        latencies = np.array(self._latencies) * 1000.0
+        stats = {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'throughput': self.requests / elapsed if elapsed > 0 else 0.0,
+            'model_busy': self.busy_time / elapsed if elapsed > 0 else 0.0,
+        }
+        for p in (50, 90, 99):
+            stats[f'p{p}_ms'] = float(np.percentile(latencies, p)) if len(latencies) else 0.0
+        return stats
+
+    def reset_stats(self):
+        self._latencies.clear()
+        self.requests = self.batches = 0
+        self.busy_time = 0.0
+        self.started = time.perf_counter()
+
+
+def benchmark(model, clients=32, requests_per_client=200, batch_sizes=(1, 8, 32, 64),
+              max_latency=0.002):
+    """Drive the queue from many threads and return stats for each batch size."""
+    results = []
+    for batch_size in batch_sizes:
+        queue = InferenceQueue(model, max_batch_size=batch_size, max_latency=max_latency)
+        rng = np.random.default_rng(0)
+        states = rng.integers(-2, 3, size=(requests_per_client, 32)).astype(np.float32)
+
+        def client():
+            for state in states:
+                queue.submit(state).result()
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        queue.reset_stats()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = queue.stats()
+        stats['max_batch_size'] = batch_size
+        results.append(stats)
+        queue.close()
+    return results
+
+
+def main():
+    from src.ai.agent import CheckersAI
+
+    parser = argparse.ArgumentParser(description='Measure batched inference throughput and latency')
+    parser.add_argument('--model', type=str, required=True, help='Path to the AI model file')
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent requesting threads')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per client')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--max-latency-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    ai = CheckersAI()
+    ai.load_model(args.model)
+    for stats in benchmark(ai.model, args.clients, args.requests, args.batch_sizes,
+                           args.max_latency_ms / 1000.0):
+        print(f"batch {stats['max_batch_size']:4d}  mean batch {stats['mean_batch_size']:6.1f}  "
+              f"{stats['throughput']:9.0f} pos/s  p50 {stats['p50_ms']:6.2f}ms  "
+              f"p90 {stats['p90_ms']:6.2f}ms  p99 {stats['p99_ms']:6.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
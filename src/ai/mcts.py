@@ -0,0 +1,385 @@
+import argparse
+import math
+import time
+import numpy as np
+from src.constants import *
+from src.bitboard import BitBoard, generate_moves, apply_move, pack_move, unpack_move
+from src.encoding import encode_bitboards
+from src.ai.search import SearchResult, evaluate
+
+UNEXPANDED = -1
+VALUE_SCALE = 300.0  # Evaluation points mapped to a value of tanh(1) when there is no value head
+
+
+class MCTS:
+    """PUCT Monte Carlo tree search guided by a policy model.
+
+    The model's 32 outputs (one per destination square, as in CheckersAI) are
+    the priors of the legal moves landing on each square. A 33rd output, if the
+    model has one, is read as a value in [-1, 1] for the side to move; otherwise
+    the static evaluation is squashed into that range. With no model at all the
+    priors are uniform.
+
+    Each simulation descends with virtual loss, so batch_size different leaves
+    are collected and evaluated in one forward pass. Nodes live in preallocated
+    arrays: a node's children are one contiguous block, found through
+    first_child and n_children. Between moves the subtree under the position
+    actually reached is kept and packed to the front of the arrays.
+    """
+
+    def __init__(self, model=None, capacity=1 << 22, batch_size=32, c_puct=1.5,
+                 virtual_loss=1.0, noise=None, seed=None, time_limit=0.1):
+        self.model = model
+        self.time_limit = time_limit  # Per move when used as an arena player
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.virtual_loss = virtual_loss
+        self.noise = noise  # (alpha, fraction) of Dirichlet noise mixed into the root priors
+        self.rng = np.random.default_rng(seed)
+        self.parent = np.empty(capacity, dtype=np.int32)
+        self.first_child = np.empty(capacity, dtype=np.int32)
+        self.n_children = np.empty(capacity, dtype=np.int16)
+        self.moves = np.empty(capacity, dtype=np.int64)
+        self.visits = np.empty(capacity, dtype=np.float32)
+        self.value_sum = np.empty(capacity, dtype=np.float32)
+        self.prior = np.empty(capacity, dtype=np.float32)
+        self.stop_requested = False
+        self.collisions = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the tree."""
+        self.size = 0
+        self.root = None
+        self.root_position = None
+        self.root_prior = None  # (position, priors before noise) of the last root given noise
+
+    def _new_nodes(self, count, parent):
+        """Allocate a contiguous block of count nodes, or return None when full."""
+        if self.size + count > self.capacity:
+            return None
+        start = self.size
+        self.size += count
+        block = slice(start, start + count)
+        self.parent[block] = parent
+        self.first_child[block] = UNEXPANDED
+        self.n_children[block] = 0
+        self.visits[block] = 0
+        self.value_sum[block] = 0
+        self.prior[block] = 0
+        return start
+
+    # Tree reuse
+
+    def _set_root(self, red, black, kings, color):
+        """Point the root at this position, keeping any subtree already built for it."""
+        position = (red, black, kings, color)
+        if self.root is not None:
+            if self.root_position == position:
+                return
+            node = self._find(position)
+            if node is not None:
+                self._compact(node)
+                self.root_position = position
+                return
+        self.reset()
+        self.root = self._new_nodes(1, UNEXPANDED)
+        self.root_position = position
+
+    def _find(self, position):
+        """Search the root's children and grandchildren for a position."""
+        red, black, kings, color = self.root_position
+        frontier = [(self.root, red, black, kings, color)]
+        for _ in range(2):
+            next_frontier = []
+            for node, r, b, k, c in frontier:
+                first = self.first_child[node]
+                if first == UNEXPANDED:
+                    continue
+                opponent = BLACK_PLAYER if c == RED_PLAYER else RED_PLAYER
+                for child in range(first, first + self.n_children[node]):
+                    child_position = apply_move(r, b, k, c, unpack_move(int(self.moves[child]))) + (opponent,)
+                    if child_position == position:
+                        return child
+                    next_frontier.append((child,) + child_position)
+            frontier = next_frontier
+        return None
+
+    def advance(self, move):
+        """Make the child reached by move the new root, e.g. after it was played."""
+        red, black, kings, color = self.root_position
+        opponent = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        self._set_root(*apply_move(red, black, kings, color, move), opponent)
+
+    def _compact(self, node):
+        """Renumber the subtree under node to the front of the arrays."""
+        order = [node]
+        new_first = [UNEXPANDED]
+        i = 0
+        while i < len(order):
+            old = order[i]
+            first = int(self.first_child[old])
+            if first != UNEXPANDED:
+                new_first[i] = len(order)
+                count = int(self.n_children[old])
+                order.extend(range(first, first + count))
+                new_first.extend([UNEXPANDED] * count)
+            i += 1
+        order = np.array(order, dtype=np.int64)
+        new_first = np.array(new_first, dtype=np.int32)
+        n = len(order)
+        n_children = self.n_children[order]
+        for array in (self.moves, self.visits, self.value_sum, self.prior):
+            array[:n] = array[order]
+        self.n_children[:n] = n_children
+        self.first_child[:n] = new_first
+        self.parent[0] = UNEXPANDED
+        for index in np.flatnonzero((new_first != UNEXPANDED) & (n_children > 0)):
+            start = new_first[index]
+            self.parent[start:start + n_children[index]] = index
+        self.size = n
+        self.root = 0
+
+    # Search
+
+    def search(self, board, color, time_limit=1.0, simulations=None, cancel=None):
+        """Run simulations from board and return a SearchResult for the most visited move.
+
+        Stops after time_limit seconds, after simulations playouts, on stop(), when
+        the threading.Event cancel is set, or when the node arrays are full,
+        whichever comes first.
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        self.stop_requested = False
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit else None
+        self._set_root(board.red, board.black, board.kings, color)
+        moves = generate_moves(board.red, board.black, board.kings, color)
+        if len(moves) <= 1:
+            return SearchResult(moves[0] if moves else None, 0, 0, 0, 0.0, 0.0)
+
+        done = 0
+        if self.noise is not None:
+            if self.first_child[self.root] == UNEXPANDED:
+                done += self._simulate_batch(1)  # Expand the root so there are priors to perturb
+            self.add_root_noise()
+        while not self.stop_requested:
+            if cancel is not None and cancel.is_set():
+                break
+            if simulations is not None and done >= simulations:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            batch = self.batch_size if simulations is None else min(self.batch_size, simulations - done)
+            played = self._simulate_batch(batch)
+            if played == 0:
+                break  # Out of node capacity
+            done += played
+
+        elapsed = time.perf_counter() - start
+        move, value = self.best_move()
+        return SearchResult(move, int(round(1000 * value)), self._depth(), done, elapsed,
+                            done / elapsed if elapsed > 0 else 0.0)
+
+    def add_root_noise(self):
+        """Mix fresh Dirichlet noise into the priors of the root's children.
+
+        A reused root was expanded as an ordinary node, so search() calls this
+        every time rather than only when the root is first expanded. The noise
+        replaces any mixed in by an earlier search of the same root.
+        """
+        first = self.first_child[self.root]
+        count = int(self.n_children[self.root])
+        if self.noise is None or first == UNEXPANDED or count == 0:
+            return
+        block = slice(first, first + count)
+        if self.root_prior is None or self.root_prior[0] != self.root_position:
+            self.root_prior = (self.root_position, self.prior[block].astype(np.float64))
+        alpha, fraction = self.noise
+        noise = self.rng.dirichlet([alpha] * count)
+        self.prior[block] = (1 - fraction) * self.root_prior[1] + fraction * noise
+
+    def stop(self):
+        """Ask a running search to return its best move so far."""
+        self.stop_requested = True
+
+    def choose(self, board, color, moves):
+        """Arena player interface."""
+        return self.search(board, color, self.time_limit).move
+
+    def best_move(self, temperature=0.0):
+        """Return (move, value) for the root, most visited or sampled by visits ** (1 / temperature)."""
+        first = self.first_child[self.root]
+        if first == UNEXPANDED or self.n_children[self.root] == 0:
+            return None, 0.0
+        block = slice(first, first + self.n_children[self.root])
+        visits = self.visits[block].astype(np.float64)
+        if temperature > 0 and visits.sum() > 0:
+            weights = visits ** (1.0 / temperature)
+            child = first + self.rng.choice(len(visits), p=weights / weights.sum())
+        else:
+            child = first + int(np.argmax(visits))
+        value = self.value_sum[child] / self.visits[child] if self.visits[child] > 0 else 0.0
+        return unpack_move(int(self.moves[child])), float(value)
+
+    def policy_target(self):
+        """Root visit distribution over the 32 destination squares, e.g. as a training target."""
+        target = np.zeros(32, dtype=np.float32)
+        first = self.first_child[self.root]
+        if first == UNEXPANDED:
+            return target
+        for child in range(first, first + self.n_children[self.root]):
+            target[unpack_move(int(self.moves[child]))[1]] += self.visits[child]
+        total = target.sum()
+        return target / total if total > 0 else target
+
+    def _depth(self):
+        """Length of the principal variation in the tree."""
+        node, depth = self.root, 0
+        while self.first_child[node] != UNEXPANDED and self.n_children[node] > 0:
+            first = self.first_child[node]
+            node = first + int(np.argmax(self.visits[first:first + self.n_children[node]]))
+            depth += 1
+        return depth
+
+    def _select(self, node):
+        first = self.first_child[node]
+        count = self.n_children[node]
+        visits = self.visits[first:first + count]
+        # Unvisited children count as even, so priors alone decide among them
+        q = self.value_sum[first:first + count] / np.maximum(visits, 1)
+        u = self.c_puct * self.prior[first:first + count] * math.sqrt(self.visits[node] + 1) / (1 + visits)
+        return first + int(np.argmax(q + u))
+
+    def _simulate_batch(self, batch_size):
+        """Collect up to batch_size leaves with virtual loss, evaluate them together and back up."""
+        vl = self.virtual_loss
+        leaves = []
+        pending = set()
+        played = 0
+        for _ in range(batch_size):
+            node = self.root
+            red, black, kings, color = self.root_position
+            path = [node]
+            while self.first_child[node] != UNEXPANDED and self.n_children[node] > 0:
+                node = self._select(node)
+                red, black, kings = apply_move(red, black, kings, color, unpack_move(int(self.moves[node])))
+                color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+                path.append(node)
+
+            if self.first_child[node] != UNEXPANDED:
+                # Terminal: the side to move has no moves and has lost
+                self._backup(path, -1.0, 0.0)
+                played += 1
+                continue
+            if node in pending:
+                # Another simulation in this batch already reached this leaf
+                self.collisions += 1
+                break
+            pending.add(node)
+            path_array = np.array(path)
+            self.visits[path_array] += vl
+            self.value_sum[path_array[1:]] -= vl
+            leaves.append((path, red, black, kings, color, generate_moves(red, black, kings, color)))
+
+        if not leaves:
+            return played
+
+        priors, values = self._evaluate(leaves)
+        for (path, red, black, kings, color, moves), policy, value in zip(leaves, priors, values):
+            leaf = path[-1]
+            if not moves:
+                self.first_child[leaf] = self.size
+                self.n_children[leaf] = 0
+                value = -1.0
+            else:
+                start = self._new_nodes(len(moves), leaf)
+                if start is None:
+                    self._backup(path, 0.0, vl, count=False)
+                    continue
+                self.first_child[leaf] = start
+                self.n_children[leaf] = len(moves)
+                block = slice(start, start + len(moves))
+                self.moves[block] = [pack_move(move) for move in moves]
+                p = policy[[move[1] for move in moves]].astype(np.float64) + 1e-8
+                p /= p.sum()
+                self.prior[block] = p
+            self._backup(path, value, vl)
+            played += 1
+        return played
+
+    def _backup(self, path, value, vl, count=True):
+        """Propagate value (for the side to move at the leaf) up the path, removing virtual loss."""
+        visit = 1.0 if count else 0.0
+        # A node's value_sum is from the view of the player who moved into it
+        sign = -1.0
+        for node in reversed(path):
+            self.visits[node] += visit - vl
+            if node != self.root:
+                self.value_sum[node] += (sign * value) * visit + vl
+            sign = -sign
+
+    def _evaluate(self, leaves):
+        """Priors (N, 32) and values (N,) for the leaves in one forward pass."""
+        n = len(leaves)
+        red = np.array([leaf[1] for leaf in leaves], dtype=np.uint64)
+        black = np.array([leaf[2] for leaf in leaves], dtype=np.uint64)
+        kings = np.array([leaf[3] for leaf in leaves], dtype=np.uint64)
+        colors = np.array([leaf[4] for leaf in leaves])
+        if self.model is None:
+            priors = np.ones((n, 32), dtype=np.float32)
+            outputs = None
+        else:
+            states, _ = encode_bitboards(red, black, kings, colors)
+            outputs = np.asarray(self.model.predict(states, verbose=0))
+            priors = outputs[:, :32]
+        if outputs is not None and outputs.shape[1] > 32:
+            values = np.clip(outputs[:, 32], -1.0, 1.0)
+        else:
+            values = np.array([math.tanh(evaluate(leaf[1], leaf[2], leaf[3], leaf[4]) / VALUE_SCALE)
+                               for leaf in leaves])
+        return priors, values
+
+
+def load_mcts(model_path=None, **kwargs):
+    """Build an MCTS around a saved CheckersAI model, or a model-free one without a path."""
+    model = None
+    if model_path:
+        from src.ai.agent import CheckersAI
+        ai = CheckersAI()
+        ai.load_model(model_path)
+        model = ai.model
+    return MCTS(model, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run MCTS on the starting position and report speed')
+    parser.add_argument('--model', type=str, default=None, help='CheckersAI model (default: uniform priors)')
+    parser.add_argument('--time', type=float, default=5.0, help='Seconds per move')
+    parser.add_argument('--simulations', type=int, default=None, help='Stop after this many simulations')
+    parser.add_argument('--batch-size', type=int, default=32, help='Leaves per forward pass')
+    parser.add_argument('--capacity', type=int, default=1 << 22, help='Maximum tree nodes')
+    parser.add_argument('--moves', type=int, default=4, help='Moves to play, reusing the tree')
+    args = parser.parse_args()
+
+    mcts = load_mcts(args.model, capacity=args.capacity, batch_size=args.batch_size)
+    board = BitBoard()
+    color = RED_PLAYER
+    for _ in range(args.moves):
+        reused = int(mcts.visits[mcts.root]) if mcts.root is not None else 0
+        result = mcts.search(board, color, args.time, args.simulations)
+        if result.move is None:
+            break
+        print(f"{'red' if color == RED_PLAYER else 'black':5s} {result.move}  value {result.score / 1000:+.3f}  "
+              f"sims {result.nodes}  ({result.nps:.0f}/s)  pv depth {result.depth}  "
+              f"nodes {mcts.size}  collisions {mcts.collisions}")
+        board.apply(color, result.move)
+        color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        mcts.advance(result.move)
+        print(f"      kept {int(mcts.visits[mcts.root])} visits of the tree (had {reused} before search)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import numpy as np
+
+
+def _softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+# Keras activation name -> NumPy implementation
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+    'softmax': _softmax,
+}
+
+# Layers that do nothing at inference time on a flat 32-value input
+PASSTHROUGH = ('InputLayer', 'Dropout', 'Flatten')
+
+
+def quantize(kernel):
+    """Symmetric per-output-column int8 quantization. Returns (int8 kernel, float32 scales)."""
+    scale = np.abs(kernel).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0
+    return np.round(kernel / scale).astype(np.int8), scale.astype(np.float32)
+
+
+def export_npz(model, path, int8=False):
+    """Write the Dense layers of a Keras Sequential model to an .npz file.
+
+    Raises ValueError for any layer other than Dense or a passthrough layer.
+    """
+    arrays = {}
+    activations = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in PASSTHROUGH:
+            continue
+        if kind != 'Dense':
+            raise ValueError(f"cannot export {kind} layer {layer.name}: only Dense layers are supported")
+        activation = layer.get_config()['activation']
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"unsupported activation {activation!r} in layer {layer.name}")
+        kernel, bias = (np.asarray(w, dtype=np.float32) for w in layer.get_weights())
+        index = len(activations)
+        if int8:
+            arrays[f'kernel_{index}'], arrays[f'scale_{index}'] = quantize(kernel)
+        else:
+            arrays[f'kernel_{index}'] = kernel
+        arrays[f'bias_{index}'] = bias
+        activations.append(activation)
+    np.savez(path, activations=np.array(activations), **arrays)
+
+
+class NumpyModel:
+    """Forward pass of an exported Dense network in NumPy, with Keras' predict signature.
+
+    Weights are float32, or int8 with a float32 scale per output column when the
+    file was exported with int8=True or quantize is set here. int8 keeps the
+    weights four times smaller; the products are still computed in float32.
+    """
+
+    def __init__(self, path, quantize_weights=False):
+        with np.load(path) as data:
+            self.activations = [str(name) for name in data['activations']]
+            self.layers = []
+            for index, activation in enumerate(self.activations):
+                kernel = data[f'kernel_{index}']
+                scale = data[f'scale_{index}'] if f'scale_{index}' in data else None
+                if quantize_weights and scale is None:
+                    kernel, scale = quantize(kernel)
+                self.layers.append((kernel, scale, data[f'bias_{index}'], ACTIVATIONS[activation]))
+        self.input_size = self.layers[0][0].shape[0]
+
+    def predict(self, states, verbose=0):
+        x = np.asarray(states, dtype=np.float32).reshape(-1, self.input_size)
+        for kernel, scale, bias, activation in self.layers:
+            x = x @ kernel
+            if scale is not None:
+                x *= scale
+            x += bias
+            x = activation(x)
+        return x
+
+    __call__ = predict
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a Keras model to a TensorFlow-free .npz file')
+    parser.add_argument('model', type=str, help='Keras model file to export')
+    parser.add_argument('--output', type=str, required=True, help='.npz file to write')
+    parser.add_argument('--int8', action='store_true', help='Store int8 weights with per-column scales')
+    args = parser.parse_args()
+
+    from src.ai.agent import _tensorflow
+    model = _tensorflow().keras.models.load_model(args.model)
+    export_npz(model, args.output, args.int8)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
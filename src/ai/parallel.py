@@ -0,0 +1,239 @@
+import argparse
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from src.constants import *
+from src.bitboard import BitBoard
+from src.ai.search import AlphaBetaSearch, SearchResult
+
+# Scores are stored with this offset so they pack as unsigned bits
+SCORE_OFFSET = 1 << 20
+NO_MOVE = 0
+HEADER_WORDS = 2  # Table generation, then the id of the last search told to stop
+
+
+def _pack_move(move):
+    if move is None:
+        return NO_MOVE
+    src, dst, captured = move
+    return (captured << 10) | (dst << 5) | src
+
+
+def _unpack_move(packed):
+    if packed == NO_MOVE:
+        return None
+    return packed & 31, (packed >> 5) & 31, packed >> 10
+
+
+class SharedTranspositionTable:
+    """TranspositionTable stored in shared memory so several processes can use it.
+
+    The block starts with two header words, the table generation and the id
+    of the last search that was stopped, then three 64-bit words per slot: key ^ data ^ move, data (depth, flag, score,
+    generation) and the packed move. Entries are written without locks; a
+    reader only trusts a slot whose words XOR back to the key it asked for, so
+    a slot torn by two writers at once reads as a miss.
+    """
+
+    def __init__(self, size=1 << 20, name=None):
+        self.size = 1 << (max(size, 1).bit_length() - 1)
+        self.mask = self.size - 1
+        nbytes = 8 * (HEADER_WORDS + 3 * self.size)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.words = self.shm.buf.cast('Q')
+        if self.owner:
+            self.clear()
+        self.generation = self.words[0]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def next_generation(self):
+        """Start a new search for every process sharing the table."""
+        self.words[0] = (self.words[0] + 1) & 0xFF
+
+    def new_search(self):
+        """Pick up the generation set by next_generation."""
+        self.generation = self.words[0]
+
+    def stop_search(self, search_id):
+        """Tell every process working on search_id to stop; other searches are unaffected."""
+        self.words[1] = search_id
+
+    def stopped(self, search_id):
+        return self.words[1] == search_id
+
+    def probe(self, key):
+        """Return (depth, score, flag, move) for key, or None."""
+        base = HEADER_WORDS + 3 * (key & self.mask)
+        words = self.words
+        check, data, move = words[base], words[base + 1], words[base + 2]
+        # data is never 0 for a stored entry (the score field is offset)
+        if check ^ data ^ move != key or data == 0:
+            return None
+        return (data & 0xFF, ((data >> 10) & 0x1FFFFF) - SCORE_OFFSET, (data >> 8) & 3,
+                _unpack_move(move))
+
+    def store(self, key, depth, score, flag, move):
+        base = HEADER_WORDS + 3 * (key & self.mask)
+        words = self.words
+        old = words[base + 1]
+        if (old != 0 and words[base] ^ old ^ words[base + 2] != key
+                and old >> 31 == self.generation and depth < (old & 0xFF)):
+            return
+        data = (min(depth, 0xFF) | (flag << 8) | ((score + SCORE_OFFSET) << 10)
+                | (self.generation << 31))
+        packed = _pack_move(move)
+        words[base] = key ^ data ^ packed
+        words[base + 1] = data
+        words[base + 2] = packed
+
+    def clear(self):
+        """Empty every slot. Only safe while no search is running."""
+        start = 8 * HEADER_WORDS
+        self.shm.buf[start:] = bytes(len(self.shm.buf) - start)
+
+    def close(self):
+        """Detach from the block, and free it if this process created it."""
+        self.words.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class _SearchStop:
+    """The cancel event of one parallel search: set once the table's stop word
+    holds its search id (or once the caller's own cancel event is set)."""
+
+    def __init__(self, tt, search_id, cancel=None):
+        self.tt = tt
+        self.search_id = search_id
+        self.cancel = cancel
+
+    def is_set(self):
+        return self.tt.stopped(self.search_id) or (self.cancel is not None and self.cancel.is_set())
+
+
+def _helper_main(index, tt_name, tt_size, tablebase_path, jobs, results):
+    """Helper process: run searches sharing the table until a None job arrives."""
+    tablebase = None
+    if tablebase_path:
+        from src.ai.tablebase import Tablebase
+        tablebase = Tablebase(tablebase_path)
+    searcher = AlphaBetaSearch(tt_size=1, tablebase=tablebase)
+    searcher.tt = SharedTranspositionTable(tt_size, tt_name)
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        search_id, red, black, kings, color, time_limit, max_depth, start_depth = job
+        board = BitBoard()
+        board.red, board.black, board.kings = red, black, kings
+        result = searcher.search(board, color, time_limit, max_depth, start_depth=start_depth,
+                                 cancel=_SearchStop(searcher.tt, search_id))
+        results.put((search_id, index, tuple(result)))
+    searcher.tt.close()
+
+
+class ParallelSearch:
+    """Lazy-SMP search: helper processes search the same position at staggered
+    depths, sharing one transposition table in shared memory.
+
+    The main process runs an ordinary AlphaBetaSearch; helpers fill the table
+    with results it then cuts off on. The deepest completed result wins, with
+    ties going to the main search. Has the same search/stop interface as
+    AlphaBetaSearch, so it can drive AsyncAI or the arena.
+    """
+
+    def __init__(self, workers=None, tt_size=1 << 20, max_depth=64, tablebase=None,
+                 tablebase_path=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt = SharedTranspositionTable(tt_size)
+        self.searcher = AlphaBetaSearch(tt_size=1, max_depth=max_depth, tablebase=tablebase)
+        self.searcher.tt = self.tt
+        self.results = multiprocessing.Queue()
+        self.search_id = 0
+        self.helpers = []
+        for index in range(1, self.workers):
+            jobs = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=_helper_main, daemon=True,
+                args=(index, self.tt.name, self.tt.size, tablebase_path, jobs, self.results))
+            process.start()
+            self.helpers.append((process, jobs))
+
+    def search(self, board, color, time_limit=1.0, max_depth=None, info=None, cancel=None):
+        """Search with every process and return a SearchResult with the combined node count."""
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        self.search_id += 1
+        self.tt.next_generation()
+        for index, (_, jobs) in enumerate(self.helpers, 1):
+            # Odd helpers start one ply deeper, so the processes spread over depths
+            jobs.put((self.search_id, board.red, board.black, board.kings, color,
+                      time_limit, max_depth, 1 + index % 2))
+        result = self.searcher.search(board, color, time_limit, max_depth, info,
+                                      cancel=_SearchStop(self.tt, self.search_id, cancel))
+        # Tagged with this search's id, so a helper still finishing it stops but the next search cannot
+        self.tt.stop_search(self.search_id)
+
+        best = result
+        nodes = result.nodes
+        pending = len(self.helpers)
+        while pending:
+            search_id, _, helper_result = self.results.get()
+            if search_id != self.search_id:
+                continue
+            pending -= 1
+            helper_result = SearchResult(*helper_result)
+            nodes += helper_result.nodes
+            if helper_result.depth > best.depth and helper_result.move is not None:
+                best = helper_result
+        elapsed = result.elapsed
+        return best._replace(nodes=nodes, elapsed=elapsed,
+                             nps=nodes / elapsed if elapsed > 0 else 0.0)
+
+    def stop(self):
+        """Ask the current search to return its best move so far."""
+        self.tt.stop_search(self.search_id)
+
+    def close(self):
+        for _, jobs in self.helpers:
+            jobs.put(None)
+        for process, _ in self.helpers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.helpers = []
+        self.searcher.tt = None
+        self.tt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the starting position with several processes')
+    parser.add_argument('--workers', type=int, default=None, help='Processes, including the main one')
+    parser.add_argument('--time', type=float, default=5.0, help='Seconds per move')
+    parser.add_argument('--depth', type=int, default=None, help='Maximum depth')
+    parser.add_argument('--tt-size', type=int, default=1 << 20, help='Transposition table slots')
+    args = parser.parse_args()
+
+    searcher = ParallelSearch(args.workers, args.tt_size)
+    try:
+        def report(result):
+            print(f"depth {result.depth:2d}  score {result.score:6d}  main nodes {result.nodes:9d}  "
+                  f"time {result.elapsed:6.2f}s  move {result.move}")
+
+        result = searcher.search(BitBoard(), RED_PLAYER, args.time, args.depth, info=report)
+        print(f"Best move {result.move} at depth {result.depth}, {result.nps:.0f} nodes/sec "
+              f"over {searcher.workers} processes")
+    finally:
+        searcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,319 @@
+import argparse
+import time
+from collections import namedtuple
+from src.constants import *
+from src.bitboard import BitBoard, generate_moves, apply_move, iter_bits, popcount
+from src.zobrist import Zobrist
+from src.ai.tablebase import Tablebase, WIN, LOSS
+
+# Scores are from the point of view of the side to move
+MAN_VALUE = 100
+KING_VALUE = 160
+MATE = 100000
+MATE_THRESHOLD = MATE - 1000
+INFINITY = MATE + 1
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+SearchResult = namedtuple("SearchResult", ["move", "score", "depth", "nodes", "elapsed", "nps"])
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results.
+
+    Each slot holds one (key, depth, score, flag, move, generation) tuple. A new
+    entry replaces the old one when the slot belongs to an earlier search, or when
+    it was searched at least as deep, so deep results survive within one search.
+    """
+
+    def __init__(self, size=1 << 20):
+        # Round down to a power of two so the index is a mask
+        self.size = 1 << (max(size, 1).bit_length() - 1)
+        self.mask = self.size - 1
+        self.table = [None] * self.size
+        self.generation = 0
+
+    def new_search(self):
+        """Age existing entries so they are replaced first."""
+        self.generation += 1
+
+    def probe(self, key):
+        """Return (depth, score, flag, move) for key, or None."""
+        entry = self.table[key & self.mask]
+        if entry is not None and entry[0] == key:
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        index = key & self.mask
+        entry = self.table[index]
+        if (entry is None or entry[0] == key or entry[5] != self.generation
+                or depth >= entry[1]):
+            self.table[index] = (key, depth, score, flag, move, self.generation)
+
+    def clear(self):
+        self.table = [None] * self.size
+
+
+def evaluate(red, black, kings, color):
+    """Static evaluation: material plus a small bonus for advanced men."""
+    red_men = red & ~kings
+    black_men = black & ~kings
+    score = (MAN_VALUE * (popcount(red_men) - popcount(black_men))
+             + KING_VALUE * (popcount(red & kings) - popcount(black & kings)))
+    # Men gain a little value for each row they advance (red moves down, black up)
+    for sq in iter_bits(red_men):
+        score += sq >> 2
+    for sq in iter_bits(black_men):
+        score -= 7 - (sq >> 2)
+    return score if color == RED_PLAYER else -score
+
+
+class AlphaBetaSearch:
+    """Negamax alpha-beta searcher with iterative deepening.
+
+    Moves are ordered transposition-table move first, then captures (most pieces
+    taken first), then the two killer moves for the ply, then by history score.
+    Forced captures at the horizon are searched out before evaluating. With a
+    tablebase, positions it covers are scored exactly instead of searched.
+    """
+
+    def __init__(self, tt_size=1 << 20, max_depth=64, tablebase=None):
+        self.tt = TranspositionTable(tt_size)
+        self.tablebase = tablebase
+        self.zobrist = Zobrist()
+        self.max_depth = max_depth
+        self.nodes = 0
+        self.deadline = None
+        self.stop_requested = False
+        self.cancel = None  # Event for the running search only, see search()
+        self.killers = []
+        self.history = {}
+        self.path = None  # Keys that score as repetitions, when searching with game_keys
+        self.repetitions = 0  # Repetition draws scored so far; see _negamax
+
+    def search(self, board, color, time_limit=1.0, max_depth=None, info=None, start_depth=1, game_keys=None,
+               cancel=None):
+        """Search board for color and return a SearchResult.
+
+        Stops after time_limit seconds or max_depth plies, whichever comes first.
+        If info is given it is called with a SearchResult after each completed depth.
+        Iterative deepening begins at start_depth (parallel helpers skip ahead).
+        game_keys holds the position keys already played in the game, e.g. a
+        TerminationTracker's counts; lines that return to one score as draws.
+        cancel is an optional threading.Event (anything with is_set()) belonging to
+        this search alone; setting it stops the search like stop(), but can never
+        reach a later search the way a stop() sent too late can.
+        """
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        max_depth = min(max_depth or self.max_depth, self.max_depth)
+        red, black, kings = board.red, board.black, board.kings
+        key = self.zobrist.hash(red, black, kings, color)
+
+        self.nodes = 0
+        self.stop_requested = False
+        self.cancel = cancel
+        self.killers = [[None, None] for _ in range(max_depth + 64)]
+        self.history = {}
+        self.tt.new_search()
+        start = time.perf_counter()
+        self.deadline = start + time_limit if time_limit else None
+
+        moves = generate_moves(red, black, kings, color)
+        result = SearchResult(moves[0] if moves else None, 0, 0, 0, 0.0, 0.0)
+        if len(moves) <= 1:
+            # Nothing to think about
+            return result
+
+        for depth in range(min(start_depth, max_depth), max_depth + 1):
+            # Game positions plus the keys on the current line; an aborted depth leaves extras, so refill
+            self.path = set(game_keys) if game_keys else None
+            try:
+                score, move = self._root(red, black, kings, color, key, depth, moves)
+            except SearchTimeout:
+                break
+            elapsed = time.perf_counter() - start
+            result = SearchResult(move, score, depth, self.nodes, elapsed,
+                                  self.nodes / elapsed if elapsed > 0 else 0.0)
+            if info is not None:
+                info(result)
+            if abs(score) >= MATE_THRESHOLD:
+                break
+
+        elapsed = time.perf_counter() - start
+        return result._replace(nodes=self.nodes, elapsed=elapsed,
+                               nps=self.nodes / elapsed if elapsed > 0 else 0.0)
+
+    def stop(self):
+        """Ask a running search (e.g. on another thread) to return its best move so far."""
+        self.stop_requested = True
+
+    def _root(self, red, black, kings, color, key, depth, moves):
+        opponent = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        alpha = -INFINITY
+        best_move = None
+        if self.path is not None:
+            self.path.add(key)
+        repetitions = self.repetitions
+        for move in self._order(moves, self.tt.probe(key), 0, color):
+            child_key = self.zobrist.update(key, red, black, kings, color, move)
+            score = -self._negamax(*apply_move(red, black, kings, color, move), opponent,
+                                   child_key, depth - 1, -INFINITY, -alpha, 1)
+            if score > alpha:
+                alpha = score
+                best_move = move
+        if self.repetitions == repetitions:
+            self.tt.store(key, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, red, black, kings, color, key, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and (self.stop_requested or (
+                self.cancel is not None and self.cancel.is_set()) or (
+                self.deadline is not None and time.perf_counter() > self.deadline)):
+            raise SearchTimeout()
+
+        path = self.path
+        if path is not None and key in path:
+            self.repetitions += 1
+            return 0  # A repeated position is a draw
+
+        alpha_orig = alpha
+        entry = self.tt.probe(key)
+        if entry is not None and entry[0] >= depth:
+            tt_depth, tt_score, flag, _ = entry
+            tt_score = _score_from_tt(tt_score, ply)
+            if flag == EXACT:
+                return tt_score
+            if flag == LOWER and tt_score > alpha:
+                alpha = tt_score
+            elif flag == UPPER and tt_score < beta:
+                beta = tt_score
+            if alpha >= beta:
+                return tt_score
+
+        if self.tablebase is not None and self.tablebase.covers(red, black):
+            result, distance = self.tablebase.probe(red, black, kings, color)
+            if result == WIN:
+                return MATE - ply - distance
+            if result == LOSS:
+                return -MATE + ply + distance
+            return 0
+
+        moves = generate_moves(red, black, kings, color)
+        if not moves:
+            # No legal moves loses; prefer the quickest win
+            return -MATE + ply
+        if depth <= 0 and not moves[0][2]:
+            return evaluate(red, black, kings, color)
+        if ply >= len(self.killers):
+            return evaluate(red, black, kings, color)
+
+        opponent = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        best_score = -INFINITY
+        best_move = None
+        if path is not None:
+            path.add(key)
+        repetitions = self.repetitions
+        for move in self._order(moves, entry, ply, color):
+            child_key = self.zobrist.update(key, red, black, kings, color, move)
+            score = -self._negamax(*apply_move(red, black, kings, color, move), opponent,
+                                   child_key, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not move[2]:
+                            self._record_cutoff(move, ply, color, depth)
+                        break
+        if path is not None:
+            path.discard(key)
+        if self.repetitions != repetitions:
+            # The score depends on the line that led here, so it would be wrong for the
+            # same position reached another way
+            return best_score
+
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.tt.store(key, max(depth, 0), _score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _order(self, moves, entry, ply, color):
+        if len(moves) == 1:
+            return moves
+        tt_move = entry[3] if entry is not None else None
+        killers = self.killers[ply]
+        history = self.history
+
+        def priority(move):
+            if move == tt_move:
+                return 1 << 40
+            if move[2]:
+                return (1 << 30) + popcount(move[2])
+            if move == killers[0]:
+                return 1 << 29
+            if move == killers[1]:
+                return (1 << 29) - 1
+            return history.get((color, move[0], move[1]), 0)
+
+        return sorted(moves, key=priority, reverse=True)
+
+    def _record_cutoff(self, move, ply, color, depth):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        key = (color, move[0], move[1])
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+
+def _score_to_tt(score, ply):
+    """Store mate scores relative to the node rather than the root."""
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the starting position and report speed')
+    parser.add_argument('--time', type=float, default=5.0, help='Seconds per move')
+    parser.add_argument('--depth', type=int, default=None, help='Maximum depth')
+    parser.add_argument('--tt-size', type=int, default=1 << 20, help='Transposition table slots')
+    parser.add_argument('--tablebase', type=str, default=None, help='Endgame tablebase file')
+    args = parser.parse_args()
+
+    tablebase = Tablebase(args.tablebase) if args.tablebase else None
+    searcher = AlphaBetaSearch(tt_size=args.tt_size, tablebase=tablebase)
+
+    def report(result):
+        print(f"depth {result.depth:2d}  score {result.score:6d}  nodes {result.nodes:9d}  "
+              f"time {result.elapsed:6.2f}s  nps {result.nps:9.0f}  move {result.move}")
+
+    result = searcher.search(BitBoard(), RED_PLAYER, args.time, args.depth, info=report)
+    print(f"Best move {result.move} at depth {result.depth}, {result.nps:.0f} nodes/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import argparse
+import itertools
+import mmap
+import struct
+import time
+import numpy as np
+from src.constants import *
+from src.bitboard import (BitBoard, generate_moves, apply_move, iter_bits, popcount,
+                          RED_KING_ROW, BLACK_KING_ROW)
+
+# Results returned by Tablebase.probe, from the point of view of the side to move
+WIN, DRAW, LOSS = 1, 0, -1
+
+# File layout: header, one uint64 block offset per piece count, then one int16 per position.
+# A stored value of 0 is a draw, +(d + 1) a win and -(d + 1) a loss in d plies.
+MAGIC = b'CKTB'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+
+# COMBINATIONS[n][k] = n choose k, for ranking sets of occupied squares
+COMBINATIONS = [[0] * 33 for _ in range(33)]
+for _n in range(33):
+    COMBINATIONS[_n][0] = 1
+    for _k in range(1, _n + 1):
+        COMBINATIONS[_n][_k] = COMBINATIONS[_n - 1][_k - 1] + COMBINATIONS[_n - 1][_k]
+
+
+def block_offsets(max_pieces):
+    """Start index of each piece-count block; the last entry is the total size."""
+    offsets = [0, 0]
+    for n in range(1, max_pieces + 1):
+        # Occupied squares, colour of each piece, king flag of each piece, side to move
+        offsets.append(offsets[-1] + COMBINATIONS[32][n] * (1 << n) * (1 << n) * 2)
+    return offsets
+
+
+def position_index(red, black, kings, color, offsets):
+    """Index of a position in a table built with the given block offsets."""
+    occupied = red | black
+    rank = colors = king_bits = 0
+    n = 0
+    for sq in iter_bits(occupied):
+        rank += COMBINATIONS[sq][n + 1]
+        if black >> sq & 1:
+            colors |= 1 << n
+        if kings >> sq & 1:
+            king_bits |= 1 << n
+        n += 1
+    return offsets[n] + ((((rank << n) | colors) << n) | king_bits) * 2 + (color == BLACK_PLAYER)
+
+
+def _positions(n):
+    """Yield (red, black, kings, color) for every n-piece position in index order."""
+    # Colexicographic order is the order of the combinatorial rank used by position_index
+    for squares in sorted(itertools.combinations(range(32), n), key=lambda squares: squares[::-1]):
+        bits = [1 << sq for sq in squares]
+        for colors in range(1 << n):
+            black = sum(bit for i, bit in enumerate(bits) if colors >> i & 1)
+            red = sum(bits) - black
+            for king_bits in range(1 << n):
+                kings = sum(bit for i, bit in enumerate(bits) if king_bits >> i & 1)
+                yield red, black, kings, RED_PLAYER
+                yield red, black, kings, BLACK_PLAYER
+
+
+def generate(max_pieces, path, progress=None):
+    """Retrograde-solve every position with up to max_pieces pieces and write the table.
+
+    Successors of every position are collected once into flat NumPy arrays. Then,
+    round by round, positions with a successor lost in d - 1 plies become wins in
+    d, and positions whose successors are all wins, the longest in d - 1, become
+    losses in d. Whatever is still unresolved when a round changes nothing is a draw.
+    """
+    offsets = block_offsets(max_pieces)
+    total = offsets[-1]
+    # Ordering of rank, colours, kings and side in _positions matches position_index
+    starts = np.zeros(total + 1, dtype=np.int64)
+    successors = []
+    valid = np.zeros(total, dtype=bool)
+    index = 0
+    for n in range(1, max_pieces + 1):
+        for red, black, kings, color in _positions(n):
+            # Men on their own crowning row cannot occur
+            if not ((red & ~kings & RED_KING_ROW) or (black & ~kings & BLACK_KING_ROW)):
+                valid[index] = True
+                opponent = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+                for move in generate_moves(red, black, kings, color):
+                    successors.append(position_index(*apply_move(red, black, kings, color, move),
+                                                     opponent, offsets))
+            index += 1
+            starts[index] = len(successors)
+        if progress:
+            progress(f"{n} pieces: {index} positions, {len(successors)} moves")
+    successors = np.array(successors, dtype=np.int64)
+
+    counts = np.diff(starts)
+    has_moves = counts > 0
+    segment_starts = starts[:-1][has_moves]
+    values = np.zeros(total, dtype=np.int32)
+    resolved = ~valid
+    # No legal moves (including having no pieces) is a loss in 0
+    lost_now = valid & ~has_moves
+    values[lost_now] = -1
+    resolved |= lost_now
+
+    distance = 1
+    while True:
+        succ_values = values[successors]
+        # Win in d: some successor is a loss in d - 1
+        wins = np.zeros(total, dtype=bool)
+        wins[has_moves] = np.logical_or.reduceat(succ_values == -distance, segment_starts)
+        # Loss in d: every successor is a win and the slowest is a win in d - 1
+        all_won = np.zeros(total, dtype=bool)
+        all_won[has_moves] = np.logical_and.reduceat(succ_values > 1, segment_starts)
+        slowest = np.zeros(total, dtype=np.int32)
+        slowest[has_moves] = np.maximum.reduceat(succ_values, segment_starts)
+        losses = all_won & (slowest == distance)
+
+        wins &= ~resolved
+        losses &= ~resolved & ~wins
+        if not wins.any() and not losses.any():
+            break
+        values[wins] = distance + 1
+        values[losses] = -(distance + 1)
+        resolved |= wins | losses
+        distance += 1
+    if progress:
+        progress(f"solved to distance {distance - 1}")
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_pieces))
+        f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        f.write(values.astype('<i2').tobytes())
+    return total
+
+
+class Tablebase:
+    """Read-only endgame table accessed through mmap.
+
+    The table stays in the OS page cache, so every process that opens the same
+    file shares one copy. A probe is an index computation and one array read.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} checkers tablebase")
+        count = self.max_pieces + 2
+        self.offsets = list(struct.unpack_from(f'<{count}Q', self._mmap, HEADER.size))
+        self.values = np.frombuffer(self._mmap, dtype='<i2', count=self.offsets[-1],
+                                    offset=HEADER.size + 8 * count)
+
+    def close(self):
+        self.values = None
+        self._mmap.close()
+        self._file.close()
+
+    def covers(self, red, black):
+        """True if the position has few enough pieces to be in the table."""
+        return popcount(red | black) <= self.max_pieces
+
+    def probe(self, red, black, kings, color):
+        """Return (WIN/DRAW/LOSS, plies to the end) for color to move, or None if not covered."""
+        if not self.covers(red, black):
+            return None
+        value = int(self.values[position_index(red, black, kings, color, self.offsets)])
+        if value > 0:
+            return WIN, value - 1
+        if value < 0:
+            return LOSS, -value - 1
+        return DRAW, 0
+
+    def probe_board(self, board, color):
+        """probe() for a Board or BitBoard."""
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        return self.probe(board.red, board.black, board.kings, color)
+
+    def best_move(self, board, color):
+        """Return the (src, dst, captured) move that converts fastest or resists longest."""
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        red, black, kings = board.red, board.black, board.kings
+        if not self.covers(red, black):
+            return None
+        opponent = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        best, best_key = None, None
+        for move in generate_moves(red, black, kings, color):
+            result, distance = self.probe(*apply_move(red, black, kings, color, move), opponent)
+            # Opponent's loss is our win: prefer short wins, then draws, then long losses
+            key = (-result, -distance if result == LOSS else distance)
+            if best_key is None or key > best_key:
+                best, best_key = move, key
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an endgame tablebase')
+    parser.add_argument('--pieces', type=int, default=3, help='Solve all positions with up to this many pieces')
+    parser.add_argument('--output', type=str, required=True, help='Tablebase file to write')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total = generate(args.pieces, args.output, progress=print)
+    print(f"Wrote {total} positions to {args.output} in {time.perf_counter() - start:.1f}s")
+
+    table = Tablebase(args.output)
+    # A red man against a black king
+    red, black, kings = 1 << 0, 1 << 31, 1 << 31
+    probes = 100000
+    start = time.perf_counter()
+    for _ in range(probes):
+        table.probe(red, black, kings, RED_PLAYER)
+    elapsed = time.perf_counter() - start
+    print(f"Probe: {elapsed / probes * 1e6:.2f} us per lookup")
+    table.close()
+
+
+if __name__ == '__main__':
+    main()
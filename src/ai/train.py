@@ -0,0 +1,191 @@
+import argparse
+import time
+import numpy as np
+from src.constants import *
+from src.bitboard import BitBoard
+from src.ai.arena import MAX_PLIES
+from src.ai.mcts import MCTS
+from src.termination import TerminationTracker
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring of training positions in preallocated NumPy arrays.
+
+    Each row holds the 32-value board state, the search policy over the 32
+    destination squares and the game outcome for the side to move (+1 win,
+    0 draw, -1 loss). Once full, new rows overwrite the oldest.
+    """
+
+    def __init__(self, capacity=200000, input_size=32):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, input_size), dtype=np.float32)
+        self.policies = np.zeros((capacity, 32), dtype=np.float32)
+        self.outcomes = np.zeros(capacity, dtype=np.float32)
+        self.next = 0
+        self.count = 0
+        self.added = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, states, policies, outcomes):
+        """Append rows, wrapping around over the oldest data."""
+        states = np.asarray(states, dtype=np.float32)
+        n = len(states)
+        if n > self.capacity:
+            # Only the newest rows would survive anyway
+            states, policies, outcomes = states[-self.capacity:], policies[-self.capacity:], outcomes[-self.capacity:]
+            n = self.capacity
+        index = (self.next + np.arange(n)) % self.capacity
+        self.states[index] = states
+        self.policies[index] = policies
+        self.outcomes[index] = outcomes
+        self.next = (self.next + n) % self.capacity
+        self.count = min(self.count + n, self.capacity)
+        self.added += n
+
+    def sample(self, batch_size, rng=None, augment=True):
+        """Return (states, policies, outcomes) for batch_size random rows.
+
+        With augment, a random half of the rows are replaced by their mirror image.
+        """
+        rng = rng or np.random.default_rng()
+        index = rng.integers(0, self.count, size=batch_size)
+        states, policies, outcomes = self.states[index], self.policies[index], self.outcomes[index]
+        if augment:
+            flip = rng.random(batch_size) < 0.5
+            states[flip], policies[flip] = mirror(states[flip], policies[flip])
+        return states, policies, outcomes
+
+    def batches(self, batch_size=256, with_value=False, augment=True, seed=None):
+        """Endless (inputs, targets) generator for Keras fit.
+
+        Targets are the policies, plus the outcome as a 33rd column with with_value.
+        """
+        rng = np.random.default_rng(seed)
+        while True:
+            states, policies, outcomes = self.sample(batch_size, rng, augment)
+            if with_value:
+                yield states, np.concatenate([policies, outcomes[:, None]], axis=1)
+            else:
+                yield states, policies
+
+
+def mirror(states, policies):
+    """Map positions to their mirror image: the board turned 180 degrees with colours swapped.
+
+    A left-right flip would move pieces onto light squares, so this is the
+    mirror the checkers board actually has. Square s becomes 31 - s and red
+    and black trade places, so the side to move (and the outcome) stay the same.
+    """
+    return -states[:, ::-1], policies[:, ::-1]
+
+
+def play_game(mcts, simulations=200, temperature_plies=10, max_plies=MAX_PLIES):
+    """Play one self-play game. Returns (states, policies, outcomes, winner) arrays."""
+    board = BitBoard()
+    color = RED_PLAYER
+    tracker = TerminationTracker(board.red, board.black, board.kings, color)
+    states, policies, colors = [], [], []
+    winner = None
+    mcts.reset()
+    for ply in range(max_plies):
+        outcome = tracker.outcome()
+        if outcome is not None:
+            winner = outcome.winner
+            break
+        moves = tracker.legal_moves()
+        mcts.search(board, color, None, simulations)
+        if len(moves) > 1:
+            # Forced moves teach nothing about move choice
+            states.append(board.get_state())
+            policies.append(mcts.policy_target())
+            colors.append(color)
+        move, _ = mcts.best_move(1.0 if ply < temperature_plies else 0.0)
+        move = move if move is not None else moves[0]
+        board.apply(color, move)
+        tracker.push(move)
+        color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+
+    colors = np.array(colors)
+    if winner is None:
+        outcomes = np.zeros(len(colors), dtype=np.float32)
+    else:
+        outcomes = np.where(colors == winner, 1.0, -1.0).astype(np.float32)
+    return (np.array(states, dtype=np.float32).reshape(-1, 32),
+            np.array(policies, dtype=np.float32).reshape(-1, 32), outcomes, winner)
+
+
+class SelfPlayTrainer:
+    """Alternates self-play generation into a ReplayBuffer with training from it."""
+
+    def __init__(self, model, buffer, simulations=200, batch_size=256, seed=None):
+        self.model = model
+        self.buffer = buffer
+        self.simulations = simulations
+        self.batch_size = batch_size
+        self.with_value = model is not None and model.output_shape[-1] > 32
+        self.mcts = MCTS(model, capacity=1 << 20, noise=(0.3, 0.25), seed=seed)
+        self.generator = buffer.batches(batch_size, self.with_value, seed=seed)
+        self.stats = {'games': 0, 'positions': 0, 'generate_seconds': 0.0,
+                      'samples_trained': 0, 'train_seconds': 0.0}
+
+    def generate(self, games):
+        start = time.perf_counter()
+        for _ in range(games):
+            states, policies, outcomes, _ = play_game(self.mcts, self.simulations)
+            self.buffer.add(states, policies, outcomes)
+            self.stats['games'] += 1
+            self.stats['positions'] += len(states)
+        self.stats['generate_seconds'] += time.perf_counter() - start
+
+    def train(self, steps):
+        if len(self.buffer) == 0 or steps == 0:
+            return
+        start = time.perf_counter()
+        self.model.fit(self.generator, steps_per_epoch=steps, epochs=1, verbose=0)
+        self.stats['train_seconds'] += time.perf_counter() - start
+        self.stats['samples_trained'] += steps * self.batch_size
+
+    def throughput(self):
+        stats = self.stats
+        return dict(stats,
+                    buffer=len(self.buffer),
+                    positions_per_sec=stats['positions'] / stats['generate_seconds'] if stats['generate_seconds'] else 0.0,
+                    samples_per_sec=stats['samples_trained'] / stats['train_seconds'] if stats['train_seconds'] else 0.0,
+                    replay_ratio=stats['samples_trained'] / stats['positions'] if stats['positions'] else 0.0)
+
+
+def main():
+    from src.ai.agent import CheckersAI
+
+    parser = argparse.ArgumentParser(description='Train a CheckersAI model by self-play')
+    parser.add_argument('--model', type=str, default=None, help='Keras model to continue training (default: a new one)')
+    parser.add_argument('--output', type=str, required=True, help='Where to save the trained model')
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--games', type=int, default=10, help='Self-play games per iteration')
+    parser.add_argument('--steps', type=int, default=50, help='Training batches per iteration')
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--simulations', type=int, default=200, help='MCTS simulations per move')
+    parser.add_argument('--buffer', type=int, default=200000, help='Replay buffer capacity (positions)')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    ai = CheckersAI()
+    if args.model:
+        ai.load_model(args.model)
+    else:
+        ai.model = ai._create_fallback_model()
+    trainer = SelfPlayTrainer(ai.model, ReplayBuffer(args.buffer), args.simulations, args.batch_size, args.seed)
+    for iteration in range(1, args.iterations + 1):
+        trainer.generate(args.games)
+        trainer.train(args.steps)
+        stats = trainer.throughput()
+        print(f"iter {iteration:4d}  games {stats['games']:6d}  buffer {stats['buffer']:7d}  "
+              f"generate {stats['positions_per_sec']:7.1f} pos/s  train {stats['samples_per_sec']:8.0f} samples/s  "
+              f"replay ratio {stats['replay_ratio']:5.2f}")
+        ai.model.save(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import numpy as np
+from src.constants import *
+from src.bitboard import (RED_START, BLACK_START, RED_KING_ROW, BLACK_KING_ROW, FULL,
+                          DOWN_DIRECTIONS, UP_DIRECTIONS)
+from src.encoding import encode_bitboards, unpack_bits
+from src.termination import REPETITIONS, NO_CAPTURE_PLIES
+from src.ai.arena import MAX_PLIES
+from src.zobrist import Zobrist
+
+_ONE = np.uint64(1)
+_ZERO = np.uint64(0)
+
+
+class VectorEnv:
+    """N checkers games stepped together with NumPy array operations.
+
+    Each game is three uint64 bitboards plus the side to move, held in (N,)
+    arrays, so legal-action masks and moves for every game are a handful of
+    vectorised bit operations rather than a Python loop over boards.
+
+    Actions are the 32 destination squares of CheckersAI._move_to_action, one
+    hop at a time like Game.make_move_from_action: after a capture the same
+    side acts again while its piece can keep jumping. If two pieces can reach
+    the chosen square, the first one found is moved. Finished games are reset
+    to the start position in the same step.
+
+    Observations are one contiguous (N, 32) float32 array in the
+    Board.get_state encoding, with matching (N, 32) action masks. Both are
+    reused between steps, so copy them to keep them.
+    """
+
+    def __init__(self, num_envs, max_plies=MAX_PLIES, no_capture_plies=NO_CAPTURE_PLIES,
+                 repetitions=REPETITIONS):
+        self.num_envs = num_envs
+        self.max_plies = max_plies
+        self.no_capture_plies = no_capture_plies
+        self.repetitions = repetitions
+        zobrist = Zobrist()
+        self.piece_keys = np.array(zobrist.pieces, dtype=np.uint64)  # [RED_MAN, RED_KING, BLACK_MAN, BLACK_KING][square]
+        self.side_key = np.uint64(zobrist.side)
+        self.start_key = np.uint64(zobrist.hash(RED_START, BLACK_START, 0, RED_PLAYER))
+        self.keys = np.zeros(num_envs, dtype=np.uint64)
+        # Keys of the positions since each game's last capture or man move, the only ones that can
+        # repeat. The move limit ends a game before more than no_capture_plies + 1 of them pile up.
+        self.history = np.zeros((num_envs, no_capture_plies + 1), dtype=np.uint64)
+        self.history_len = np.zeros(num_envs, dtype=np.int32)
+        self.reversible = np.ones(num_envs, dtype=bool)  # No capture or man move yet this turn
+        self.red = np.zeros(num_envs, dtype=np.uint64)
+        self.black = np.zeros(num_envs, dtype=np.uint64)
+        self.kings = np.zeros(num_envs, dtype=np.uint64)
+        self.turn = np.zeros(num_envs, dtype=np.int8)
+        self.jumping = np.full(num_envs, -1, dtype=np.int8)  # Square of a piece mid multi-jump
+        self.plies = np.zeros(num_envs, dtype=np.int32)
+        self.quiet_plies = np.zeros(num_envs, dtype=np.int32)
+        self.sources = np.full(num_envs, -1, dtype=np.int8)  # Source square of each game's last hop
+        self.winners = np.zeros(num_envs, dtype=np.int8)  # Winner of games that ended last step, 0 for a draw
+        self.states = np.empty((num_envs, 32), dtype=np.float32)
+        self.masks = np.empty((num_envs, 32), dtype=np.float32)
+        self.games_finished = 0
+        self.reset()
+
+    def reset(self, which=None):
+        """Put every game (or those selected by the boolean array which) at the start. Returns the states."""
+        which = slice(None) if which is None else which
+        self.red[which] = RED_START
+        self.black[which] = BLACK_START
+        self.kings[which] = 0
+        self.turn[which] = RED_PLAYER
+        self.jumping[which] = -1
+        self.plies[which] = 0
+        self.quiet_plies[which] = 0
+        self.keys[which] = self.start_key
+        self.history[which, 0] = self.start_key
+        self.history_len[which] = 1
+        self.reversible[which] = True
+        self._observe()
+        return self.states
+
+    def _sides(self):
+        """(side to move is red, own, opponent, own pieces allowed down, own pieces allowed up)."""
+        red_turn = self.turn == RED_PLAYER
+        own = np.where(red_turn, self.red, self.black)
+        opp = np.where(red_turn, self.black, self.red)
+        own_kings = own & self.kings
+        # Red men move down the board, black men up; kings go both ways
+        return red_turn, own, opp, np.where(red_turn, own, own_kings), np.where(red_turn, own_kings, own)
+
+    def _observe(self):
+        encode_bitboards(self.red, self.black, self.kings, self.turn, self.states, self.masks)
+        jumping = self.jumping >= 0
+        if jumping.any():
+            # Mid multi-jump only the jumping piece's captures are legal
+            _, own, opp, down, up = self._sides()
+            piece = _ONE << np.where(jumping, self.jumping, 0).astype(np.uint64)
+            empty = ~(self.red | self.black) & FULL
+            lands = _ZERO
+            for directions, allowed in ((DOWN_DIRECTIONS, down), (UP_DIRECTIONS, up)):
+                for shift, _ in directions:
+                    lands = lands | shift(shift(piece & allowed) & opp) & empty
+            self.masks[jumping] = unpack_bits(lands[jumping])
+
+    def step(self, actions):
+        """Play one hop in every game.
+
+        Returns (states, rewards, dones). rewards is +1 where the side that just
+        acted won, else 0. Games that ended are reset, so their states are
+        already the next game's; winners holds who won them.
+        Raises ValueError if any action is not legal.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rows = np.arange(self.num_envs)
+        if not self.masks[rows, actions].all():
+            raise ValueError(f"illegal action in games {np.flatnonzero(self.masks[rows, actions] == 0).tolist()}")
+
+        red_turn, own, opp, down, up = self._sides()
+        empty = ~(self.red | self.black) & FULL
+        dst = _ONE << actions.astype(np.uint64)
+        capturing = self.jumping >= 0
+        if not capturing.all():
+            # Captures are mandatory, so a legal destination that can be captured onto is a capture
+            for directions, allowed in ((DOWN_DIRECTIONS, down), (UP_DIRECTIONS, up)):
+                for shift, _ in directions:
+                    capturing |= (shift(shift(own & allowed) & opp) & empty) != 0
+        only = np.where(self.jumping >= 0, _ONE << np.maximum(self.jumping, 0).astype(np.uint64), np.uint64(FULL))
+
+        src = np.zeros(self.num_envs, dtype=np.uint64)
+        captured = np.zeros(self.num_envs, dtype=np.uint64)
+        for directions, allowed in ((DOWN_DIRECTIONS, down), (UP_DIRECTIONS, up)):
+            allowed = allowed & only
+            for _, back in directions:
+                over = back(dst)
+                jumped = over & opp
+                found = np.where(capturing, back(jumped) & allowed, over & allowed)
+                take = (src == 0) & (found != 0)
+                src = np.where(take, found, src)
+                captured = np.where(take & capturing, jumped, captured)
+
+        was_king = (self.kings & src) != 0
+        promoted = ~was_king & ((dst & np.where(red_turn, np.uint64(RED_KING_ROW), np.uint64(BLACK_KING_ROW))) != 0)
+        did_capture = captured != 0
+
+        # Zobrist keys follow the searchers' hashing, one hop at a time
+        src_sq = np.log2(src.astype(np.float64)).astype(np.int64)
+        own_base = np.where(red_turn, 0, 2)
+        keys = self.keys ^ self.piece_keys[own_base + was_king, src_sq] ^ \
+            self.piece_keys[own_base + (was_king | promoted), actions]
+        captured_sq = np.log2(np.maximum(captured, _ONE).astype(np.float64)).astype(np.int64)
+        captured_key = self.piece_keys[2 - own_base + ((self.kings & captured) != 0), captured_sq]
+        keys ^= np.where(did_capture, captured_key, _ZERO)
+        self.sources = src_sq.astype(np.int8)
+        self.reversible &= was_king & ~did_capture
+
+        own = (own & ~src) | dst
+        opp = opp & ~captured
+        kings = self.kings & ~(src | captured)
+        self.kings = kings | np.where(was_king | promoted, dst, _ZERO)
+        self.red = np.where(red_turn, own, opp)
+        self.black = np.where(red_turn, opp, own)
+
+        # After a capture the piece keeps jumping unless it was just crowned
+        empty = ~(self.red | self.black) & FULL
+        own_kings = own & self.kings
+        lands = _ZERO
+        for directions, allowed in ((DOWN_DIRECTIONS, np.where(red_turn, own, own_kings)),
+                                    (UP_DIRECTIONS, np.where(red_turn, own_kings, own))):
+            for shift, _ in directions:
+                lands = lands | shift(shift(dst & allowed) & opp) & empty
+        more = did_capture & ~promoted & (lands != 0)
+        switched = ~more
+        self.jumping = np.where(more, actions, -1).astype(np.int8)
+        actor = self.turn.copy()
+        self.turn = np.where(switched, np.where(red_turn, BLACK_PLAYER, RED_PLAYER), self.turn).astype(np.int8)
+        self.plies += switched
+        self.quiet_plies = np.where(did_capture, 0, self.quiet_plies + switched)
+        self.keys = np.where(switched, keys ^ self.side_key, keys)
+
+        # Record the position each completed turn reaches; an irreversible turn starts the history over
+        self.history_len[switched & ~self.reversible] = 0
+        length = np.minimum(self.history_len, self.history.shape[1] - 1)
+        self.history[rows, length] = np.where(switched, self.keys, self.history[rows, length])
+        self.history_len = np.where(switched, length + 1, self.history_len)
+        self.reversible |= switched
+        seen = (self.history == self.keys[:, None]) & (np.arange(self.history.shape[1]) < self.history_len[:, None])
+        repeated = switched & (seen.sum(axis=1) >= self.repetitions)
+        self._observe()
+
+        # A side that cannot move loses; repetition, long games and 40 moves without a capture are draws
+        lost = switched & (self.masks.max(axis=1) == 0)
+        drawn = ~lost & (repeated | (self.plies >= self.max_plies) | (self.quiet_plies >= self.no_capture_plies))
+        dones = lost | drawn
+        rewards = lost.astype(np.float32)
+        self.winners = np.where(lost, actor, 0).astype(np.int8)
+        if dones.any():
+            self.games_finished += int(dones.sum())
+            self.reset(dones)
+        return self.states, rewards, dones
+
+    def random_actions(self, rng):
+        """One uniformly random legal action per game."""
+        return np.argmax(rng.random((self.num_envs, 32)) * self.masks, axis=1)
@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from src.constants import *
+from src.bitboard import BitBoard, move_path, square_to_rc
+from src import trace
+
+PONDER_LIMIT = 30.0  # Seconds a ponder search may run before it gives up
+
+# A unit of background work: think is a real decision, ponder only warms the engine.
+# cancelled is this job's own stop signal, handed to engine.search.
+_Job = namedtuple("_Job", ["position", "board", "color", "kind", "time_limit", "cancelled"])
+_Result = namedtuple("_Result", ["move"])
+
+
+class PlayerEngine:
+    """Adapts an arena-style player (choose(board, color, moves)) to the engine interface."""
+
+    def __init__(self, player):
+        self.player = player
+
+    def search(self, board, color, time_limit=None, cancel=None):
+        # A single choose() call cannot be interrupted, so cancel is not checked
+        moves = board.get_legal_moves(color)
+        return _Result(self.player.choose(board, color, moves) if moves else None)
+
+
+class AsyncAI:
+    """Runs AI decisions on a background thread so the pygame loop keeps drawing.
+
+    Call update(game) once per frame. When it is the AI's turn a search is started
+    on a snapshot of the board; once it finishes, the move is played through
+    Game.make_move_from_action. During the opponent's turn the engine ponders the
+    same position for up to PONDER_LIMIT seconds, which fills its transposition table for the
+    replies it will need. Whenever the position changes, running work is stopped
+    and its result discarded.
+
+    engine needs search(board, color, time_limit, cancel=event) returning an
+    object with .move. Each job gets its own threading.Event, set when the job is
+    cancelled, which the engine should check while it searches (AlphaBetaSearch
+    and MCTS do); an event can only ever stop the job it belongs to.
+    """
+
+    def __init__(self, engine, color, time_limit=1.0, ponder=True):
+        self.engine = engine
+        self.color = color
+        self.time_limit = time_limit
+        self.ponder = ponder
+        self.thinking = False
+        self._job = None
+        self._result = None
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='async-ai', daemon=True)
+        self._thread.start()
+
+    def update(self, game):
+        """Start, cancel or apply background work for the current position.
+
+        Returns True if an AI move was played this call.
+        """
+        board = game.board if isinstance(game.board, BitBoard) else BitBoard.from_board(game.board)
+        position = (board.red, board.black, board.kings, game.turn)
+
+        with self._lock:
+            job, result = self._job, self._result
+        if job is not None and job.position == position:
+            if result is None or job.kind != 'think':
+                return False
+            with self._lock:
+                self._job = self._result = None
+            self.thinking = False
+            return self._play(game, board, result.move)
+
+        # The position changed (or nothing is running yet): replace the work
+        self.cancel()
+        if game.outcome() is not None:
+            return False
+        if game.turn == self.color:
+            kind, time_limit = 'think', self.time_limit
+        elif self.ponder:
+            kind, time_limit = 'ponder', PONDER_LIMIT
+        else:
+            return False
+        snapshot = BitBoard()
+        snapshot.red, snapshot.black, snapshot.kings = board.red, board.black, board.kings
+        job = _Job(position, snapshot, game.turn, kind, time_limit, threading.Event())
+        with self._lock:
+            self._job = job
+            self._result = None
+        self.thinking = kind == 'think'
+        self._jobs.put(job)
+        return False
+
+    def cancel(self):
+        """Stop any running work and forget its result."""
+        with self._lock:
+            job = self._job
+            self._job = self._result = None
+        self.thinking = False
+        if job is not None:
+            job.cancelled.set()
+
+    def close(self):
+        self.cancel()
+        self._jobs.put(None)
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled.is_set():
+                # Superseded before it started
+                continue
+            start = time.perf_counter()
+            result = self.engine.search(job.board, job.color, job.time_limit, cancel=job.cancelled)
+            if job.kind == 'think':
+                elapsed_ms = 1000 * (time.perf_counter() - start)
+                if trace.metrics:
+                    trace.observe('ai_decision_ms', elapsed_ms)
+                    # The searchers generate moves internally; their node counts stand in for calls
+                    trace.count('ai_nodes', getattr(result, 'nodes', 0) or 0)
+                if trace.level >= trace.INFO:
+                    trace.event(trace.INFO, 'ai_decision', ms=round(elapsed_ms, 3), move=result.move,
+                                depth=getattr(result, 'depth', None), nodes=getattr(result, 'nodes', None))
+            with self._lock:
+                if job is self._job:
+                    self._result = result
+
+    def _play(self, game, board, move):
+        """Play a complete engine move one hop at a time through the Game."""
+        if move is None:
+            return False
+        path = move_path(board.red, board.black, board.kings, self.color, move)
+        played = False
+        for start, end in zip(path, path[1:]):
+            # Game ends the turn after each hop, so stop once it is no longer our move
+            if game.turn != self.color:
+                break
+            played = game.make_move_from_action((square_to_rc(start), square_to_rc(end))) or played
+        return played
@@ -0,0 +1,483 @@
+from collections import namedtuple
+from src.constants import *
+
+# Square numbering: the 32 dark squares in row-major order, square = row * 4 + col // 2.
+# This is the same layout CheckersAI._move_to_action uses for its 32 actions.
+NUM_SQUARES = 32
+FULL = 0xFFFFFFFF
+EVEN_ROWS = 0x0F0F0F0F  # rows 0, 2, 4, 6 (dark squares on odd columns)
+ODD_ROWS = 0xF0F0F0F0   # rows 1, 3, 5, 7 (dark squares on even columns)
+LEFT_EDGE = 0x11111111  # column 0 (only on odd rows)
+RIGHT_EDGE = 0x88888888  # column 7 (only on even rows)
+RED_KING_ROW = 0xF0000000  # row 7
+BLACK_KING_ROW = 0x0000000F  # row 0
+
+RED_START = 0x00000FFF
+BLACK_START = 0xFFF00000
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(bb):
+        return bin(bb).count("1")
+
+
+# Columns a diagonal step can start from without leaving the board sideways
+EVEN_NOT_RIGHT = EVEN_ROWS & ~RIGHT_EDGE
+ODD_NOT_LEFT = ODD_ROWS & ~LEFT_EDGE
+
+
+# One diagonal step for every bit in a bitboard. Bits that would leave the board are dropped.
+# Only positive masks are used so these also work elementwise on NumPy uint64 arrays.
+def down_left(bb):
+    return (((bb & EVEN_ROWS) << 4) | ((bb & ODD_NOT_LEFT) << 3)) & FULL
+
+
+def down_right(bb):
+    return (((bb & EVEN_NOT_RIGHT) << 5) | ((bb & ODD_ROWS) << 4)) & FULL
+
+
+def up_left(bb):
+    return ((bb & EVEN_ROWS) >> 4) | ((bb & ODD_NOT_LEFT) >> 5)
+
+
+def up_right(bb):
+    return ((bb & EVEN_NOT_RIGHT) >> 3) | ((bb & ODD_ROWS) >> 4)
+
+
+# Each direction paired with its inverse, used to walk back from targets to movers
+DOWN_DIRECTIONS = ((down_left, up_right), (down_right, up_left))
+UP_DIRECTIONS = ((up_left, down_right), (up_right, down_left))
+ALL_DIRECTIONS = DOWN_DIRECTIONS + UP_DIRECTIONS
+
+
+def _build_tables():
+    """Precompute per-square step and jump targets from the shift functions."""
+    steps = []
+    jumps = []
+    for shift, _ in ALL_DIRECTIONS:
+        step_table = []
+        jump_table = []
+        for sq in range(NUM_SQUARES):
+            step = shift(1 << sq)
+            land = shift(step)
+            step_table.append(step)
+            jump_table.append((step, land) if land else None)
+        steps.append(step_table)
+        jumps.append(jump_table)
+    return steps, jumps
+
+
+STEP_TABLE, JUMP_TABLE = _build_tables()
+# Indices into STEP_TABLE / JUMP_TABLE for each kind of piece
+RED_MAN_DIRS = (0, 1)
+BLACK_MAN_DIRS = (2, 3)
+KING_DIRS = (0, 1, 2, 3)
+
+
+def square_to_rc(sq):
+    """Convert a square index to (row, col)."""
+    row = sq >> 2
+    return row, (sq & 3) * 2 + (1 - (row & 1))
+
+
+def rc_to_square(row, col):
+    """Convert (row, col) to a square index, or -1 for light squares and off-board."""
+    if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE and (row + col) % 2 == 1:
+        return row * 4 + col // 2
+    return -1
+
+
+def iter_bits(bb):
+    """Yield the square index of every set bit."""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def movers(red, black, kings, color):
+    """Return bitboards (own, opponent, empty, own men, own kings) for the side to move."""
+    if color == RED_PLAYER:
+        own, opp = red, black
+    else:
+        own, opp = black, red
+    empty = ~(red | black) & FULL
+    return own, opp, empty, own & ~kings, own & kings
+
+
+def jumpers(red, black, kings, color):
+    """Bitboard of pieces of color that have at least one capture."""
+    own, opp, empty, men, own_kings = movers(red, black, kings, color)
+    forward = DOWN_DIRECTIONS if color == RED_PLAYER else UP_DIRECTIONS
+    backward = UP_DIRECTIONS if color == RED_PLAYER else DOWN_DIRECTIONS
+    result = 0
+    for shift, back in forward:
+        land = shift(shift(own) & opp) & empty
+        result |= back(back(land))
+    if own_kings:
+        for shift, back in backward:
+            land = shift(shift(own_kings) & opp) & empty
+            result |= back(back(land))
+    return result & own
+
+
+def step_movers(red, black, kings, color):
+    """Bitboard of pieces of color that have at least one non-capturing move."""
+    own, opp, empty, men, own_kings = movers(red, black, kings, color)
+    forward = DOWN_DIRECTIONS if color == RED_PLAYER else UP_DIRECTIONS
+    backward = UP_DIRECTIONS if color == RED_PLAYER else DOWN_DIRECTIONS
+    result = 0
+    for shift, back in forward:
+        result |= back(shift(own) & empty)
+    if own_kings:
+        for shift, back in backward:
+            result |= back(shift(own_kings) & empty)
+    return result & own
+
+
+def destinations(red, black, kings, color):
+    """Bitboard of squares color can reach with its first hop this turn.
+
+    Captures are mandatory, so this is the capture landing squares when any exist
+    and the plain step targets otherwise. Works on ints or NumPy uint64 arrays.
+    """
+    own, opp, empty, men, own_kings = movers(red, black, kings, color)
+    forward = DOWN_DIRECTIONS if color == RED_PLAYER else UP_DIRECTIONS
+    backward = UP_DIRECTIONS if color == RED_PLAYER else DOWN_DIRECTIONS
+    lands = 0
+    steps = 0
+    for shift, _ in forward:
+        step = shift(own)
+        lands |= shift(step & opp) & empty
+        steps |= step & empty
+    for shift, _ in backward:
+        step = shift(own_kings)
+        lands |= shift(step & opp) & empty
+        steps |= step & empty
+    # Multiplying by the comparison keeps this branch-free for arrays
+    return lands | steps * (lands == 0)
+
+
+def _piece_dirs(color, is_king):
+    if is_king:
+        return KING_DIRS
+    return RED_MAN_DIRS if color == RED_PLAYER else BLACK_MAN_DIRS
+
+
+def _jump_sequences(sq, color, is_king, opp, empty, captured, moves, origin):
+    """Extend a jump sequence from sq, appending complete (src, dst, captured) moves."""
+    extended = False
+    for d in _piece_dirs(color, is_king):
+        jump = JUMP_TABLE[d][sq]
+        if jump is None:
+            continue
+        mid, land = jump
+        if mid & opp and land & empty:
+            extended = True
+            land_sq = land.bit_length() - 1
+            crowned = not is_king and land & (RED_KING_ROW if color == RED_PLAYER else BLACK_KING_ROW)
+            if crowned:
+                # Reaching the king row ends the move
+                moves.append((origin, land_sq, captured | mid))
+            else:
+                _jump_sequences(land_sq, color, is_king, opp & ~mid, empty | mid,
+                                captured | mid, moves, origin)
+    if not extended and captured:
+        moves.append((origin, sq, captured))
+
+
+def generate_moves(red, black, kings, color):
+    """Return every legal move for color as (src, dst, captured) tuples.
+
+    Captures are mandatory and multi-jumps are returned as a single move covering
+    the whole sequence, with captured holding a bitboard of the jumped pieces.
+    """
+    own, opp, empty, men, own_kings = movers(red, black, kings, color)
+    can_jump = jumpers(red, black, kings, color)
+    moves = []
+    if can_jump:
+        for sq in iter_bits(can_jump):
+            is_king = bool(own_kings >> sq & 1)
+            # The moving piece no longer blocks its own start square
+            _jump_sequences(sq, color, is_king, opp, empty | (1 << sq), 0, moves, sq)
+        # Distinct king paths can capture the same set of pieces
+        return list(dict.fromkeys(moves))
+    for sq in iter_bits(step_movers(red, black, kings, color)):
+        for d in _piece_dirs(color, own_kings >> sq & 1):
+            target = STEP_TABLE[d][sq]
+            if target & empty:
+                moves.append((sq, target.bit_length() - 1, 0))
+    return moves
+
+
+def move_path(red, black, kings, color, move):
+    """Return the squares visited by move, from its start to its final landing square."""
+    src, dst, captured = move
+    if not captured:
+        return [src, dst]
+    own, opp, empty, men, own_kings = movers(red, black, kings, color)
+    is_king = bool(own_kings >> src & 1)
+    # Walk the jumps that stay inside the captured set until one reaches dst with all taken
+    stack = [(src, captured, [src])]
+    while stack:
+        sq, remaining, path = stack.pop()
+        if not remaining:
+            if sq == dst:
+                return path
+            continue
+        for d in _piece_dirs(color, is_king):
+            jump = JUMP_TABLE[d][sq]
+            if jump is None:
+                continue
+            mid, land = jump
+            land_sq = land.bit_length() - 1
+            if mid & remaining and (land & empty or land_sq == src):
+                stack.append((land_sq, remaining & ~mid, path + [land_sq]))
+    raise ValueError(f"{move} is not a legal move")
+
+
+def apply_move(red, black, kings, color, move):
+    """Return the (red, black, kings) bitboards after color plays move."""
+    src, dst, captured = move
+    src_bit = 1 << src
+    dst_bit = 1 << dst
+    if color == RED_PLAYER:
+        red = (red & ~src_bit) | dst_bit
+        black &= ~captured
+        promote = dst_bit & RED_KING_ROW
+    else:
+        black = (black & ~src_bit) | dst_bit
+        red &= ~captured
+        promote = dst_bit & BLACK_KING_ROW
+    if kings & src_bit:
+        kings = (kings & ~src_bit) | dst_bit
+    elif promote:
+        kings |= dst_bit
+    kings &= ~captured
+    return red, black, kings
+
+
+def pack_move(move):
+    """Pack a (src, dst, captured) move into one integer."""
+    src, dst, captured = move
+    return (captured << 10) | (dst << 5) | src
+
+
+def unpack_move(packed):
+    return packed & 31, (packed >> 5) & 31, packed >> 10
+
+
+BitPiece = namedtuple("BitPiece", ["row", "col", "color", "king"])
+
+
+class BitBoard:
+    """Board with the same interface as Board, stored as three 32-bit masks.
+
+    Pieces are returned as lightweight BitPiece tuples built on demand, so they
+    are snapshots: look a piece up again after the board changes.
+    """
+
+    def __init__(self):
+        self.red = RED_START
+        self.black = BLACK_START
+        self.kings = 0
+        self.undo_stack = []
+
+    @classmethod
+    def from_board(cls, board):
+        """Build a BitBoard from a list-based Board, e.g. to cross-check the two."""
+        bitboard = cls()
+        bitboard.red = bitboard.black = bitboard.kings = 0
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = board.get_piece(row, col)
+                if piece != 0:
+                    bit = 1 << rc_to_square(row, col)
+                    if piece.color == RED_PLAYER:
+                        bitboard.red |= bit
+                    else:
+                        bitboard.black |= bit
+                    if piece.king:
+                        bitboard.kings |= bit
+        return bitboard
+
+    def to_board(self):
+        """Build the equivalent list-based Board."""
+        from src.board import Board
+        from src.piece import Piece
+        board = Board()
+        board.board = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for color, own in ((RED_PLAYER, self.red), (BLACK_PLAYER, self.black)):
+            for sq in iter_bits(own):
+                row, col = square_to_rc(sq)
+                piece = Piece(row, col, color)
+                piece.king = bool(self.kings >> sq & 1)
+                board.board[row][col] = piece
+        board.red_left, board.black_left = self.red_left, self.black_left
+        board.red_kings, board.black_kings = self.red_kings, self.black_kings
+        board._track_all()
+        return board
+
+    @property
+    def red_left(self):
+        return popcount(self.red)
+
+    @property
+    def black_left(self):
+        return popcount(self.black)
+
+    @property
+    def red_kings(self):
+        return popcount(self.red & self.kings)
+
+    @property
+    def black_kings(self):
+        return popcount(self.black & self.kings)
+
+    def create_board(self):
+        """Reset to the starting position."""
+        self.red = RED_START
+        self.black = BLACK_START
+        self.kings = 0
+
+    def draw(self, window):
+        """Draw the complete board with squares and pieces."""
+        from src import render
+        render.draw_board(window, self)
+
+    def _piece_at(self, sq):
+        bit = 1 << sq
+        if self.red & bit:
+            color = RED_PLAYER
+        elif self.black & bit:
+            color = BLACK_PLAYER
+        else:
+            return 0
+        row, col = square_to_rc(sq)
+        return BitPiece(row, col, color, bool(self.kings & bit))
+
+    def get_piece(self, row, col):
+        """Return the piece at the given position."""
+        sq = rc_to_square(row, col)
+        if sq < 0:
+            return 0
+        return self._piece_at(sq)
+
+    def remove(self, pieces):
+        """Remove captured pieces from the board."""
+        for piece in pieces:
+            mask = ~(1 << rc_to_square(piece.row, piece.col))
+            self.red &= mask
+            self.black &= mask
+            self.kings &= mask
+
+    def move(self, piece, row, col):
+        """Move a piece to a new position and handle captures."""
+        src = rc_to_square(piece.row, piece.col)
+        captured = 0
+        if abs(row - piece.row) == 2:
+            captured = 1 << rc_to_square((row + piece.row) // 2, (col + piece.col) // 2)
+        self.red, self.black, self.kings = apply_move(
+            self.red, self.black, self.kings, piece.color, (src, rc_to_square(row, col), captured))
+
+    def get_all_pieces(self, color):
+        """Get all pieces of a given color."""
+        own = self.red if color == RED_PLAYER else self.black
+        return [self._piece_at(sq) for sq in iter_bits(own)]
+
+    def get_piece_captures(self, piece):
+        """Get all possible single-hop captures for a piece."""
+        sq = rc_to_square(piece.row, piece.col)
+        opp = self.black if piece.color == RED_PLAYER else self.red
+        empty = ~(self.red | self.black) & FULL
+        jumps = {}
+        for d in _piece_dirs(piece.color, piece.king):
+            jump = JUMP_TABLE[d][sq]
+            if jump is None:
+                continue
+            mid, land = jump
+            if mid & opp and land & empty:
+                captured = self._piece_at(mid.bit_length() - 1)
+                jumps[square_to_rc(land.bit_length() - 1)] = [captured]
+        return jumps
+
+    def has_captures_available(self, color):
+        """Check if any piece of the given color has available captures."""
+        return jumpers(self.red, self.black, self.kings, color) != 0
+
+    def has_additional_captures(self, piece):
+        """Check if a piece has additional captures available after a jump."""
+        return len(self.get_piece_captures(piece)) > 0
+
+    def get_piece_steps(self, piece):
+        """Get all non-capturing moves for a piece."""
+        sq = rc_to_square(piece.row, piece.col)
+        empty = ~(self.red | self.black) & FULL
+        moves = {}
+        for d in _piece_dirs(piece.color, piece.king):
+            target = STEP_TABLE[d][sq]
+            if target & empty:
+                moves[square_to_rc(target.bit_length() - 1)] = []
+        return moves
+
+    def get_valid_moves(self, piece, must_jump=False):
+        """Return all valid single-hop moves for a given piece, like Board.get_valid_moves."""
+        if must_jump or self.has_captures_available(piece.color):
+            return self.get_piece_captures(piece)
+        return self.get_piece_steps(piece)
+
+    def get_all_valid_moves(self, color):
+        """Return {piece: valid single-hop moves} for every piece of color that can move."""
+        # One jumpers() call decides for the whole side, and only pieces that can move are visited
+        capturers = jumpers(self.red, self.black, self.kings, color)
+        if capturers:
+            return {piece: self.get_valid_moves(piece, must_jump=True)
+                    for piece in map(self._piece_at, iter_bits(capturers))}
+        return {piece: self.get_piece_steps(piece)
+                for piece in map(self._piece_at, iter_bits(step_movers(self.red, self.black, self.kings, color)))}
+
+    def get_legal_moves(self, color):
+        """Return every complete legal move for color as (src, dst, captured) tuples."""
+        return generate_moves(self.red, self.black, self.kings, color)
+
+    def apply(self, color, move):
+        """Play a complete move returned by get_legal_moves."""
+        self.red, self.black, self.kings = apply_move(self.red, self.black, self.kings, color, move)
+
+    def get_moves(self, color):
+        """Return every complete legal move for color as Move objects, like Board.get_moves."""
+        from src.move import Move
+        moves = []
+        for move in self.get_legal_moves(color):
+            path = move_path(self.red, self.black, self.kings, color, move)
+            promotes = bool(not self.kings >> move[0] & 1
+                            and (1 << move[1]) & (RED_KING_ROW if color == RED_PLAYER else BLACK_KING_ROW))
+            moves.append(Move([square_to_rc(sq) for sq in path],
+                              [square_to_rc(sq) for sq in iter_bits(move[2])], promotes))
+        return moves
+
+    def make_move(self, move):
+        """Play a complete Move in place. Undo it with unmake_move."""
+        src = rc_to_square(*move.start)
+        color = RED_PLAYER if self.red >> src & 1 else BLACK_PLAYER
+        captured = 0
+        for row, col in move.captured:
+            captured |= 1 << rc_to_square(row, col)
+        self.undo_stack.append((self.red, self.black, self.kings))
+        self.apply(color, (src, rc_to_square(*move.end), captured))
+
+    def unmake_move(self):
+        """Take back the last make_move."""
+        self.red, self.black, self.kings = self.undo_stack.pop()
+
+    def get_state(self, out=None):
+        """Encode the board as 32 floats, one per dark square (see src/encoding.py)."""
+        # Imported here because src.encoding builds on this module
+        from src.encoding import encode_board_state
+        return encode_board_state(self.red, self.black, self.kings, out)
+
+    def get_valid_moves_mask(self, color, out=None):
+        """Return a 32-square mask of the destinations color can move to."""
+        from src.encoding import encode_board_mask
+        return encode_board_mask(self.red, self.black, self.kings, color, out)
@@ -1,24 +1,24 @@
-import pygame
-import numpy as np
-from constants import *
-from piece import Piece
+from src.constants import *
+from src.piece import Piece
+from src.move import Move
+
+# Offsets of every square whose moves can change when a given square changes:
+# the square itself plus one and two steps along each diagonal
+_NEARBY = [(0, 0)] + [(dr * step, dc * step) for dr in (-1, 1) for dc in (-1, 1) for step in (1, 2)]
+
 
 class Board:
     def __init__(self):
         self.board = []
         self.red_left = self.black_left = 12
         self.red_kings = self.black_kings = 0
+        self.undo_stack = []  # One entry per make_move, popped by unmake_move
         self.create_board()
 
     def draw_squares(self, window):
         """Draw the checkerboard pattern."""
-        window.fill(BLACK)
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if (row + col) % 2 == 0:
-                    pygame.draw.rect(window, WHITE,
-                                   (col * SQUARE_SIZE, row * SQUARE_SIZE,
-                                    SQUARE_SIZE, SQUARE_SIZE))
+        from src import render
+        render.draw_squares(window)
 
     def create_board(self):
         """Initialize the game pieces on the board."""
@@ -35,6 +35,46 @@ class Board:
                         self.board[row].append(0)
                 else:
                     self.board[row].append(0)
+        self._track_all()
+
+    def _track_all(self):
+        """Rebuild the per-color piece sets and move caches from the grid."""
+        self.pieces = {RED_PLAYER: set(), BLACK_PLAYER: set()}
+        self._captures = {}
+        self._steps = {}
+        self._capturers = {RED_PLAYER: set(), BLACK_PLAYER: set()}
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.board[row][col]
+                if piece != 0:
+                    self.pieces[piece.color].add(piece)
+                    self._refresh(piece)
+
+    def _refresh(self, piece):
+        """Recompute the cached captures and steps of one piece."""
+        captures = self.get_piece_captures(piece)
+        self._captures[piece] = captures
+        self._steps[piece] = self.get_piece_steps(piece)
+        if captures:
+            self._capturers[piece.color].add(piece)
+        else:
+            self._capturers[piece.color].discard(piece)
+
+    def _refresh_around(self, squares):
+        """Refresh every piece whose moves depend on one of the changed squares."""
+        refreshed = set()
+        for row, col in squares:
+            for dr, dc in _NEARBY:
+                piece = self.get_piece(row + dr, col + dc)
+                if piece != 0 and piece not in refreshed:
+                    refreshed.add(piece)
+                    self._refresh(piece)
+
+    def _untrack(self, piece):
+        self.pieces[piece.color].discard(piece)
+        self._captures.pop(piece, None)
+        self._steps.pop(piece, None)
+        self._capturers[piece.color].discard(piece)
 
     def draw(self, window):
         """Draw the complete board with squares and pieces."""
@@ -48,11 +88,35 @@ class Board:
     def remove(self, pieces):
         """Remove captured pieces from the board."""
         for piece in pieces:
-            self.board[piece.row][piece.col] = 0
-            if piece.color == RED_PLAYER:
-                self.red_left -= 1
-            else:
-                self.black_left -= 1
+            self._capture(piece)
+        self._refresh_around([(piece.row, piece.col) for piece in pieces])
+
+    def _capture(self, piece):
+        """Take a piece off the board and update the piece counts."""
+        self.board[piece.row][piece.col] = 0
+        self._untrack(piece)
+        if piece.color == RED_PLAYER:
+            self.red_left -= 1
+            if piece.king:
+                self.red_kings -= 1
+        else:
+            self.black_left -= 1
+            if piece.king:
+                self.black_kings -= 1
+
+    def _promote(self, piece):
+        """Crown a piece that reached the far row. Returns True if it was crowned."""
+        if piece.king:
+            return False
+        if piece.row == 0 and piece.color == BLACK_PLAYER:
+            piece.make_king()
+            self.black_kings += 1
+            return True
+        if piece.row == BOARD_SIZE - 1 and piece.color == RED_PLAYER:
+            piece.make_king()
+            self.red_kings += 1
+            return True
+        return False
 
     def get_piece(self, row, col):
         """Return the piece at the given position."""
@@ -72,34 +136,123 @@ class Board:
         piece.move(row, col)
 
         # Check if this was a capture move
+        changed = [(original_row, original_col), (row, col)]
         if abs(row - original_row) == 2:
             # Remove the captured piece
             captured_row = (row + original_row) // 2
             captured_col = (col + original_col) // 2
-            self.board[captured_row][captured_col] = 0
-            if self.board[captured_row][captured_col] != 0:
-                if self.board[captured_row][captured_col].color == RED_PLAYER:
-                    self.red_left -= 1
-                else:
-                    self.black_left -= 1
+            changed.append((captured_row, captured_col))
+            # Look the piece up before clearing its square so the counts are updated
+            captured = self.board[captured_row][captured_col]
+            if captured != 0:
+                self._capture(captured)
 
         # Handle king promotion
-        if row == 0 and piece.color == BLACK_PLAYER:
-            piece.make_king()
-            self.black_kings += 1
-        elif row == BOARD_SIZE - 1 and piece.color == RED_PLAYER:
-            piece.make_king()
-            self.red_kings += 1
+        self._promote(piece)
+
+        # Only pieces near the changed squares can have different moves now
+        self._refresh_around(changed)
+
+    def get_moves(self, color):
+        """Return every complete legal move for color as Move objects.
+
+        Captures are mandatory and a multi-jump is a single Move with its whole path.
+        """
+        moves = []
+        if self._capturers[color]:
+            for piece in sorted(self._capturers[color], key=lambda piece: (piece.row, piece.col)):
+                self._jump_moves(piece, piece.row, piece.col, [(piece.row, piece.col)], [], moves)
+            # Different king paths can take the same pieces; keep one of each
+            unique = {}
+            for move in moves:
+                unique.setdefault((move.start, move.end, frozenset(move.captured)), move)
+            return list(unique.values())
+        for piece in self.get_all_pieces(color):
+            for row, col in self._steps[piece]:
+                moves.append(Move([(piece.row, piece.col), (row, col)], (),
+                                  self._reaches_king_row(piece, row)))
+        return moves
+
+    def _reaches_king_row(self, piece, row):
+        if piece.king:
+            return False
+        return row == (BOARD_SIZE - 1 if piece.color == RED_PLAYER else 0)
+
+    def _jump_moves(self, piece, row, col, path, captured, moves):
+        """Extend a jump sequence of piece from (row, col), appending complete Moves."""
+        extended = False
+        row_steps = []
+        if piece.color == RED_PLAYER or piece.king:
+            row_steps.append(1)
+        if piece.color == BLACK_PLAYER or piece.king:
+            row_steps.append(-1)
+        for dr in row_steps:
+            for dc in (-1, 1):
+                land_row, land_col = row + 2 * dr, col + 2 * dc
+                if not (0 <= land_row < BOARD_SIZE and 0 <= land_col < BOARD_SIZE):
+                    continue
+                jumped = self.board[row + dr][col + dc]
+                land = self.board[land_row][land_col]
+                # The moving piece has left its start square, so it may land there again
+                if (jumped != 0 and jumped.color != piece.color
+                        and (jumped.row, jumped.col) not in captured
+                        and (land == 0 or land is piece)):
+                    extended = True
+                    new_path = path + [(land_row, land_col)]
+                    new_captured = captured + [(jumped.row, jumped.col)]
+                    if self._reaches_king_row(piece, land_row):
+                        # Crowning ends the move
+                        moves.append(Move(new_path, new_captured, True))
+                    else:
+                        self._jump_moves(piece, land_row, land_col, new_path, new_captured, moves)
+        if not extended and captured:
+            moves.append(Move(path, captured, False))
+
+    def make_move(self, move):
+        """Play a complete Move in place. Undo it with unmake_move."""
+        start_row, start_col = move.start
+        end_row, end_col = move.end
+        piece = self.board[start_row][start_col]
+        captured = [self.board[row][col] for row, col in move.captured]
+        self.undo_stack.append((move, piece, piece.king, captured,
+                                (self.red_left, self.black_left, self.red_kings, self.black_kings)))
+
+        self.board[start_row][start_col] = 0
+        self.board[end_row][end_col] = piece
+        piece.move(end_row, end_col)
+        for jumped in captured:
+            self._capture(jumped)
+        self._promote(piece)
+        self._refresh_around([move.start, move.end] + list(move.captured))
+
+    def unmake_move(self):
+        """Take back the last make_move, restoring pieces and counts exactly."""
+        move, piece, was_king, captured, counts = self.undo_stack.pop()
+        start_row, start_col = move.start
+        end_row, end_col = move.end
+        self.board[end_row][end_col] = 0
+        self.board[start_row][start_col] = piece
+        piece.move(start_row, start_col)
+        piece.king = was_king
+        for jumped in captured:
+            self.board[jumped.row][jumped.col] = jumped
+            self.pieces[jumped.color].add(jumped)
+        self.red_left, self.black_left, self.red_kings, self.black_kings = counts
+        self._refresh_around([move.start, move.end] + list(move.captured))
 
     def get_all_pieces(self, color):
-        """Get all pieces of a given color."""
-        pieces = []
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                piece = self.board[row][col]
-                if piece != 0 and piece.color == color:
-                    pieces.append(piece)
-        return pieces
+        """Get all pieces of a given color, in row-major order."""
+        return sorted(self.pieces[color], key=lambda piece: (piece.row, piece.col))
+
+    def get_all_valid_moves(self, color):
+        """Return {piece: valid moves} for every piece of color that can move."""
+        must_capture = bool(self._capturers[color])
+        all_moves = {}
+        for piece in self.get_all_pieces(color):
+            moves = self._captures[piece] if must_capture else self._steps[piece]
+            if moves:
+                all_moves[piece] = dict(moves)
+        return all_moves
 
     def get_piece_captures(self, piece):
         """Get all possible captures for a piece."""
@@ -136,21 +289,16 @@ class Board:
 
     def has_captures_available(self, color):
         """Check if any piece of the given color has available captures."""
-        pieces = self.get_all_pieces(color)
-        for piece in pieces:
-            if self.get_piece_captures(piece):
-                return True
-        return False
+        return bool(self._capturers[color])
 
     def has_additional_captures(self, piece):
         """Check if a piece has additional captures available after a jump."""
-        captures = self.get_piece_captures(piece)
-        return len(captures) > 0
+        return len(self._captures[piece]) > 0
 
     def get_valid_moves(self, piece, must_jump=False):
         """Return all valid moves for a given piece."""
         # Get available captures for this piece
-        captures = self.get_piece_captures(piece)
+        captures = dict(self._captures[piece])
         
         # If this is a continuation of a multiple jump, only return captures
         if must_jump:
@@ -161,6 +309,10 @@ class Board:
             return captures
 
         # If no captures are available, return regular moves
+        return dict(self._steps[piece])
+
+    def get_piece_steps(self, piece):
+        """Get all non-capturing moves for a piece."""
         moves = {}
         left = piece.col - 1
         right = piece.col + 1
@@ -183,4 +335,26 @@ class Board:
                 if right < BOARD_SIZE and self.board[row-1][right] == 0:
                     moves[(row-1, right)] = []
 
-        return moves 
\ No newline at end of file
+        return moves 
+
+    def get_state(self, out=None):
+        """Encode the board as 32 floats, one per dark square (see src/encoding.py)."""
+        # NumPy is only needed for encoding, so it is not imported with the rules
+        import numpy as np
+        from src.encoding import piece_value
+        state = np.zeros(32, dtype=np.float32) if out is None else out
+        state[:] = 0
+        for pieces in self.pieces.values():
+            for piece in pieces:
+                state[piece.row * 4 + piece.col // 2] = piece_value(piece)
+        return state
+
+    def get_valid_moves_mask(self, color, out=None):
+        """Return a 32-square mask of the destinations color can move to."""
+        import numpy as np
+        mask = np.zeros(32, dtype=np.float32) if out is None else out
+        mask[:] = 0
+        for moves in self.get_all_valid_moves(color).values():
+            for row, col in moves:
+                mask[row * 4 + col // 2] = 1
+        return mask
@@ -1,9 +1,8 @@
-import pygame
-
 # Window dimensions
 WINDOW_SIZE = 600
 BOARD_SIZE = 8
 SQUARE_SIZE = WINDOW_SIZE // BOARD_SIZE
+FPS = 60
 
 # Colors (RGB values)
 BLACK = (0, 0, 0)
@@ -0,0 +1,106 @@
+import numpy as np
+from src.constants import *
+from src.bitboard import destinations
+
+# Value written into the 32-square state vector for each kind of piece
+RED_MAN_VALUE = 1.0
+RED_KING_VALUE = 2.0
+BLACK_MAN_VALUE = -1.0
+BLACK_KING_VALUE = -2.0
+
+_SHIFTS = np.arange(32, dtype=np.uint64)
+_KIND_VALUES = np.array([RED_MAN_VALUE, RED_KING_VALUE, BLACK_MAN_VALUE, BLACK_KING_VALUE], dtype=np.float32)
+
+
+def piece_value(piece):
+    """State value of a single piece."""
+    if piece.color == RED_PLAYER:
+        return RED_KING_VALUE if piece.king else RED_MAN_VALUE
+    return BLACK_KING_VALUE if piece.king else BLACK_MAN_VALUE
+
+
+def unpack_bits(masks):
+    """Expand (N,) uint64 bitboards into an (N, 32) array of 0/1."""
+    return (masks[:, None] >> _SHIFTS) & np.uint64(1)
+
+
+def _unpack_words(words):
+    """Expand plain int 32-bit masks into a (len(words), 32) uint8 array of 0/1."""
+    return np.unpackbits(np.array(words, dtype='<u4').view(np.uint8), bitorder='little').reshape(-1, 32)
+
+
+def encode_board_state(red, black, kings, out=None):
+    """Encode one position given as plain int bitboards, without going through the batch arrays."""
+    state = _KIND_VALUES @ _unpack_words([red & ~kings, red & kings, black & ~kings, black & kings])
+    if out is None:
+        return state
+    out[:] = state
+    return out
+
+
+def encode_board_mask(red, black, kings, color, out=None):
+    """The 32-square destination mask of one position given as plain int bitboards."""
+    mask = _unpack_words([destinations(red, black, kings, color)])[0].astype(np.float32)
+    if out is None:
+        return mask
+    out[:] = mask
+    return out
+
+
+def encode_bitboards(red, black, kings, colors, states=None, masks=None):
+    """Encode N positions given as uint64 bitboard arrays.
+
+    colors is the side to move, either one value for every position or an (N,)
+    array. Writes into states and masks when given (shape (N, 32)) and returns both.
+    """
+    red = np.asarray(red, dtype=np.uint64)
+    black = np.asarray(black, dtype=np.uint64)
+    kings = np.asarray(kings, dtype=np.uint64)
+    n = len(red)
+    if states is None:
+        states = np.empty((n, 32), dtype=np.float32)
+    if masks is None:
+        masks = np.empty((n, 32), dtype=np.float32)
+
+    red_kings = red & kings
+    black_kings = black & kings
+    states[:] = unpack_bits(red ^ red_kings)
+    states += RED_KING_VALUE * unpack_bits(red_kings)
+    states += BLACK_MAN_VALUE * unpack_bits(black ^ black_kings)
+    states += BLACK_KING_VALUE * unpack_bits(black_kings)
+
+    colors = np.asarray(colors)
+    if colors.ndim == 0:
+        dest = destinations(red, black, kings, int(colors))
+    else:
+        dest = np.where(colors == RED_PLAYER,
+                        destinations(red, black, kings, RED_PLAYER),
+                        destinations(red, black, kings, BLACK_PLAYER))
+    masks[:] = unpack_bits(dest)
+    return states, masks
+
+
+def encode_batch(boards, colors, states=None, masks=None):
+    """Encode N boards into (N, 32) state and valid-move mask arrays.
+
+    BitBoards are read straight from their masks with no per-board Python objects.
+    Other boards fall back to their own get_state / get_valid_moves_mask, writing
+    into the preallocated rows.
+    """
+    n = len(boards)
+    if states is None:
+        states = np.empty((n, 32), dtype=np.float32)
+    if masks is None:
+        masks = np.empty((n, 32), dtype=np.float32)
+
+    if all(hasattr(board, 'kings') for board in boards):
+        red = np.fromiter((board.red for board in boards), dtype=np.uint64, count=n)
+        black = np.fromiter((board.black for board in boards), dtype=np.uint64, count=n)
+        kings = np.fromiter((board.kings for board in boards), dtype=np.uint64, count=n)
+        return encode_bitboards(red, black, kings, colors, states, masks)
+
+    colors = np.broadcast_to(np.asarray(colors), (n,))
+    for i, board in enumerate(boards):
+        board.get_state(out=states[i])
+        board.get_valid_moves_mask(int(colors[i]), out=masks[i])
+    return states, masks
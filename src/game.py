@@ -1,40 +1,60 @@
-import pygame
+import time
 from src.constants import *
 from src.board import Board
+from src.bitboard import rc_to_square
+from src.termination import TerminationTracker
+from src import trace
+
+def color_name(color):
+    return 'red' if color == RED_PLAYER else 'black'
+
+
+def describe_outcome(outcome):
+    if outcome.winner is None:
+        return f"Draw by {'threefold repetition' if outcome.reason == 'repetition' else 'the 40-move rule'}"
+    return f"Winner: {'Red' if outcome.winner == RED_PLAYER else 'Black'}"
+
 
 class Game:
-    def __init__(self, window):
+    def __init__(self, window, board=None):
         self.window = window
-        self.board = Board()
+        # Any board with Board's interface works here, e.g. a BitBoard
+        self.board = board if board is not None else Board()
         self.turn = RED_PLAYER
         self.selected = None
         self.valid_moves = {}
         self.jumping_piece = None  # Track piece that's in the middle of multiple jumps
+        self.renderer = None  # Created on the first update so headless games never load pygame
+        self.termination = None  # TerminationTracker, started by the first outcome() call
+        self._turn_move = None  # The current turn's hops as a bitboard (src, dst, captured) move
 
     def update(self):
-        """Update the game display."""
-        self.board.draw(self.window)
-        self.draw_valid_moves()
-        pygame.display.update()
+        """Update the game display, redrawing only the squares that changed."""
+        if self.renderer is None:
+            from src import render
+            self.renderer = render.BoardRenderer(self.window)
+        if trace.metrics:
+            start = time.perf_counter()
+            self.renderer.render(self.board, self.valid_moves)
+            trace.observe('render_ms', 1000 * (time.perf_counter() - start))
+        else:
+            self.renderer.render(self.board, self.valid_moves)
 
     def select(self, row, col):
         """Handle piece selection and moves."""
-        print(f"Clicked position: row={row}, col={col}")
         piece = self.board.get_piece(row, col)
-        print(f"Piece at position: {piece}")
-        print(f"Current turn: {'Red' if self.turn == RED_PLAYER else 'Black'}")
-        
+        if trace.level >= trace.DEBUG:
+            trace.event(trace.DEBUG, 'select', row=row, col=col, piece=piece, turn=color_name(self.turn),
+                        selected=self.selected, valid_moves=list(self.valid_moves))
+
         # If a piece is already selected
         if self.selected:
-            print(f"Already selected piece: {self.selected}")
-            print(f"Valid moves: {self.valid_moves}")
             # Try to make a move
             result = self._move(row, col)
-            if result:
-                print(f"Moving piece {self.selected} to ({row}, {col})")
-                print(f"Turn changed to: {'Black' if self.turn == BLACK_PLAYER else 'Red'}")
-            print(f"Move result: {result}")
             if not result:
+                if self.jumping_piece is not None:
+                    # A multi-jump must be finished with the same piece
+                    return False
                 # If move failed, clear selection and try selecting new piece
                 self.selected = None
                 return self.select(row, col)
@@ -44,8 +64,8 @@ class Game:
         if piece != 0 and piece.color == self.turn:
             self.selected = piece
             self.valid_moves = self.board.get_valid_moves(piece)
-            print(f"Selected piece: {piece}")
-            print(f"Valid moves: {self.valid_moves}")
+            if trace.level >= trace.DEBUG:
+                trace.event(trace.DEBUG, 'selected', piece=piece, valid_moves=list(self.valid_moves))
             return True
             
         return False
@@ -53,35 +73,72 @@ class Game:
     def _move(self, row, col):
         """Execute a move if it's valid."""
         if self.selected and (row, col) in self.valid_moves:
-            self.board.move(self.selected, row, col)
-            self.change_turn()
+            self._play_hop(row, col)
             return True
         return False
 
+    def _play_hop(self, row, col):
+        """Move the selected piece one hop, keeping the turn while a multi-jump continues."""
+        captured = self.valid_moves[(row, col)]
+        was_king = self.selected.king
+        if trace.level >= trace.INFO:
+            trace.event(trace.INFO, 'move', turn=color_name(self.turn), start=(self.selected.row, self.selected.col),
+                        end=(row, col), captures=len(captured))
+        if self.termination is not None:
+            start = rc_to_square(self.selected.row, self.selected.col)
+            if self._turn_move is None:
+                self._turn_move = [start, start, 0]
+            self._turn_move[1] = rc_to_square(row, col)
+            if captured:
+                self._turn_move[2] |= 1 << rc_to_square((row + self.selected.row) // 2,
+                                                        (col + self.selected.col) // 2)
+        self.board.move(self.selected, row, col)
+        piece = self.board.get_piece(row, col)
+        # Crowning ends the move, otherwise the same piece must keep capturing
+        if captured and piece.king == was_king and self.board.has_additional_captures(piece):
+            self.jumping_piece = piece
+            self.selected = piece
+            self.valid_moves = self.board.get_valid_moves(piece, must_jump=True)
+            return
+        self.change_turn()
+
     def change_turn(self):
         """Switch turns between players."""
         self.valid_moves = {}
         self.selected = None
         self.jumping_piece = None  # Reset jumping piece when turn changes
+        if self.termination is not None:
+            if self._turn_move is not None and self.termination.color == self.turn:
+                self.termination.push(tuple(self._turn_move))
+            else:
+                # The turn changed without a move; start over from the board
+                self.termination = None
+        self._turn_move = None
         self.turn = BLACK_PLAYER if self.turn == RED_PLAYER else RED_PLAYER
-        print(f"\nTurn changed to: {'Red' if self.turn == RED_PLAYER else 'Black'}")
+        if trace.level >= trace.DEBUG:
+            trace.event(trace.DEBUG, 'turn', turn=color_name(self.turn))
 
     def draw_valid_moves(self):
         """Highlight valid moves on the board."""
-        for move in self.valid_moves:
-            row, col = move
-            pygame.draw.circle(self.window, BLUE,
-                             (col * SQUARE_SIZE + SQUARE_SIZE//2,
-                              row * SQUARE_SIZE + SQUARE_SIZE//2),
-                             15)
+        from src import render
+        render.draw_valid_moves(self.window, self.valid_moves)
+
+    def outcome(self):
+        """Outcome(winner, reason) once the game is over, else None.
+
+        A side with no legal move (or no pieces) loses; threefold repetition and
+        40 moves each without a capture are draws, with winner None.
+        """
+        if self.jumping_piece is not None:
+            return None  # Nothing is decided in the middle of a move
+        if self.termination is None:
+            self.termination = TerminationTracker.from_board(self.board, self.turn)
+        return self.termination.outcome()
 
     def winner(self):
         """Check if there's a winner."""
-        if self.board.red_left <= 0:
-            return BLACK_PLAYER
-        elif self.board.black_left <= 0:
-            return RED_PLAYER
-        return None
+        outcome = self.outcome()
+        return outcome.winner if outcome is not None else None
 
     def get_board(self):
         """Return the game board."""
@@ -110,8 +167,7 @@ class Game:
         if self.selected:
             row, col = end_pos
             if (row, col) in self.valid_moves:
-                self.board.move(self.selected, row, col)
-                self.change_turn()
+                self._play_hop(row, col)
                 return True
             
         return False 
\ No newline at end of file
@@ -1,6 +1,8 @@
+import argparse
 import pygame
-from constants import *
-from game import Game
+from src.constants import *
+from src.game import Game, describe_outcome
+from src import trace
 
 def get_row_col_from_mouse(pos):
     """Convert mouse position to board coordinates."""
@@ -11,6 +13,11 @@ def get_row_col_from_mouse(pos):
 
 def main():
     """Main game loop."""
+    parser = argparse.ArgumentParser(description='Play checkers')
+    trace.add_arguments(parser)
+    args = parser.parse_args()
+    reporter = trace.from_arguments(args)
+
     pygame.init()
     window = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
     pygame.display.set_caption('Checkers')
@@ -20,16 +27,20 @@ def main():
     running = True
 
     while running:
-        clock.tick(60)  # 60 FPS
+        clock.tick(FPS)
 
-        if game.winner() is not None:
-            print(f"Winner: {'Red' if game.winner() == RED_PLAYER else 'Black'}")
+        outcome = game.outcome()
+        if outcome is not None:
+            print(describe_outcome(outcome))
             running = False
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type == pygame.VIDEOEXPOSE and game.renderer is not None:
+                game.renderer.invalidate()
+
             if event.type == pygame.MOUSEBUTTONDOWN:
                 pos = pygame.mouse.get_pos()
                 row, col = get_row_col_from_mouse(pos)
@@ -37,7 +48,13 @@ def main():
                     game.select(row, col)
 
         game.update()
+        if reporter is not None:
+            reporter.tick()
 
+    if reporter is not None:
+        reporter.close()
+    if game.renderer is not None:
+        print(f"Render stats: {game.renderer.stats()}")
     pygame.quit()
 
 if __name__ == '__main__':
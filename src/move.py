@@ -0,0 +1,40 @@
+class Move:
+    """A complete move: every square visited, every square jumped and whether it crowns.
+
+    path runs from the starting square to the final landing square, so a double
+    jump has three entries. Squares are (row, col) tuples.
+    """
+    __slots__ = ('path', 'captured', 'promotes')
+
+    def __init__(self, path, captured=(), promotes=False):
+        self.path = tuple(path)
+        self.captured = tuple(captured)
+        self.promotes = promotes
+
+    @property
+    def start(self):
+        return self.path[0]
+
+    @property
+    def end(self):
+        return self.path[-1]
+
+    @property
+    def is_capture(self):
+        return len(self.captured) > 0
+
+    def hops(self):
+        """Return the move as (start, end) single hops, as Game.make_move_from_action takes them."""
+        return list(zip(self.path, self.path[1:]))
+
+    def __eq__(self, other):
+        return (isinstance(other, Move) and self.path == other.path
+                and self.captured == other.captured)
+
+    def __hash__(self):
+        return hash((self.path, self.captured))
+
+    def __repr__(self):
+        """String representation of the move."""
+        separator = 'x' if self.captured else '-'
+        return f"Move({separator.join(f'{row},{col}' for row, col in self.path)})"
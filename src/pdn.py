@@ -0,0 +1,232 @@
+import argparse
+import json
+import re
+from src.constants import *
+from src.board import Board
+from src.bitboard import BitBoard, move_path, rc_to_square
+from src.position import from_fen
+
+# PDN squares are numbered 1-32 row by row from row 0 (square = our index + 1).
+# As in position.py, PDN's "Black" is the side that moves first (red here), and
+# the first number of a result belongs to it: "1-0" (or "2-0") is a red win.
+RESULTS = {'1-0': RED_PLAYER, '2-0': RED_PLAYER, '0-1': BLACK_PLAYER, '0-2': BLACK_PLAYER,
+           '1/2-1/2': None, '1-1': None, '*': None}
+RESULT_STRINGS = {RED_PLAYER: '1-0', BLACK_PLAYER: '0-1', None: '1/2-1/2'}
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN = re.compile(r'\{[^}]*\}|\([^)]*\)|;[^\n]*|\[[^\]]*\]|\d+\.+|\$\d+|[^\s{}();\[\]]+')
+_MOVE = re.compile(r'(\d+)(?:([-x])(\d+))+$')
+
+
+class PDNError(ValueError):
+    """A game that cannot be parsed or contains an illegal move."""
+
+
+class PDNGame:
+    """One game: its tag pairs, moves as lists of PDN square numbers, and result token."""
+
+    def __init__(self, tags=None, moves=None, result='*', index=0, error=None):
+        self.tags = dict(tags or {})
+        self.moves = list(moves or [])
+        self.result = result
+        self.index = index
+        self.error = error  # Set when the text could not be parsed
+
+    @property
+    def winner(self):
+        return RESULTS.get(self.result)
+
+    def start(self, board_class=Board):
+        """(board, turn) at the start of the game, from the FEN tag if there is one."""
+        fen = self.tags.get('FEN')
+        if not fen:
+            return board_class(), RED_PLAYER
+        return from_fen(fen, board_class)
+
+    def replay(self, board_class=Board):
+        """Play the game through board_class, yielding (board, turn, move) before each move.
+
+        move is the matching legal Move. The board is updated after each yield.
+        Raises PDNError at the first illegal move, or if the game could not be parsed.
+        """
+        if self.error:
+            raise PDNError(self.error)
+        board, turn = self.start(board_class)
+        for ply, squares in enumerate(self.moves):
+            move = match_move(board, turn, squares)
+            if move is None:
+                raise PDNError(f"game {self.index}: illegal move {format_squares(squares)} at ply {ply + 1}")
+            yield board, turn, move
+            board.make_move(move)
+            turn = BLACK_PLAYER if turn == RED_PLAYER else RED_PLAYER
+
+    def validate(self, board_class=Board):
+        """Replay every move, raising PDNError on the first illegal one."""
+        for _ in self.replay(board_class):
+            pass
+
+
+def square_number(row, col):
+    return rc_to_square(row, col) + 1
+
+
+def move_squares(move):
+    """PDN square numbers along a Move's path."""
+    return [square_number(row, col) for row, col in move.path]
+
+
+def format_squares(squares, capture=None):
+    """'11-15' for a step, '15x24x31' for a capture."""
+    if capture is None:
+        capture = abs(squares[1] - squares[0]) > 5 if len(squares) == 2 else True
+    return ('x' if capture else '-').join(map(str, squares))
+
+
+def format_move(move):
+    return format_squares(move_squares(move), move.is_capture)
+
+
+def match_move(board, turn, squares):
+    """Return the legal Move matching PDN squares, or None.
+
+    Captures may be written in full ('1x10x19') or by start and end only ('1x19').
+    """
+    candidates = []
+    for move in board.get_moves(turn):
+        path = move_squares(move)
+        if path[0] != squares[0] or path[-1] != squares[-1]:
+            continue
+        if len(squares) > 2 and path[1:-1] != squares[1:-1]:
+            continue
+        candidates.append(move)
+    # Two king paths can end on the same square; an ambiguous short form is an error
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def _parse_game(text_lines, index):
+    tags = {}
+    moves = []
+    result = '*'
+    for token in _TOKEN.findall('\n'.join(text_lines)):
+        if token.startswith('['):
+            match = _TAG.fullmatch(token)
+            if match:
+                tags[match.group(1)] = match.group(2)
+            continue
+        if token[0] in '{(;$' or token[0].isdigit() and token.endswith('.'):
+            continue  # Comments, variations, annotations and move numbers
+        if token in RESULTS:
+            result = token
+            continue
+        token = token.rstrip('!?')
+        match = _MOVE.match(token)
+        if not match:
+            raise PDNError(f"game {index}: cannot read move {token!r}")
+        moves.append([int(square) for square in re.split('[-x]', token)])
+    if 'Result' in tags and result == '*':
+        result = tags['Result']
+    return PDNGame(tags, moves, result, index)
+
+
+def _parse_game_safely(lines, index):
+    try:
+        return _parse_game(lines, index)
+    except PDNError as e:
+        return PDNGame(index=index, error=str(e))
+
+
+def read_games(source):
+    """Yield PDNGames one at a time from a path or an open text file.
+
+    Only the current game is held in memory, so archives of any size stream.
+    A game that cannot be parsed is still yielded, with its error set, so one
+    bad game does not end the stream.
+    """
+    f = open(source) if isinstance(source, str) else source
+    try:
+        lines = []
+        in_moves = False
+        depth = 0
+        index = 0
+        for line in f:
+            stripped = line.strip()
+            if depth == 0 and stripped.startswith('[') and in_moves:
+                # A tag after movetext starts the next game
+                yield _parse_game_safely(lines, index)
+                index += 1
+                lines, in_moves = [], False
+            if stripped:
+                lines.append(stripped)
+                if depth > 0 or not stripped.startswith('['):
+                    in_moves = True
+            depth += stripped.count('{') - stripped.count('}')
+        if in_moves or lines:
+            yield _parse_game_safely(lines, index)
+    finally:
+        if f is not source:
+            f.close()
+
+
+def write_game(f, moves, tags=None, result='*', moves_per_line=6):
+    """Write one game. moves are Moves or lists of PDN square numbers."""
+    tags = dict(tags or {})
+    tags.setdefault('Event', '?')
+    tags['Result'] = result
+    for name, value in tags.items():
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        f.write(f'[{name} "{escaped}"]\n')
+    f.write('\n')
+    words = []
+    for ply, move in enumerate(moves):
+        text = format_squares(move) if isinstance(move, list) else format_move(move)
+        words.append(f"{ply // 2 + 1}. {text}" if ply % 2 == 0 else text)
+    lines = [' '.join(words[i:i + 2 * moves_per_line]) for i in range(0, len(words), 2 * moves_per_line)]
+    f.write('\n'.join(lines + [result]) + '\n\n')
+
+
+def bitboard_moves_to_squares(moves, board=None, color=RED_PLAYER):
+    """Convert (src, dst, captured) bitboard moves, e.g. from arena --record-moves, to PDN squares."""
+    board = board or BitBoard()
+    squares = []
+    for move in moves:
+        path = move_path(board.red, board.black, board.kings, color, tuple(move))
+        squares.append([sq + 1 for sq in path])
+        board.apply(color, tuple(move))
+        color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+    return squares
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate PDN files, or convert arena game records to PDN')
+    parser.add_argument('files', nargs='+', help='PDN files, or JSONL records with --to-pdn')
+    parser.add_argument('--to-pdn', type=str, default=None,
+                        help='Convert JSONL records (python -m src.ai.arena --record-moves) to this PDN file')
+    args = parser.parse_args()
+
+    if args.to_pdn:
+        from src.ai.book import read_game_records
+        count = 0
+        with open(args.to_pdn, 'w') as out:
+            for moves, winner in read_game_records(args.files):
+                write_game(out, bitboard_moves_to_squares(moves), {'Event': 'arena'},
+                           RESULT_STRINGS[winner])
+                count += 1
+        print(f"Wrote {count} games to {args.to_pdn}")
+        return
+
+    valid = invalid = plies = 0
+    for path in args.files:
+        for game in read_games(path):
+            try:
+                game.validate()
+            except PDNError as e:
+                print(f"{path}: {e}")
+                invalid += 1
+                continue
+            valid += 1
+            plies += len(game.moves)
+    print(json.dumps({'valid': valid, 'invalid': invalid, 'plies': plies}))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,4 @@
-import pygame
-from constants import *
+from src.constants import *
 
 class Piece:
     PADDING = 15
@@ -26,16 +25,8 @@ class Piece:
 
     def draw(self, window):
         """Draw the piece on the window."""
-        radius = SQUARE_SIZE // 2 - self.PADDING
-        # Draw piece outline
-        pygame.draw.circle(window, GRAY, (self.x, self.y), radius + self.OUTLINE)
-        # Draw piece fill using the color mapping
-        pygame.draw.circle(window, PIECE_COLORS[self.color], (self.x, self.y), radius)
-        
-        if self.king:
-            # Draw crown
-            crown_radius = radius // 2
-            pygame.draw.circle(window, CROWN, (self.x, self.y), crown_radius)
+        from src import render
+        render.draw_piece(window, self.row, self.col, self.color, self.king)
 
     def move(self, row, col):
         """Move piece to a new position."""
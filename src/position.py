@@ -0,0 +1,177 @@
+import re
+import numpy as np
+from src.constants import *
+from src.bitboard import BitBoard, FULL, iter_bits, rc_to_square, square_to_rc
+
+# One position in 14 bytes: the 32 dark squares as occupancy, colour and king
+# masks (square = row * 4 + col // 2), the side to move, and the square of a
+# piece that is part way through a multi-jump (NO_JUMP when there is none).
+POSITION = np.dtype([('occupied', '<u4'), ('black', '<u4'), ('kings', '<u4'),
+                     ('turn', 'u1'), ('jumping', 'u1')])
+NO_JUMP = 0xFF
+
+# FEN strings use the PDN draughts layout: squares numbered 1-32 row by row
+# from row 0, "B" for the side that starts on squares 1-12 and moves first
+# (red here) and "W" for the other side (black), e.g. "B:W21,22,K30:B1,2,K9".
+_FEN_SIDES = {RED_PLAYER: 'B', BLACK_PLAYER: 'W'}
+_FEN_COLORS = {'B': RED_PLAYER, 'W': BLACK_PLAYER}
+
+
+def _bitboards(board):
+    """(red, black, kings) masks of a BitBoard or any board with Board's interface."""
+    if not hasattr(board, 'kings'):
+        board = BitBoard.from_board(board)
+    return board.red, board.black, board.kings
+
+
+def _bitboard(red, black, kings):
+    board = BitBoard()
+    board.red, board.black, board.kings = int(red), int(black), int(kings)
+    return board
+
+
+def encode_positions(red, black, kings, turns, jumping=None):
+    """Pack N positions given as mask arrays into a POSITION structured array."""
+    red = np.asarray(red, dtype=np.uint32)
+    black = np.asarray(black, dtype=np.uint32)
+    records = np.empty(len(red), dtype=POSITION)
+    records['occupied'] = red | black
+    records['black'] = black
+    records['kings'] = kings
+    records['turn'] = turns
+    records['jumping'] = NO_JUMP if jumping is None else jumping
+    return records
+
+
+def decode_positions(records, validate=True):
+    """Unpack a POSITION array into (red, black, kings, turns, jumping) arrays.
+
+    With validate, raises ValueError if any record is not a legal encoding.
+    """
+    occupied = records['occupied']
+    black = records['black']
+    kings = records['kings']
+    if validate:
+        bad = ((black & ~occupied) | (kings & ~occupied)) != 0
+        bad |= (records['turn'] != RED_PLAYER) & (records['turn'] != BLACK_PLAYER)
+        bad |= (records['jumping'] >= 32) & (records['jumping'] != NO_JUMP)
+        if bad.any():
+            raise ValueError(f"invalid position record at index {int(np.argmax(bad))}")
+    return occupied ^ black, black, kings, records['turn'], records['jumping']
+
+
+def encode_boards(boards, turns):
+    """Snapshot N boards into a POSITION array.
+
+    BitBoards are read straight from their masks; list-based Boards are
+    converted square by square.
+    """
+    n = len(boards)
+    if not all(hasattr(board, 'kings') for board in boards):
+        boards = [BitBoard.from_board(board) for board in boards]
+    red = np.fromiter((board.red for board in boards), dtype=np.uint32, count=n)
+    black = np.fromiter((board.black for board in boards), dtype=np.uint32, count=n)
+    kings = np.fromiter((board.kings for board in boards), dtype=np.uint32, count=n)
+    return encode_positions(red, black, kings, turns)
+
+
+def decode_boards(records, board_class=BitBoard):
+    """Rebuild (board, turn) pairs from a POSITION array."""
+    red, black, kings, turns, _ = decode_positions(records)
+    result = []
+    for r, b, k, turn in zip(red.tolist(), black.tolist(), kings.tolist(), turns.tolist()):
+        board = _bitboard(r, b, k)
+        result.append((board if board_class is BitBoard else board.to_board(), turn))
+    return result
+
+
+def encode_position(board, turn):
+    """Pack one board into 14 bytes."""
+    return encode_boards([board], turn).tobytes()
+
+
+def decode_position(data, board_class=BitBoard):
+    """Unpack 14 bytes from encode_position into (board, turn)."""
+    return decode_boards(np.frombuffer(data, dtype=POSITION, count=1), board_class)[0]
+
+
+def snapshot_games(games):
+    """Snapshot N Games, including any multi-jump in progress, into a POSITION array."""
+    records = encode_boards([game.board for game in games], [game.turn for game in games])
+    for i, game in enumerate(games):
+        if game.jumping_piece is not None:
+            records['jumping'][i] = rc_to_square(game.jumping_piece.row, game.jumping_piece.col)
+    return records
+
+
+def restore_games(records, board_class=BitBoard):
+    """Rebuild headless Games from snapshot_games records."""
+    from src.game import Game
+    games = []
+    for (board, turn), jumping in zip(decode_boards(records, board_class), records['jumping'].tolist()):
+        game = Game(None, board=board)
+        game.turn = turn
+        if jumping != NO_JUMP:
+            piece = board.get_piece(*square_to_rc(jumping))
+            game.selected = game.jumping_piece = piece
+            game.valid_moves = board.get_valid_moves(piece, must_jump=True)
+        games.append(game)
+    return games
+
+
+def save_positions(path, records):
+    """Write a POSITION array as raw 14-byte records."""
+    records.astype(POSITION, copy=False).tofile(path)
+
+
+def load_positions(path, mmap=False):
+    """Read a file from save_positions, memory-mapped if requested."""
+    if mmap:
+        return np.memmap(path, dtype=POSITION, mode='r')
+    return np.fromfile(path, dtype=POSITION)
+
+
+def to_fen(board, turn):
+    """FEN-style string for a position, e.g. "B:W21,22,K30:B1,2,K9"."""
+    red, black, kings = _bitboards(board)
+    fields = [_FEN_SIDES[turn]]
+    for color in (BLACK_PLAYER, RED_PLAYER):
+        own = red if color == RED_PLAYER else black
+        squares = [('K' if kings >> sq & 1 else '') + str(sq + 1) for sq in iter_bits(own)]
+        fields.append(_FEN_SIDES[color] + ','.join(squares))
+    return ':'.join(fields)
+
+
+def from_fen(fen, board_class=BitBoard):
+    """Parse a FEN-style string into (board, turn).
+
+    Accepts either colour order, K-prefixed kings and square ranges like "1-12".
+    Raises ValueError on malformed input.
+    """
+    fen = fen.strip().strip('"').rstrip('.')
+    fields = fen.split(':')
+    if not fields or fields[0].upper() not in _FEN_COLORS:
+        raise ValueError(f"bad side to move in FEN: {fen!r}")
+    turn = _FEN_COLORS[fields[0].upper()]
+    masks = {RED_PLAYER: 0, BLACK_PLAYER: 0}
+    kings = 0
+    for field in fields[1:]:
+        if not field or field[0].upper() not in _FEN_COLORS:
+            raise ValueError(f"bad colour field in FEN: {field!r}")
+        color = _FEN_COLORS[field[0].upper()]
+        for token in filter(None, field[1:].split(',')):
+            match = re.fullmatch(r'(K?)(\d+)(?:-(\d+))?', token.strip().upper())
+            if not match:
+                raise ValueError(f"bad square in FEN: {token!r}")
+            first = int(match.group(2))
+            last = int(match.group(3) or first)
+            if not 1 <= first <= last <= 32:
+                raise ValueError(f"square out of range in FEN: {token!r}")
+            bits = (FULL >> (32 - (last - first + 1))) << (first - 1)
+            masks[color] |= bits
+            if match.group(1):
+                kings |= bits
+    if masks[RED_PLAYER] & masks[BLACK_PLAYER]:
+        raise ValueError(f"square occupied by both sides in FEN: {fen!r}")
+    board = _bitboard(masks[RED_PLAYER], masks[BLACK_PLAYER], kings)
+    return (board if board_class is BitBoard else board.to_board()), turn
@@ -0,0 +1,151 @@
+import time
+import pygame
+from src.constants import *
+from src.piece import Piece
+
+# Drawing helpers for the core classes. Board, Piece and Game import this module
+# only when they draw, so the rules can be used without pygame installed.
+
+def draw_squares(window):
+    """Draw the checkerboard pattern."""
+    window.fill(BLACK)
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            if (row + col) % 2 == 0:
+                pygame.draw.rect(window, WHITE,
+                                 (col * SQUARE_SIZE, row * SQUARE_SIZE,
+                                  SQUARE_SIZE, SQUARE_SIZE))
+
+
+def draw_piece(window, row, col, color, king):
+    """Draw a single piece centred on its square."""
+    x = SQUARE_SIZE * col + SQUARE_SIZE // 2
+    y = SQUARE_SIZE * row + SQUARE_SIZE // 2
+    radius = SQUARE_SIZE // 2 - Piece.PADDING
+    # Draw piece outline
+    pygame.draw.circle(window, GRAY, (x, y), radius + Piece.OUTLINE)
+    # Draw piece fill using the color mapping
+    pygame.draw.circle(window, PIECE_COLORS[color], (x, y), radius)
+
+    if king:
+        # Draw crown
+        crown_radius = radius // 2
+        pygame.draw.circle(window, CROWN, (x, y), crown_radius)
+
+
+def draw_board(window, board):
+    """Draw the complete board with squares and pieces."""
+    draw_squares(window)
+    for color in (RED_PLAYER, BLACK_PLAYER):
+        for piece in board.get_all_pieces(color):
+            draw_piece(window, piece.row, piece.col, piece.color, piece.king)
+
+
+def draw_valid_moves(window, valid_moves):
+    """Highlight valid moves on the board."""
+    for row, col in valid_moves:
+        pygame.draw.circle(window, BLUE,
+                           (col * SQUARE_SIZE + SQUARE_SIZE//2,
+                            row * SQUARE_SIZE + SQUARE_SIZE//2),
+                           15)
+
+
+class BoardRenderer:
+    """Draws a board from cached surfaces and only updates squares that changed.
+
+    The board background and each piece sprite are rendered once. Every frame the
+    pieces and highlighted moves are compared with what is on screen; only the
+    squares that differ are redrawn and pushed with pygame.display.update(rects),
+    and a frame with no changes draws nothing at all.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.background = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE))
+        draw_squares(self.background)
+        self.sprites = {}
+        for color in (RED_PLAYER, BLACK_PLAYER):
+            for king in (False, True):
+                sprite = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+                # Draw at the sprite's own origin by drawing on square (0, 0)
+                draw_piece(sprite, 0, 0, color, king)
+                self.sprites[(color, king)] = sprite
+        self.highlight = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
+        draw_valid_moves(self.highlight, [(0, 0)])
+
+        self.on_screen = None  # {(row, col): (piece key or None, highlighted)}
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.squares_drawn = 0
+        self.frame_times = []
+        self.cpu_time = 0.0
+        self.started = time.perf_counter()
+
+    def invalidate(self):
+        """Force a full redraw on the next frame, e.g. after the window was exposed."""
+        self.on_screen = None
+
+    def render(self, board, valid_moves=()):
+        """Draw whatever changed since the last call. Returns True if anything was drawn."""
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        state = {}
+        for color in (RED_PLAYER, BLACK_PLAYER):
+            for piece in board.get_all_pieces(color):
+                state[(piece.row, piece.col)] = [(color, piece.king), False]
+        for row, col in valid_moves:
+            state.setdefault((row, col), [None, False])[1] = True
+        state = {square: tuple(value) for square, value in state.items()}
+
+        if self.on_screen is None:
+            self.window.blit(self.background, (0, 0))
+            dirty = state.keys()
+            full = True
+        else:
+            dirty = {square for square in state.keys() | self.on_screen.keys()
+                     if state.get(square) != self.on_screen.get(square)}
+            full = False
+
+        if not dirty and not full:
+            self.frames_skipped += 1
+            self.cpu_time += time.process_time() - cpu_start
+            return False
+
+        rects = []
+        for row, col in dirty:
+            rect = pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+            if not full:
+                self.window.blit(self.background, rect, rect)
+            piece_key, highlighted = state.get((row, col), (None, False))
+            if piece_key is not None:
+                self.window.blit(self.sprites[piece_key], rect)
+            if highlighted:
+                self.window.blit(self.highlight, rect)
+            rects.append(rect)
+        self.on_screen = state
+
+        if full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        self.frames_drawn += 1
+        self.squares_drawn += len(rects)
+        self.frame_times.append(time.perf_counter() - start)
+        if len(self.frame_times) > 10000:
+            del self.frame_times[:5000]
+        self.cpu_time += time.process_time() - cpu_start
+        return True
+
+    def stats(self):
+        """Return frame counts, draw times (ms) and the share of CPU spent rendering."""
+        elapsed = time.perf_counter() - self.started
+        times = sorted(self.frame_times)
+        return {
+            'frames_drawn': self.frames_drawn,
+            'frames_skipped': self.frames_skipped,
+            'squares_drawn': self.squares_drawn,
+            'mean_frame_ms': 1000 * sum(times) / len(times) if times else 0.0,
+            'p95_frame_ms': 1000 * times[int(0.95 * (len(times) - 1))] if times else 0.0,
+            'render_cpu_share': self.cpu_time / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,269 @@
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from src.constants import *
+from src.game import Game, color_name
+from src.bitboard import BitBoard, move_path, square_to_rc
+from src.termination import Outcome
+
+IDLE_TIMEOUT = 300.0  # Seconds without a request before a session is evicted
+
+# Per-process AI player, built once by _init_ai_worker
+_ai_player = None
+
+
+def _init_ai_worker(spec):
+    global _ai_player
+    from src.ai.arena import make_player
+    _ai_player = make_player(spec)
+
+
+def _ai_choose(red, black, kings, color):
+    """Runs in a worker process: return the AI's move as a list of (row, col) squares."""
+    board = BitBoard()
+    board.red, board.black, board.kings = red, black, kings
+    moves = board.get_legal_moves(color)
+    if not moves:
+        return None
+    move = _ai_player.choose(board, color, moves)
+    return [square_to_rc(sq) for sq in move_path(red, black, kings, color, move)]
+
+
+class Session:
+    """One headless human-vs-AI game."""
+
+    def __init__(self, session_id, human_color):
+        self.id = session_id
+        self.game = Game(None, board=BitBoard())
+        self.human_color = human_color
+        self.ai_color = BLACK_PLAYER if human_color == RED_PLAYER else RED_PLAYER
+        self.resigned = None
+        self.ai_task = None
+        self.ai_error = None  # Set when the AI's move failed, reported on the next request
+        self.last_active = time.monotonic()
+
+    def outcome(self):
+        if self.resigned is not None:
+            return Outcome(BLACK_PLAYER if self.resigned == RED_PLAYER else RED_PLAYER, 'resigned')
+        return self.game.outcome()
+
+    def state(self):
+        board = self.game.board
+        rows = []
+        for row in range(BOARD_SIZE):
+            line = ''
+            for col in range(BOARD_SIZE):
+                piece = board.get_piece(row, col)
+                if piece == 0:
+                    line += '.'
+                else:
+                    letter = 'r' if piece.color == RED_PLAYER else 'b'
+                    line += letter.upper() if piece.king else letter
+            rows.append(line)
+        selected = self.game.selected
+        outcome = self.outcome()
+        return {
+            'session': self.id,
+            'board': rows,
+            'turn': color_name(self.game.turn),
+            'you': color_name(self.human_color),
+            'selected': [selected.row, selected.col] if selected else None,
+            'valid_moves': [list(square) for square in self.game.valid_moves],
+            'ai_thinking': self.ai_task is not None and not self.ai_task.done(),
+            'winner': color_name(outcome.winner) if outcome and outcome.winner is not None else None,
+            'result': outcome.reason if outcome else None,
+        }
+
+
+class GameServer:
+    """Hosts many sessions and speaks newline-delimited JSON.
+
+    Each request is one JSON object with a "cmd":
+      new     {"color": "red"|"black"}            start a session
+      select  {"session", "row", "col"}           click a square, like Game.select
+      move    {"session", "from": [r, c], "to": [r, c]}
+      state   {"session", "wait": bool}           wait=true waits for the AI's reply
+      resign  {"session"}
+      stats   {}
+    Every reply is one JSON object with "ok" and either the session state or an "error".
+    AI moves run in a process pool so the event loop never blocks on a search.
+    """
+
+    def __init__(self, ai_spec='search:0.1', ai_workers=None, idle_timeout=IDLE_TIMEOUT):
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.idle_timeout = idle_timeout
+        self.executor = ProcessPoolExecutor(ai_workers, initializer=_init_ai_worker,
+                                            initargs=(ai_spec,))
+        self.latencies = deque(maxlen=100000)
+        self.moves = 0
+        self.started = time.monotonic()
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                waited = False
+                try:
+                    request = json.loads(line)
+                    waited = bool(request.get('wait'))
+                    reply = await self.dispatch(request)
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    reply = {'ok': False, 'error': f"bad request: {e}"}
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+                # Waiting on the AI is think time, not server latency
+                if not waited:
+                    self.latencies.append(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        cmd = request['cmd']
+        if cmd == 'new':
+            human = BLACK_PLAYER if request.get('color', 'black') == 'black' else RED_PLAYER
+            session = Session(next(self.ids), human)
+            self.sessions[session.id] = session
+            self._schedule_ai(session)
+            return {'ok': True, **session.state()}
+        if cmd == 'stats':
+            return {'ok': True, **self.stats()}
+
+        session = self.sessions.get(request['session'])
+        if session is None:
+            return {'ok': False, 'error': 'unknown or expired session'}
+        session.last_active = time.monotonic()
+        game = session.game
+
+        if cmd == 'state' and request.get('wait') and session.ai_task is not None:
+            await asyncio.wait([session.ai_task])
+        if session.ai_error is not None:
+            error, session.ai_error = session.ai_error, None
+            # Try again, so one failed search does not leave the game stuck on the AI's turn
+            self._schedule_ai(session)
+            return {'ok': False, 'error': f"AI move failed: {error}", **session.state()}
+        if cmd == 'state':
+            return {'ok': True, **session.state()}
+        if cmd == 'resign':
+            session.resigned = session.human_color
+            return {'ok': True, **session.state()}
+        if session.outcome() is not None:
+            return {'ok': False, 'error': 'game is over', **session.state()}
+        if game.turn != session.human_color:
+            return {'ok': False, 'error': 'not your turn', **session.state()}
+
+        turn = game.turn
+        if cmd == 'select':
+            game.select(int(request['row']), int(request['col']))
+        elif cmd == 'move':
+            start, end = tuple(request['from']), tuple(request['to'])
+            selected = game.selected
+            if selected and game.jumping_piece is None and (selected.row, selected.col) != start:
+                game.selected = None
+            if not game.make_move_from_action((start, end)):
+                if game.jumping_piece is None:
+                    game.selected, game.valid_moves = None, {}
+                return {'ok': False, 'error': 'illegal move', **session.state()}
+        else:
+            return {'ok': False, 'error': f"unknown command {cmd}"}
+        if game.turn != turn:
+            self.moves += 1
+            self._schedule_ai(session)
+        return {'ok': True, **session.state()}
+
+    def _schedule_ai(self, session):
+        if session.game.turn == session.ai_color and session.outcome() is None:
+            session.ai_task = asyncio.ensure_future(self._ai_move(session))
+
+    async def _ai_move(self, session):
+        game = session.game
+        board = game.board
+        loop = asyncio.get_running_loop()
+        try:
+            path = await loop.run_in_executor(self.executor, _ai_choose, board.red, board.black,
+                                              board.kings, session.ai_color)
+        except Exception as e:
+            print(f"session {session.id}: AI move failed: {e!r}", file=sys.stderr, flush=True)
+            session.ai_error = repr(e)
+            return
+        if path is None or session.id not in self.sessions:
+            return
+        for start, end in zip(path, path[1:]):
+            if game.turn != session.ai_color:
+                break
+            game.make_move_from_action((start, end))
+        self.moves += 1
+
+    async def evict_idle(self, interval=10.0):
+        """Periodically drop sessions that have been idle too long."""
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self.idle_timeout
+            for session_id in [s.id for s in self.sessions.values() if s.last_active < cutoff]:
+                session = self.sessions.pop(session_id)
+                if session.ai_task is not None:
+                    session.ai_task.cancel()
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+        p99 = latencies[int(0.99 * (len(latencies) - 1))] if latencies else 0.0
+        return {'sessions': len(self.sessions), 'moves': self.moves,
+                'moves_per_sec': self.moves / elapsed if elapsed > 0 else 0.0,
+                'requests': len(latencies), 'p99_latency_ms': 1000 * p99}
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(json.dumps(self.stats()), flush=True)
+
+
+async def serve(host='127.0.0.1', port=8765, unix=None, ai_spec='search:0.1', ai_workers=None,
+                idle_timeout=IDLE_TIMEOUT, report_interval=10.0):
+    server = GameServer(ai_spec, ai_workers, idle_timeout)
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle_client, path=unix)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+    tasks = [asyncio.ensure_future(server.evict_idle())]
+    if report_interval:
+        tasks.append(asyncio.ensure_future(server.report(report_interval)))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+        server.executor.shutdown(cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve many headless checkers games over a socket')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', type=str, default=None, help='Listen on this Unix socket instead of TCP')
+    parser.add_argument('--ai', type=str, default='search:0.1',
+                        help='AI player: random, search[:seconds], model:<path> or mcts[:<path>]')
+    parser.add_argument('--ai-workers', type=int, default=None, help='AI worker processes')
+    parser.add_argument('--idle-timeout', type=float, default=IDLE_TIMEOUT)
+    parser.add_argument('--report-interval', type=float, default=10.0, help='Seconds between stats lines')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.ai, args.ai_workers,
+                          args.idle_timeout, args.report_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
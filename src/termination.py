@@ -0,0 +1,122 @@
+from collections import namedtuple
+from src.constants import *
+from src.bitboard import generate_moves, apply_move, jumpers, step_movers
+from src.zobrist import Zobrist
+
+# A side with no legal move loses; otherwise the game is drawn by threefold
+# repetition, or after 40 moves by each side without a capture.
+REPETITIONS = 3
+NO_CAPTURE_PLIES = 80
+
+Outcome = namedtuple("Outcome", ["winner", "reason"])  # winner is None for a draw
+
+_zobrist = None
+
+
+def _shared_zobrist():
+    global _zobrist
+    if _zobrist is None:
+        _zobrist = Zobrist()
+    return _zobrist
+
+
+class TerminationTracker:
+    """Follows a game move by move and reports when it is over.
+
+    The position hash is updated incrementally with the searchers' Zobrist keys,
+    and a count per hash is kept since the last capture or man move (earlier
+    positions can never come back), so repetition and move-limit checks are
+    dictionary lookups. Whether the side to move can move at all is two
+    bitboard tests (jumpers/step_movers), so outcome() never expands multi-jumps.
+    The full move list is generated only when legal_moves() is asked for, then
+    cached, so play loops can take it from there instead of generating it again.
+
+    Moves are bitboard (src, dst, captured) tuples. push/pop let a searcher
+    follow its own line and return to the game position.
+    """
+
+    def __init__(self, red, black, kings, color=RED_PLAYER, zobrist=None,
+                 repetitions=REPETITIONS, no_capture_plies=NO_CAPTURE_PLIES):
+        self.zobrist = zobrist or _shared_zobrist()
+        self.repetitions = repetitions
+        self.no_capture_plies = no_capture_plies
+        self.red, self.black, self.kings, self.color = red, black, kings, color
+        self.key = self.zobrist.hash(red, black, kings, color)
+        self.counts = {self.key: 1}
+        self.quiet_plies = 0  # Plies since the last capture
+        self.plies = 0
+        self._moves = None
+        self._undo = []
+
+    @classmethod
+    def from_board(cls, board, color=RED_PLAYER, **kw):
+        """Start tracking any board with Board's interface (a BitBoard is used as is)."""
+        from src.bitboard import BitBoard
+        if not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        return cls(board.red, board.black, board.kings, color, **kw)
+
+    def legal_moves(self):
+        if self._moves is None:
+            self._moves = generate_moves(self.red, self.black, self.kings, self.color)
+        return self._moves
+
+    def has_moves(self):
+        """True if the side to move has any legal move."""
+        if self._moves is not None:
+            return bool(self._moves)
+        return bool(jumpers(self.red, self.black, self.kings, self.color)
+                    or step_movers(self.red, self.black, self.kings, self.color))
+
+    def push(self, move):
+        """Play move for the side to move."""
+        red, black, kings, color = self.red, self.black, self.kings, self.color
+        key = self.zobrist.update(self.key, red, black, kings, color, move)
+        src, _, captured = move
+        counts = self.counts
+        # A capture or a man move can't be undone, so no earlier position can repeat
+        irreversible = captured or not kings >> src & 1
+        self._undo.append((red, black, kings, color, self.key, self.quiet_plies, self._moves,
+                           counts if irreversible else None))
+        if irreversible:
+            counts = self.counts = {}
+        counts[key] = counts.get(key, 0) + 1
+        self.red, self.black, self.kings = apply_move(red, black, kings, color, move)
+        self.color = BLACK_PLAYER if color == RED_PLAYER else RED_PLAYER
+        self.key = key
+        self.quiet_plies = 0 if captured else self.quiet_plies + 1
+        self.plies += 1
+        self._moves = None
+
+    def pop(self):
+        """Take back the last push."""
+        red, black, kings, color, key, quiet_plies, moves, counts = self._undo.pop()
+        if counts is not None:
+            self.counts = counts
+        else:
+            n = self.counts[self.key] - 1
+            if n:
+                self.counts[self.key] = n
+            else:
+                del self.counts[self.key]
+        self.red, self.black, self.kings, self.color = red, black, kings, color
+        self.key, self.quiet_plies, self._moves = key, quiet_plies, moves
+        self.plies -= 1
+
+    def is_repetition(self, times=2):
+        """True if the current position has occurred at least times times."""
+        return self.counts.get(self.key, 0) >= times
+
+    def draw_reason(self):
+        if self.counts[self.key] >= self.repetitions:
+            return 'repetition'
+        if self.quiet_plies >= self.no_capture_plies:
+            return 'move_limit'
+        return None
+
+    def outcome(self):
+        """Outcome(winner, reason) if the game is over, else None."""
+        if not self.has_moves():
+            return Outcome(BLACK_PLAYER if self.color == RED_PLAYER else RED_PLAYER, 'no_moves')
+        reason = self.draw_reason()
+        return Outcome(None, reason) if reason else None
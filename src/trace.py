@@ -0,0 +1,194 @@
+"""Leveled tracing and lightweight metrics.
+
+Both are off by default. Call sites guard themselves with a plain attribute
+check, so disabled tracing never builds a message:
+
+    if trace.level >= trace.DEBUG:
+        trace.event(trace.DEBUG, 'select', row=row, col=col)
+    if trace.metrics:
+        trace.observe('render_ms', elapsed_ms)
+
+Events are written as one JSON object per line. Metrics are counters and
+fixed-bucket latency histograms, written as periodic JSON or CSV snapshots
+by StatsReporter.
+"""
+import bisect
+import csv
+import json
+import os
+import sys
+import time
+
+OFF, ERROR, WARNING, INFO, DEBUG = range(5)
+LEVELS = {'off': OFF, 'error': ERROR, 'warning': WARNING, 'info': INFO, 'debug': DEBUG}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+level = OFF
+metrics = False
+_stream = sys.stderr
+
+counters = {}
+histograms = {}
+
+
+def configure(trace_level='off', stream=None, enable_metrics=False):
+    """Set the trace level (a name from LEVELS or a number), the event stream and metrics collection."""
+    global level, metrics, _stream
+    level = LEVELS[trace_level] if isinstance(trace_level, str) else trace_level
+    if stream is not None:
+        _stream = open(stream, 'a') if isinstance(stream, str) else stream
+    if enable_metrics and not metrics:
+        instrument_movegen()
+    metrics = enable_metrics
+
+
+def event(event_level, name, **fields):
+    """Write one event. Callers check level first so disabled events cost nothing."""
+    if event_level > level:
+        return
+    record = {'t': round(time.time(), 6), 'level': LEVEL_NAMES[event_level], 'event': name}
+    record.update(fields)
+    _stream.write(json.dumps(record, default=str) + '\n')
+    _stream.flush()
+
+
+def count(name, n=1):
+    counters[name] = counters.get(name, 0) + n
+
+
+def observe(name, ms):
+    histogram = histograms.get(name)
+    if histogram is None:
+        histogram = histograms[name] = Histogram()
+    histogram.observe(ms)
+
+
+class Histogram:
+    """Latency histogram over fixed, roughly 41% wide buckets from 0.01ms to about 30s.
+
+    Memory stays constant however many values are observed; percentiles are
+    reported as the upper bound of the bucket they fall in.
+    """
+
+    BOUNDS = [0.01 * 2 ** (i / 2) for i in range(44)]
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.buckets[bisect.bisect_left(self.BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(self.BOUNDS[index], self.max) if index < len(self.BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {'count': self.count,
+                'mean': self.total / self.count if self.count else 0.0,
+                'p50': self.percentile(0.5), 'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99), 'max': self.max}
+
+
+def snapshot():
+    """Current counters and histogram summaries (milliseconds)."""
+    return {'time': time.time(),
+            'counters': dict(counters),
+            'histograms': {name: histogram.summary() for name, histogram in histograms.items()}}
+
+
+def reset():
+    counters.clear()
+    histograms.clear()
+
+
+CSV_FIELDS = ['time', 'name', 'type', 'count', 'mean', 'p50', 'p95', 'p99', 'max']
+
+
+def write_snapshot(path, stats=None):
+    """Append a snapshot to path: CSV rows if it ends in .csv, otherwise one JSON line."""
+    stats = stats or snapshot()
+    if path.endswith('.csv'):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, CSV_FIELDS)
+            if new:
+                writer.writeheader()
+            for name, value in stats['counters'].items():
+                writer.writerow({'time': stats['time'], 'name': name, 'type': 'counter', 'count': value})
+            for name, summary in stats['histograms'].items():
+                writer.writerow(dict(summary, time=stats['time'], name=name, type='histogram'))
+    else:
+        with open(path, 'a') as f:
+            f.write(json.dumps(stats) + '\n')
+
+
+class StatsReporter:
+    """Writes a snapshot every interval seconds. Call tick() once per frame and close() at exit."""
+
+    def __init__(self, path, interval=10.0):
+        self.path = path
+        self.interval = interval
+        self.next_write = time.perf_counter() + interval
+
+    def tick(self):
+        now = time.perf_counter()
+        if now >= self.next_write:
+            write_snapshot(self.path)
+            self.next_write = now + self.interval
+
+    def close(self):
+        write_snapshot(self.path)
+
+
+def _counting(method, name):
+    def counted(*args, **kwargs):
+        counters[name] = counters.get(name, 0) + 1
+        return method(*args, **kwargs)
+    counted.__wrapped__ = method
+    return counted
+
+
+def instrument_movegen():
+    """Count move generation calls on Board and BitBoard.
+
+    The methods are wrapped only once metrics are enabled, so uninstrumented
+    runs execute the original code with no counter check at all.
+    """
+    from src.board import Board
+    from src.bitboard import BitBoard
+    for cls, names in ((Board, ('get_valid_moves', 'get_all_valid_moves', 'get_moves')),
+                       (BitBoard, ('get_valid_moves', 'get_all_valid_moves', 'get_moves', 'get_legal_moves'))):
+        for name in names:
+            method = cls.__dict__.get(name)
+            if method is not None and not hasattr(method, '__wrapped__'):
+                setattr(cls, name, _counting(method, f"movegen.{cls.__name__}.{name}"))
+
+
+def add_arguments(parser):
+    """The --trace/--trace-file/--stats/--stats-interval options shared by the game entry points."""
+    parser.add_argument('--trace', type=str, default='off', choices=list(LEVELS),
+                        help='Trace level for JSON-line events')
+    parser.add_argument('--trace-file', type=str, default=None, help='Write trace events here instead of stderr')
+    parser.add_argument('--stats', type=str, default=None,
+                        help='Append periodic metrics snapshots to this file (.csv for CSV, otherwise JSON lines)')
+    parser.add_argument('--stats-interval', type=float, default=10.0, help='Seconds between stats snapshots')
+
+
+def from_arguments(args):
+    """Configure tracing from add_arguments options. Returns a StatsReporter, or None without --stats."""
+    configure(args.trace, args.trace_file, enable_metrics=bool(args.stats))
+    return StatsReporter(args.stats, args.stats_interval) if args.stats else None
@@ -0,0 +1,42 @@
+import random
+from src.constants import *
+from src.bitboard import iter_bits, RED_KING_ROW, BLACK_KING_ROW
+
+# Piece kinds used to index Zobrist keys
+RED_MAN, RED_KING, BLACK_MAN, BLACK_KING = range(4)
+
+
+class Zobrist:
+    """Random 64-bit keys for every (piece kind, square) plus the side to move."""
+
+    def __init__(self, seed=0x5EED):
+        rng = random.Random(seed)
+        self.pieces = [[rng.getrandbits(64) for _ in range(32)] for _ in range(4)]
+        self.side = rng.getrandbits(64)
+
+    def hash(self, red, black, kings, color):
+        """Hash a position from scratch."""
+        h = self.side if color == BLACK_PLAYER else 0
+        for kind, bb in ((RED_MAN, red & ~kings), (RED_KING, red & kings),
+                         (BLACK_MAN, black & ~kings), (BLACK_KING, black & kings)):
+            keys = self.pieces[kind]
+            for sq in iter_bits(bb):
+                h ^= keys[sq]
+        return h
+
+    def update(self, h, red, black, kings, color, move):
+        """Return the hash after color plays move, given the position before it."""
+        src, dst, captured = move
+        if color == RED_PLAYER:
+            man, king, opp_man, opp_king, king_row = RED_MAN, RED_KING, BLACK_MAN, BLACK_KING, RED_KING_ROW
+        else:
+            man, king, opp_man, opp_king, king_row = BLACK_MAN, BLACK_KING, RED_MAN, RED_KING, BLACK_KING_ROW
+        if kings >> src & 1:
+            h ^= self.pieces[king][src] ^ self.pieces[king][dst]
+        elif king_row >> dst & 1:
+            h ^= self.pieces[man][src] ^ self.pieces[king][dst]
+        else:
+            h ^= self.pieces[man][src] ^ self.pieces[man][dst]
+        for sq in iter_bits(captured):
+            h ^= self.pieces[opp_king if kings >> sq & 1 else opp_man][sq]
+        return h ^ self.side
@@ -0,0 +1,49 @@
+import numpy as np
+from src.constants import *
+from src.bitboard import BitBoard
+from src.ai.mcts import MCTS, UNEXPANDED
+
+
+def _root_priors(mcts):
+    first = mcts.first_child[mcts.root]
+    return mcts.prior[first:first + mcts.n_children[mcts.root]].copy()
+
+
+def _play_and_reuse(mcts):
+    """Search the start, play the best move and return the board and colour of the reused root."""
+    board = BitBoard()
+    move = mcts.search(board, RED_PLAYER, None, simulations=200).move
+    board.apply(RED_PLAYER, move)
+    mcts.advance(move)
+    return board, BLACK_PLAYER
+
+
+def test_reused_root_gets_fresh_noise():
+    mcts = MCTS(noise=(0.3, 0.25), seed=0)
+    board, color = _play_and_reuse(mcts)
+    assert mcts.first_child[mcts.root] != UNEXPANDED  # The root came from the previous tree
+    before = _root_priors(mcts)
+
+    mcts.search(board, color, None, simulations=8)
+    after = _root_priors(mcts)
+    assert not np.allclose(before, after)
+    assert np.isclose(after.sum(), 1.0, atol=1e-5)
+
+
+def test_repeated_search_does_not_stack_noise():
+    mcts = MCTS(noise=(0.3, 1.0), seed=0)  # Priors are pure noise
+    board, color = _play_and_reuse(mcts)
+    clean = _root_priors(mcts)
+    for _ in range(3):
+        mcts.search(board, color, None, simulations=8)
+    mcts.noise = (0.3, 0.0)
+    mcts.add_root_noise()
+    assert np.allclose(_root_priors(mcts), clean)
+
+
+def test_no_noise_keeps_reused_priors():
+    mcts = MCTS(seed=0)
+    board, color = _play_and_reuse(mcts)
+    before = _root_priors(mcts)
+    mcts.search(board, color, None, simulations=8)
+    assert np.allclose(before, _root_priors(mcts))
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from src.ai.numpy_model import NumpyModel, quantize
+
+
+def _write(path, layers, int8=False):
+    """Write (kernel, bias, activation) layers in the export_npz layout."""
+    arrays = {}
+    for index, (kernel, bias, _) in enumerate(layers):
+        if int8:
+            arrays[f'kernel_{index}'], arrays[f'scale_{index}'] = quantize(kernel)
+        else:
+            arrays[f'kernel_{index}'] = kernel
+        arrays[f'bias_{index}'] = bias
+    np.savez(path, activations=np.array([activation for _, _, activation in layers]), **arrays)
+    return path
+
+
+def _reference(states, layers):
+    """Forward pass written out in float64, independently of NumpyModel."""
+    x = np.asarray(states, dtype=np.float64)
+    for kernel, bias, activation in layers:
+        x = x @ kernel.astype(np.float64) + bias
+        if activation == 'relu':
+            x = np.maximum(x, 0)
+        elif activation == 'tanh':
+            x = np.tanh(x)
+        elif activation == 'sigmoid':
+            x = 1 / (1 + np.exp(-x))
+        elif activation == 'softmax':
+            x = np.exp(x - x.max(axis=1, keepdims=True))
+            x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+@pytest.fixture
+def network():
+    rng = np.random.default_rng(0)
+    sizes = [32, 64, 48, 32]
+    activations = ['relu', 'tanh', 'softmax']
+    layers = [(rng.normal(0, 0.3, (n_in, n_out)).astype(np.float32),
+               rng.normal(0, 0.1, n_out).astype(np.float32), activation)
+              for n_in, n_out, activation in zip(sizes, sizes[1:], activations)]
+    states = rng.choice([-2.0, -1.0, 0.0, 1.0, 2.0], size=(16, 32)).astype(np.float32)
+    return layers, states
+
+
+def test_tiny_network_by_hand(tmp_path):
+    layers = [(np.array([[1, -1], [2, 0.5]], dtype=np.float32), np.array([0.5, -1], dtype=np.float32), 'relu')]
+    model = NumpyModel(_write(tmp_path / 'tiny.npz', layers))
+    assert model.predict(np.array([1, 2])).tolist() == [[5.5, 0.0]]
+
+
+def test_float_matches_reference(tmp_path, network):
+    layers, states = network
+    model = NumpyModel(_write(tmp_path / 'model.npz', layers))
+    output = model.predict(states)
+    assert output.dtype == np.float32
+    assert output.shape == (16, 32)
+    np.testing.assert_allclose(output, _reference(states, layers), atol=1e-5)
+    # A single 32-value state is treated as a batch of one
+    np.testing.assert_allclose(model.predict(states[0]), output[:1], atol=1e-6)
+
+
+@pytest.mark.parametrize('exported', [True, False])
+def test_int8_matches_reference(tmp_path, network, exported):
+    layers, states = network
+    if exported:
+        model = NumpyModel(_write(tmp_path / 'model.npz', layers, int8=True))
+    else:
+        model = NumpyModel(_write(tmp_path / 'model.npz', layers), quantize_weights=True)
+    assert all(kernel.dtype == np.int8 for kernel, *_ in model.layers)
+    output = model.predict(states)
+
+    # Exact against the dequantized weights, close to the float network
+    dequantized = []
+    for kernel, bias, activation in layers:
+        q, scale = quantize(kernel)
+        dequantized.append((q.astype(np.float64) * scale, bias, activation))
+    np.testing.assert_allclose(output, _reference(states, dequantized), atol=1e-5)
+    np.testing.assert_allclose(output, _reference(states, layers), atol=3e-2)
+
+
+def test_quantize_error_is_half_a_step():
+    kernel = np.random.default_rng(1).normal(0, 1, (32, 8)).astype(np.float32)
+    kernel[:, 3] = 0  # An all-zero column must not divide by zero
+    q, scale = quantize(kernel)
+    assert q.dtype == np.int8 and np.abs(q).max() <= 127
+    assert np.all(np.abs(q * scale - kernel) <= scale / 2 + 1e-7)
@@ -0,0 +1,31 @@
+import pytest
+from benchmarks.perft import POSITIONS, make_board, perft, perft_raw
+
+# Published English draughts perft counts from the start position
+START_COUNTS = [7, 49, 302, 1469, 7361]
+AGREEMENT_DEPTH = 5
+
+
+@pytest.mark.parametrize('implementation', ['board', 'bitboard'])
+@pytest.mark.parametrize('depth', range(1, len(START_COUNTS) + 1))
+def test_start_position_counts(implementation, depth):
+    start = POSITIONS['start']
+    assert perft(make_board(implementation, start), start['turn'], depth) == START_COUNTS[depth - 1]
+
+
+def test_raw_start_position_counts():
+    start = POSITIONS['start']
+    counts = [perft_raw(start['red'], start['black'], start['kings'], start['turn'], depth)
+              for depth in range(1, len(START_COUNTS) + 1)]
+    assert counts == START_COUNTS
+
+
+@pytest.mark.parametrize('name', [name for name in POSITIONS if name != 'start'])
+def test_board_and_bitboard_agree(name):
+    # These positions have no published counts, so the two generators check each other
+    position = POSITIONS[name]
+    for depth in range(1, AGREEMENT_DEPTH + 1):
+        board = perft(make_board('board', position), position['turn'], depth)
+        bitboard = perft(make_board('bitboard', position), position['turn'], depth)
+        raw = perft_raw(position['red'], position['black'], position['kings'], position['turn'], depth)
+        assert board == bitboard == raw, f"{name} depth {depth}"
@@ -0,0 +1,114 @@
+import random
+import pytest
+from src.constants import *
+from src.board import Board
+from src.bitboard import BitBoard, move_path, square_to_rc
+from src.game import Game
+from src import position
+from benchmarks.movegen import sample_positions
+from benchmarks.perft import make_board
+
+POSITIONS = sample_positions(200, seed=7)
+
+
+def _grid(board):
+    """Board contents as comparable tuples, independent of the implementation."""
+    return [(piece.color, bool(piece.king)) if piece != 0 else None
+            for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)
+            for piece in [board.get_piece(row, col)]]
+
+
+def _assert_same(board, restored):
+    assert type(restored) is type(board)
+    assert _grid(restored) == _grid(board)
+    assert ((restored.red_left, restored.black_left, restored.red_kings, restored.black_kings)
+            == (board.red_left, board.black_left, board.red_kings, board.black_kings))
+
+
+def mid_jump_games(count, seed=0):
+    """Headless Games stopped part way through a multi-jump."""
+    rng = random.Random(seed)
+    games = []
+    while len(games) < count:
+        game = Game(None, board=BitBoard())
+        for _ in range(200):
+            board, color = game.board, game.turn
+            moves = board.get_legal_moves(color)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            path = [square_to_rc(sq) for sq in move_path(board.red, board.black, board.kings, color, move)]
+            # Play one hop; a longer move leaves the game mid-jump
+            game.make_move_from_action((path[0], path[1]))
+            if len(path) > 2:
+                games.append(game)
+                break
+    return games
+
+
+@pytest.mark.parametrize('implementation', ['board', 'bitboard'])
+def test_binary_round_trip(implementation):
+    for spec in POSITIONS:
+        board = make_board(implementation, spec)
+        restored, turn = position.decode_position(position.encode_position(board, spec['turn']), type(board))
+        assert turn == spec['turn']
+        _assert_same(board, restored)
+
+
+@pytest.mark.parametrize('implementation', ['board', 'bitboard'])
+def test_fen_round_trip(implementation):
+    for spec in POSITIONS:
+        board = make_board(implementation, spec)
+        restored, turn = position.from_fen(position.to_fen(board, spec['turn']), type(board))
+        assert turn == spec['turn']
+        _assert_same(board, restored)
+
+
+def test_fen_to_record_to_board():
+    fens = [position.to_fen(make_board('bitboard', spec), spec['turn']) for spec in POSITIONS]
+    parsed = [position.from_fen(fen, Board) for fen in fens]
+    records = position.encode_boards([board for board, _ in parsed], [turn for _, turn in parsed])
+    for fen, (board, turn) in zip(fens, position.decode_boards(records, Board)):
+        assert position.to_fen(board, turn) == fen
+
+
+def test_batch_records_match_single_records():
+    boards = [make_board('bitboard', spec) for spec in POSITIONS]
+    turns = [spec['turn'] for spec in POSITIONS]
+    records = position.encode_boards(boards, turns)
+    assert records.tobytes() == b''.join(position.encode_position(b, t) for b, t in zip(boards, turns))
+    red, black, kings, decoded_turns, _ = position.decode_positions(records)
+    assert red.tolist() == [b.red for b in boards]
+    assert black.tolist() == [b.black for b in boards]
+    assert kings.tolist() == [b.kings for b in boards]
+    assert decoded_turns.tolist() == turns
+
+
+def test_fen_parsing():
+    board, turn = position.from_fen('B:W21-32:B1-12')
+    assert turn == RED_PLAYER
+    assert (board.red, board.black, board.kings) == (BitBoard().red, BitBoard().black, 0)
+    board, turn = position.from_fen('W:WK30,22:B1,K9.')
+    assert turn == BLACK_PLAYER
+    assert position.to_fen(board, turn) == 'W:W22,K30:B1,K9'
+    for bad in ('X:W1:B2', 'B:W1:B1', 'B:W33', 'B:Q1'):
+        with pytest.raises(ValueError):
+            position.from_fen(bad)
+
+
+def test_invalid_records_are_rejected():
+    records = position.encode_boards([BitBoard()], [RED_PLAYER])
+    records['turn'] = 7
+    with pytest.raises(ValueError):
+        position.decode_positions(records)
+
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+def test_game_snapshot_keeps_multi_jump(board_class):
+    games = mid_jump_games(30)
+    for game, restored in zip(games, position.restore_games(position.snapshot_games(games), board_class)):
+        assert restored.turn == game.turn
+        assert _grid(restored.board) == _grid(game.board)
+        assert restored.valid_moves.keys() == game.valid_moves.keys()
+        assert ((restored.jumping_piece.row, restored.jumping_piece.col)
+                == (game.jumping_piece.row, game.jumping_piece.col))
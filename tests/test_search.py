@@ -0,0 +1,41 @@
+from src.constants import *
+from src.bitboard import BitBoard, apply_move
+from src.ai.search import AlphaBetaSearch
+
+# Red is losing here, but after (20, 24) black's capture (29, 20) returns to a position
+# already played in the game, so with that history the line scores as a draw
+POSITION = (269484033, 2718728208, 268435472)
+TO_REPEAT = [(RED_PLAYER, (20, 24, 0)), (BLACK_PLAYER, (29, 20, 16777216))]
+DEPTH = 4
+
+
+def _board(red, black, kings):
+    board = BitBoard()
+    board.red, board.black, board.kings = red, black, kings
+    return board
+
+
+def _repeated_key(searcher):
+    position = POSITION
+    for color, move in TO_REPEAT:
+        position = apply_move(*position, color, move)
+    return searcher.zobrist.hash(*position, RED_PLAYER)
+
+
+def test_game_keys_score_repetitions_as_draws():
+    searcher = AlphaBetaSearch(tt_size=1 << 16)
+    result = searcher.search(_board(*POSITION), RED_PLAYER, None, DEPTH,
+                             game_keys={_repeated_key(searcher)})
+    assert result.score == 0
+    assert result.move == TO_REPEAT[0][1]
+
+
+def test_repetition_draw_does_not_leak_through_the_table():
+    fresh = AlphaBetaSearch(tt_size=1 << 16).search(_board(*POSITION), RED_PLAYER, None, DEPTH)
+    assert fresh.score < 0
+
+    searcher = AlphaBetaSearch(tt_size=1 << 16)
+    searcher.search(_board(*POSITION), RED_PLAYER, None, DEPTH, game_keys={_repeated_key(searcher)})
+    # The same positions without that game history must not reuse the draw
+    result = searcher.search(_board(*POSITION), RED_PLAYER, None, DEPTH)
+    assert result.score == fresh.score